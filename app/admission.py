@@ -0,0 +1,143 @@
+"""
+Admission control: a concurrency limit and a bounded FIFO wait queue per route class.
+
+Without it, a burst piles requests up in the threadpool behind SQLite's locks and the pool
+checkout, and every client times out together. Here, reads and writes each run at most
+`limit` at a time; up to `queue_size` more wait in order, for at most `queue_timeout`
+seconds. Anything beyond that is answered at once with 503 and Retry-After, so clients back
+off and /health can show the pressure before latency collapses.
+"""
+import asyncio
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+class AdmissionLimiter:
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in line if need be; False when the request should be shed."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True  # granted just as the timeout fired
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over, but nobody will use it
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return True
+
+    def release(self) -> None:
+        # hand the slot straight to the next waiter, so a new arrival cannot jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "limit": self.limit,
+            "queued": self.queued,
+            "queue_size": self.queue_size,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware routing each request to the "read" (GET/HEAD) or "write" limiter.
+    Paths in exempt (health checks, metrics, long-lived event streams) and CORS preflights
+    bypass it; a slot is held until the response body has been sent.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiters: dict[str, AdmissionLimiter],
+        exempt: tuple[str, ...] = (),
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.exempt = exempt
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in self.exempt:
+            return await self.app(scope, receive, send)
+
+        limiter = self.limiters["read" if scope["method"] in READ_METHODS else "write"]
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": "Server busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def _class_limit(configured: int | None, pool_size: int, name: str) -> int:
+    # admitting more requests than the pool has connections only moves the queue to the
+    # pool checkout, which waits up to 30 s and cannot shed
+    if configured is None:
+        return pool_size
+    if not 1 <= configured <= pool_size:
+        raise ValueError(f"admission_{name}_limit must be between 1 and the {name} pool size ({pool_size})")
+    return configured
+
+
+def limiters_from_settings(settings) -> dict[str, AdmissionLimiter]:
+    timeout = settings.admission_queue_timeout_seconds
+    if settings.db_mode == "memory":
+        # reads and writes share the in-memory database's single connection, so one limiter
+        limiter = AdmissionLimiter(
+            _class_limit(settings.admission_write_limit, 1, "write"), settings.admission_write_queue, timeout
+        )
+        return {"read": limiter, "write": limiter}
+    return {
+        "read": AdmissionLimiter(
+            _class_limit(settings.admission_read_limit, settings.sqlite_read_pool_size, "read"),
+            settings.admission_read_queue,
+            timeout,
+        ),
+        "write": AdmissionLimiter(
+            _class_limit(settings.admission_write_limit, settings.sqlite_write_pool_size, "write"),
+            settings.admission_write_queue,
+            timeout,
+        ),
+    }
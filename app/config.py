@@ -3,10 +3,64 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     db_mode: str = "sqlite"  # sqlite | memory
+    db_io: str = "sync"  # sync | async (aiosqlite; needs db_mode=sqlite)
     database_url_sqlite: str = "sqlite:///data/boardgames.db"
     database_url_memory: str = "sqlite://"
     database_echo: bool = False
 
+    sqlite_profile: str = "safe"  # safe | throughput | readonly
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_read_pool_size: int = 8
+    sqlite_write_pool_size: int = 1
+
+    page_size_default: int = 100
+    page_size_max: int = 1000
+    bulk_max_items: int = 10000
+
+    # tombstones older than this are dropped by "cli.py compact-changes"
+    changes_tombstone_days: float = 30.0
+
+    # GET /boardgames/events: the change log is polled this often while anyone is subscribed
+    # (in-process writes wake it sooner); a subscriber more than events_queue_size messages
+    # behind gets a single "resync" instead
+    events_poll_interval_seconds: float = 1.0
+    events_queue_size: int = 256
+    events_keepalive_seconds: float = 15.0
+
+    # Admission control: at most *_limit reads/writes run at once, *_queue more wait (up to
+    # admission_queue_timeout_seconds) and the rest get 503 + Retry-After. /health, /metrics
+    # and /boardgames/events are exempt
+    admission_enabled: bool = True
+    admission_read_limit: int | None = None  # default and maximum: sqlite_read_pool_size
+    admission_read_queue: int = 64
+    admission_write_limit: int | None = None  # default and maximum: sqlite_write_pool_size
+    admission_write_queue: int = 32
+    admission_queue_timeout_seconds: float = 5.0
+    admission_retry_after_seconds: int = 1
+
+    cache_enabled: bool = True
+    cache_ttl_seconds: float = 10.0
+    cache_max_entries: int = 10000
+
+    # Prometheus-format /metrics and the request/statement instrumentation behind it
+    metrics_enabled: bool = True
+
+    # Slow-query log (logger "boardgamehub.slow_query"); 0 disables it
+    slow_query_ms: float = 250.0
+    slow_query_interval_seconds: float = 60.0  # per query shape
+    slow_query_max_per_minute: int = 30
+    slow_query_explain: bool = True
+
+    # Sampling profiler for requests whose profiling_header carries profiling_token (no token: the
+    # header is ignored), plus a random share of all requests; at most one profile runs at a
+    # time, and one collapsed-stack file per profiled request goes to profiling_dir
+    profiling_enabled: bool = False
+    profiling_header: str = "X-Profile"
+    profiling_token: str | None = None
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 2.0
+    profiling_dir: str = "data/profiles"
+
     @property
     def database_url(self) -> str:
         if self.db_mode == "memory":
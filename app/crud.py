@@ -1,68 +1,822 @@
+import base64
+import json
+import re
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
 from sqlmodel import Session, select
-from sqlalchemy import func
+from sqlalchemy import Row, and_, bindparam, delete, func, or_, text, tuple_, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 
-from app.models import BoardGame
+from app.cache import MISSING, TTLCache
+from app.config import settings
+from app.models import BoardGame, BoardGameStat, CatalogState, utcnow
+from app.similarity import FEATURES, FeatureIndex
 
+SORT_KEYS = ("id", "name", "rating", "year_published")
+BOARDGAME_FIELDS = (
+    "name",
+    "designer",
+    "year_published",
+    "min_players",
+    "max_players",
+    "play_time_min",
+    "complexity",
+    "rating",
+)
+# columns of BoardGameRead, in order; read-only routes fetch these as plain rows
+READ_FIELDS = ("id", *BOARDGAME_FIELDS)
+READ_COLUMNS = tuple(getattr(BoardGame, f) for f in READ_FIELDS)
+NAME_EXISTS = "Board game with this name already exists"
 
-def list_boardgames(session: Session) -> list[BoardGame]:
-    return session.exec(select(BoardGame)).all()
+# SQLite's lower() only folds ASCII letters; name keys computed in Python must match it
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+# stays well below SQLite's bound-parameter limit for IN (...) lookups
+_IN_CHUNK = 500
 
 
-def get_boardgame(session: Session, boardgame_id: int) -> BoardGame | None:
-    return session.get(BoardGame, boardgame_id)
+# Read-through caches for get/list. Pages are keyed by the catalog version, so a write in
+# any process makes older pages unreachable; a single game written by another process can
+# be served stale for up to cache_ttl_seconds.
+game_cache = TTLCache(settings.cache_max_entries, settings.cache_ttl_seconds, settings.cache_enabled)
+list_cache = TTLCache(settings.cache_max_entries, settings.cache_ttl_seconds, settings.cache_enabled)
+# built on the first /similar or /recommend call; see sync_feature_index()
+feature_index = FeatureIndex()
+# called after every committed write, e.g. to wake the change broadcaster in app.events
+write_listeners: list[Callable[[], None]] = []
+
+
+def _detached(game: BoardGame) -> BoardGame:
+    # cached objects outlive their session, so store plain copies rather than ORM instances
+    return BoardGame.model_validate(game)
+
+
+def cache_stats() -> dict:
+    return {"games": game_cache.stats(), "lists": list_cache.stats()}
+
+
+def clear_caches() -> None:
+    global _stats_memo
+    game_cache.clear()
+    list_cache.clear()
+    feature_index.clear()
+    _stats_memo = None
+
+
+def invalidate_cached(boardgame_ids=()) -> None:
+    """Drop what a committed write may have changed: every page, plus the given games."""
+    list_cache.clear()
+    for boardgame_id in boardgame_ids:
+        game_cache.invalidate(boardgame_id)
+    for listener in write_listeners:
+        listener()
 
 
-def get_boardgame_by_name(session: Session, name: str) -> BoardGame | None:
-    if not name:
+def cached_game(boardgame_id: int) -> BoardGame | None:
+    cached = game_cache.get(boardgame_id)
+    return None if cached is MISSING else cached
+
+
+def remember_game(game: BoardGame | None, generation: int | None = None) -> BoardGame | None:
+    """Cache a row read from the database; pass game_cache.generation as taken before the read."""
+    if game is None:
         return None
-    return session.exec(
-        select(BoardGame).where(func.lower(BoardGame.name) == name.strip().lower())
-    ).first()
+    game = _detached(game)
+    game_cache.set(game.id, game, generation)
+    return game
 
 
-def create_boardgame(session: Session, boardgame: BoardGame) -> BoardGame:
-    existing = get_boardgame_by_name(session, boardgame.name)
-    if existing:
-        raise ValueError("Board game with this name already exists")
+def page_key(version: int, limit: int, after, sort: str, order: str, filters: dict | None) -> tuple:
+    return (version, limit, after, sort, order, tuple(sorted((filters or {}).items())))
 
-    session.add(boardgame)
-    session.commit()
-    session.refresh(boardgame)
-    return boardgame
 
+def cached_page(key: tuple) -> tuple[list[Row], str | None] | None:
+    cached = list_cache.get(key)
+    return None if cached is MISSING else cached
 
-def update_boardgame(session: Session, boardgame_id: int, data: dict) -> BoardGame | None:
-    db_obj = get_boardgame(session, boardgame_id)
-    if not db_obj:
+
+def remember_page(key: tuple, rows: list[Row], next_cursor: str | None):
+    # rows are immutable and hold no session, so they are cached as they are
+    page = (rows, next_cursor)
+    list_cache.set(key, page)
+    return page
+
+
+def name_key(name: str) -> str:
+    return name.strip().translate(_ASCII_LOWER)
+
+
+# JSON types a cursor value may decode to, per sort key; anything else never reaches the SQL
+_CURSOR_VALUE_TYPES = {
+    "id": (int,),
+    "name": (str,),
+    "rating": (int, float, type(None)),
+    "year_published": (int, type(None)),
+    "search": (type(None),),
+}
+
+
+def encode_cursor(sort: str, order: str, value, last_id: int) -> str:
+    raw = json.dumps([sort, order, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: str, order: str) -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        c_sort, c_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if (c_sort, c_order) != (sort, order) or not isinstance(last_id, int):
+        raise ValueError("Cursor does not match the requested sort order")
+    if isinstance(value, bool) or not isinstance(value, _CURSOR_VALUE_TYPES.get(sort, ())):
+        raise ValueError("Invalid cursor")
+    return value, last_id
+
+
+def _after_cursor(column, value, last_id: int, descending: bool) -> list:
+    """
+    Keyset conditions for rows strictly after (value, last_id) in (column, id) order: one per
+    index range, in page order. SQLite sorts NULLs first, so they lead an ascending page and
+    trail a descending one. The NULL rows are a range of their own, since OR-ing them into a
+    row-value comparison makes SQLite scan the index from the start on every page.
+    """
+    nullable = BoardGame.__table__.c[column.key].nullable
+    if descending:
+        if value is None:
+            return [and_(column.is_(None), BoardGame.id < last_id)]
+        ranges = [tuple_(column, BoardGame.id) < tuple_(value, last_id)]
+        return ranges + [column.is_(None)] if nullable else ranges
+
+    if value is None:
+        return [and_(column.is_(None), BoardGame.id > last_id), column.is_not(None)]
+    return [tuple_(column, BoardGame.id) > tuple_(value, last_id)]
+
+
+def _ordering(sort_column, id_column, descending: bool) -> list:
+    if sort_column is id_column:
+        return [id_column.desc() if descending else id_column.asc()]
+    if descending:
+        return [sort_column.desc(), id_column.desc()]
+    return [sort_column.asc(), id_column.asc()]
+
+
+def filter_conditions(filters: dict | None) -> list:
+    """WHERE conditions for the list filters (designer, players, min_rating, max_play_time)."""
+    filters = filters or {}
+    conditions = []
+    if filters.get("designer") is not None:
+        conditions.append(func.lower(BoardGame.designer) == name_key(filters["designer"]))
+    if filters.get("players") is not None:
+        players = filters["players"]
+        conditions += [BoardGame.min_players <= players, BoardGame.max_players >= players]
+    if filters.get("min_rating") is not None:
+        conditions.append(BoardGame.rating >= filters["min_rating"])
+    if filters.get("max_play_time") is not None:
+        conditions.append(BoardGame.play_time_min <= filters["max_play_time"])
+    return conditions
+
+
+def list_statement(
+    limit: int = 100,
+    after: str | None = None,
+    sort: str = "id",
+    order: str = "asc",
+    filters: dict | None = None,
+):
+    """
+    SELECT of READ_COLUMNS for one page ordered by (sort, id), fetching one extra row to
+    detect a next page. Shared by the sync and async paths; pair it with page_from_rows().
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Cannot sort by {sort!r}")
+    descending = order == "desc"
+    column = getattr(BoardGame, sort)
+
+    stmt = select(*READ_COLUMNS).where(*filter_conditions(filters))
+    ordering = _ordering(column, BoardGame.id, descending)
+    if not after:
+        return stmt.order_by(*ordering).limit(limit + 1)
+
+    value, last_id = decode_cursor(after, sort, order)
+    if sort == "id":
+        ranges = [BoardGame.id < last_id if descending else BoardGame.id > last_id]
+    else:
+        ranges = _after_cursor(column, value, last_id, descending)
+    if len(ranges) == 1:
+        return stmt.where(ranges[0]).order_by(*ordering).limit(limit + 1)
+
+    # each range is its own index search, limited on its own; only those rows are merged
+    arms = [select(*stmt.where(r).order_by(*ordering).limit(limit + 1).subquery().c) for r in ranges]
+    merged = union_all(*arms).subquery()
+    return select(*merged.c).order_by(*_ordering(merged.c[sort], merged.c.id, descending)).limit(limit + 1)
+
+
+def page_from_rows(
+    rows, limit: int, sort: str = "id", order: str = "asc"
+) -> tuple[list[Row], str | None]:
+    if len(rows) <= limit:
+        return list(rows), None
+
+    page = list(rows[:limit])
+    last = page[-1]
+    return page, encode_cursor(sort, order, getattr(last, sort), last.id)
+
+
+def list_boardgames(
+    session: Session,
+    limit: int = 100,
+    after: str | None = None,
+    sort: str = "id",
+    order: str = "asc",
+    filters: dict | None = None,
+    version: int | None = None,
+) -> tuple[list[Row], str | None]:
+    """
+    Return one page of game rows (READ_FIELDS) ordered by (sort, id) and the next-page cursor.
+    Pages are keyset-based, so every page costs one index range scan regardless of depth.
+    version is the catalog version if the caller already read it (it keys the page cache).
+    """
+    if list_cache.enabled:
+        if version is None:
+            version = get_catalog_state(session)[0]
+        key = page_key(version, limit, after, sort, order, filters)
+        page = cached_page(key)
+        if page is not None:
+            return page
+
+    rows = session.exec(list_statement(limit, after, sort, order, filters)).all()
+    games, next_cursor = page_from_rows(rows, limit, sort, order)
+    if list_cache.enabled:
+        return remember_page(key, games, next_cursor)
+    return games, next_cursor
+
+
+# bm25 column weights: a hit in the name counts ten times a hit in the designer
+_SEARCH_SQL = text(
+    f"SELECT {', '.join(f'boardgame.{f}' for f in READ_FIELDS)} FROM boardgame_fts "
+    "JOIN boardgame ON boardgame.id = boardgame_fts.rowid "
+    "WHERE boardgame_fts MATCH :match "
+    "ORDER BY bm25(boardgame_fts, 10.0, 1.0), boardgame.id "
+    "LIMIT :limit OFFSET :offset"
+)
+
+
+def fts_match_expression(q: str) -> str | None:
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as a prefix
+    (for typeahead). Words are quoted, so FTS5 operators in user input stay literal.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
         return None
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_boardgames(
+    session: Session, q: str, limit: int = 20, after: str | None = None
+) -> tuple[list[Row], str | None]:
+    """
+    Ranked full-text search over name and designer.
+    Results are ordered by relevance, so the cursor carries an offset into the ranking.
+    """
+    offset = decode_cursor(after, "search", q)[1] if after else 0
+    match = fts_match_expression(q)
+    if match is None:
+        return [], None
+
+    stmt = select(*READ_COLUMNS).from_statement(
+        _SEARCH_SQL.bindparams(match=match, limit=limit + 1, offset=offset)
+    )
+    rows = session.exec(stmt).all()
+    if len(rows) <= limit:
+        return list(rows), None
+    return list(rows[:limit]), encode_cursor("search", q, None, offset + limit)
+
+
+class ChangesCompacted(Exception):
+    """The requested cursor is older than what compaction kept; the client must resync."""
+
+    def __init__(self, floor: int):
+        super().__init__(f"Changes before seq {floor} were compacted; resync from GET /boardgames/")
+        self.floor = floor
+
+
+# the latest change of each game after :since, with the game's current row (NULL once deleted)
+_CHANGES_SQL = text(
+    "SELECT c.seq, c.op, c.boardgame_id, "
+    f"{', '.join(f'b.{f}' for f in READ_FIELDS)} "
+    "FROM boardgamechange c LEFT JOIN boardgame b ON b.id = c.boardgame_id "
+    "WHERE c.seq > :since AND c.seq = "
+    "(SELECT max(seq) FROM boardgamechange l WHERE l.boardgame_id = c.boardgame_id) "
+    "ORDER BY c.seq LIMIT :limit"
+)
+_CHANGES_STATE_SQL = text(
+    "SELECT changes_floor, "
+    "coalesce((SELECT seq FROM sqlite_sequence WHERE name = 'boardgamechange'), 0) "
+    "FROM catalogstate WHERE id = 1"
+)
+
+
+def list_changes(
+    session: Session, since: int = 0, limit: int = 1000
+) -> tuple[list[tuple[int, str, int, tuple | None]], int, bool]:
+    """
+    Changes after seq since, oldest first, as (seq, op, id, row) with op upsert or delete and
+    row in READ_FIELDS order for upserts. Each game appears once, with its latest state, so a
+    sync costs O(games changed). Returns (changes, cursor for the next call, has_more).
+    since=0 reads the whole log, which always yields a complete snapshot.
+    """
+    floor, last_seq = session.exec(_CHANGES_STATE_SQL).first() or (0, 0)
+    # a cursor from before compaction, or from a log that was since reset, cannot be served
+    if since and (since < floor or since > last_seq):
+        raise ChangesCompacted(floor)
+
+    rows = session.exec(_CHANGES_SQL.bindparams(since=since, limit=limit + 1)).all()
+    changes = []
+    for seq, op, game_id, *game in rows[:limit]:
+        if game[0] is None:
+            changes.append((seq, "delete", game_id, None))
+        else:
+            changes.append((seq, op, game_id, tuple(game)))
+    cursor = changes[-1][0] if changes else max(since, 0)
+    return changes, cursor, len(rows) > limit
+
+
+def compact_changes(session: Session, tombstone_max_age_days: float) -> tuple[int, int]:
+    """
+    Drop change-log entries superseded by a later change of the same game (lossless), then
+    tombstones older than tombstone_max_age_days, raising the floor below which cursors get
+    410. Returns (entries removed, floor).
+    """
+    removed = session.exec(text(
+        "DELETE FROM boardgamechange WHERE seq < "
+        "(SELECT max(seq) FROM boardgamechange l WHERE l.boardgame_id = boardgamechange.boardgame_id)"
+    )).rowcount
+    cutoff = f"-{int(tombstone_max_age_days * 86400)} seconds"
+    expired = session.exec(
+        text(
+            "DELETE FROM boardgamechange WHERE op = 'delete' AND changed_at <= datetime('now', :cutoff) "
+            "RETURNING seq"
+        ).bindparams(cutoff=cutoff)
+    ).scalars().all()
+    if expired:
+        session.exec(
+            text("UPDATE catalogstate SET changes_floor = max(changes_floor, :floor) WHERE id = 1")
+            .bindparams(floor=max(expired))
+        )
+    floor = session.exec(select(CatalogState.changes_floor).where(CatalogState.id == 1)).first() or 0
+    session.commit()
+    return removed + len(expired), floor
+
+
+def iter_boardgame_rows(
+    session: Session, fields: list[str], chunk_size: int = 1000
+) -> Iterator[tuple]:
+    """Stream plain row tuples in id order, fetching chunk_size rows at a time from the cursor."""
+    stmt = (
+        select(*(getattr(BoardGame, f) for f in fields))
+        .order_by(BoardGame.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    yield from session.exec(stmt)
+
+
+def catalog_state_statement():
+    return select(CatalogState.version, CatalogState.updated_at).where(CatalogState.id == 1)
+
+
+def get_catalog_state(session: Session) -> tuple[int, datetime | None]:
+    """Catalog-wide (version, last modified); a one-row read that never touches boardgame."""
+    return session.exec(catalog_state_statement()).first() or (0, None)
+
+
+STATS_TOP_DESIGNERS = 20
+STATS_MAX_PLAYERS = 20
+# ((instance id, catalog version), stats) of the last computation; any write anywhere changes
+# the version, and the instance id tells apart databases whose versions overlap
+_stats_memo: tuple[tuple[str, int], dict] | None = None
+
 
-    # אם משנים שם - לוודא שאין כפילות (מלבד עצמו)
+def _average(total: float, n: int) -> float | None:
+    return round(total / n, 3) if n else None
+
+
+def get_catalog_stats(session: Session, version: int | None = None) -> dict:
+    """
+    Catalog aggregates read from boardgamestat (maintained by triggers), so the cost depends
+    on the number of buckets, not the number of games. Memoized per catalog version.
+    """
+    global _stats_memo
+    if version is None:
+        version = get_catalog_state(session)[0]
+    instance_id = session.exec(select(CatalogState.instance_id).where(CatalogState.id == 1)).first()
+    key = (instance_id, version) if instance_id else None  # no id yet: do not memoize
+    memo = _stats_memo
+    if key is not None and memo is not None and memo[0] == key:
+        return memo[1]
+
+    buckets: dict[str, dict[str, BoardGameStat]] = {}
+    stmt = select(BoardGameStat).where(
+        BoardGameStat.dimension.in_(["total", "rating", "year", "min_players", "max_players"]),
+        BoardGameStat.games > 0,
+    )
+    for row in session.exec(stmt):
+        buckets.setdefault(row.dimension, {})[row.bucket] = row
+
+    designers = session.exec(
+        select(BoardGameStat)
+        .where(BoardGameStat.dimension == "designer", BoardGameStat.games > 0)
+        .order_by(BoardGameStat.games.desc())
+        .limit(STATS_TOP_DESIGNERS)
+    ).all()
+
+    total = buckets.get("total", {}).get("")
+    min_counts = {int(k): v.games for k, v in buckets.get("min_players", {}).items()}
+    max_counts = {int(k): v.games for k, v in buckets.get("max_players", {}).items()}
+
+    # games playable with n players = games with min <= n, minus games with max < n
+    coverage = {}
+    for n in range(1, min(max(max_counts, default=0), STATS_MAX_PLAYERS) + 1):
+        coverage[n] = sum(c for m, c in min_counts.items() if m <= n) - sum(
+            c for m, c in max_counts.items() if m < n
+        )
+
+    stats = {
+        "total_games": total.games if total else 0,
+        "average_rating": _average(total.rating_sum, total.rating_n) if total else None,
+        "average_complexity": _average(total.complexity_sum, total.complexity_n) if total else None,
+        "rating_histogram": {
+            f"{b}-{b + 1}": row.games
+            for b, row in sorted((int(k), v) for k, v in buckets.get("rating", {}).items())
+        },
+        "games_per_year": {
+            year: row.games
+            for year, row in sorted((int(k), v) for k, v in buckets.get("year", {}).items())
+        },
+        "player_count_coverage": coverage,
+        "top_designers": [
+            {
+                "designer": row.bucket,
+                "games": row.games,
+                "average_complexity": _average(row.complexity_sum, row.complexity_n),
+            }
+            for row in designers
+        ],
+    }
+    if key is not None:
+        _stats_memo = (key, stats)
+    return stats
+
+
+def feature_row(game: BoardGame) -> tuple:
+    return (game.id, *(getattr(game, f) for f in FEATURES))
+
+
+def note_feature_write(version: int, game: BoardGame | None = None, removed_id: int | None = None):
+    """Apply a committed single-row write to the feature index (no-op until it is built)."""
+    feature_index.apply(version, feature_row(game) if game else None, removed_id)
+
+
+def sync_feature_index(session: Session, version: int | None = None) -> None:
+    """Make sure the feature index matches the catalog version, rebuilding it if not."""
+    if version is None:
+        version = get_catalog_state(session)[0]
+    columns = [BoardGame.id, *(getattr(BoardGame, f) for f in FEATURES)]
+    feature_index.refresh(version, lambda: session.exec(select(*columns)).all())
+
+
+def games_by_ids(session: Session, ids: list[int]) -> list[Row]:
+    """Fetch game rows (READ_FIELDS) by id, keeping the order of ids."""
+    if not ids:
+        return []
+    found = {g.id: g for g in session.exec(select(*READ_COLUMNS).where(BoardGame.id.in_(ids)))}
+    return [found[i] for i in ids if i in found]
+
+
+def similar_boardgames(
+    session: Session, boardgame_id: int, k: int = 10, version: int | None = None
+) -> list[Row] | None:
+    """The k games closest to boardgame_id in feature space, or None if it does not exist."""
+    sync_feature_index(session, version)
+    ids = feature_index.similar(boardgame_id, k)
+    return None if ids is None else games_by_ids(session, ids)
+
+
+def recommend_boardgames(
+    session: Session,
+    players: int | None = None,
+    max_minutes: int | None = None,
+    k: int = 10,
+    version: int | None = None,
+) -> list[Row]:
+    sync_feature_index(session, version)
+    return games_by_ids(session, feature_index.recommend(players, max_minutes, k))
+
+
+def get_boardgame(session: Session, boardgame_id: int) -> BoardGame | None:
+    """Read-through cached lookup; the result is a detached copy, not a session object."""
+    game = cached_game(boardgame_id)
+    if game is not None:
+        return game
+    # a write committed while this read runs invalidates after it; the row read may predate it
+    generation = game_cache.generation
+    return remember_game(session.get(BoardGame, boardgame_id), generation)
+
+
+def get_ids_by_name_key(session: Session, keys: list[str]) -> dict[str, int]:
+    found: dict[str, int] = {}
+    for i in range(0, len(keys), _IN_CHUNK):
+        key_col = func.lower(BoardGame.name)
+        stmt = select(BoardGame.id, key_col).where(key_col.in_(keys[i:i + _IN_CHUNK]))
+        found.update((key, game_id) for game_id, key in session.exec(stmt))
+    return found
+
+
+def is_name_conflict(e: IntegrityError) -> bool:
+    return "UNIQUE" in str(e.orig)
+
+
+def _commit_unique_name(session: Session, stmt=None) -> Row | None:
+    """
+    Run stmt (if given) and commit, translating a violation of the unique lower(name) index
+    into ValueError. Returns stmt's first RETURNING row.
+    """
+    try:
+        row = session.exec(stmt).first() if stmt is not None else None
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        if is_name_conflict(e):
+            raise ValueError(NAME_EXISTS) from e
+        raise
+    return row
+
+
+def clean_update_data(data: dict) -> dict:
+    # אם משנים שם - כפילות נאכפת ע"י האינדקס הייחודי במסד
     new_name = data.get("name")
     if new_name is not None:
         new_name = new_name.strip()
         if not new_name:
             raise ValueError("Name cannot be empty")
+        data["name"] = new_name
+    return data
 
-        if new_name.lower() != db_obj.name.lower():
-            existing = get_boardgame_by_name(session, new_name)
-            if existing:
-                raise ValueError("Board game with this name already exists")
 
-        data["name"] = new_name
+def create_boardgame(session: Session, boardgame: BoardGame) -> BoardGame:
+    # uniqueness is enforced by ux_boardgame_name_lower, so this is a single INSERT
+    boardgame.name = boardgame.name.strip()
+    session.add(boardgame)
+    _commit_unique_name(session)
+    session.refresh(boardgame)
+    invalidate_cached()
+    if feature_index.version is not None:
+        note_feature_write(get_catalog_state(session)[0], game=boardgame)
+    return boardgame
 
-    for k, v in data.items():
-        setattr(db_obj, k, v)
 
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+def update_statement(boardgame_id: int, data: dict):
+    """
+    UPDATE ... RETURNING the whole row: one statement, no prior SELECT. The version is
+    bumped in SQL, so concurrent updates never collide; updated_at is set by onupdate.
+    """
+    return (
+        update(BoardGame)
+        .where(BoardGame.id == boardgame_id)
+        .values(**clean_update_data(data), version=BoardGame.version + 1)
+        .returning(*BoardGame.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_statement(boardgame_id: int):
+    return (
+        delete(BoardGame)
+        .where(BoardGame.id == boardgame_id)
+        .returning(BoardGame.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_boardgame(session: Session, boardgame_id: int, data: dict) -> BoardGame | None:
+    try:
+        stmt = update_statement(boardgame_id, data)
+    except ValueError:
+        if session.get(BoardGame, boardgame_id) is None:  # a missing game is still a 404
+            return None
+        raise
+    row = _commit_unique_name(session, stmt)
+    if row is None:
+        return None
+
+    game = BoardGame.model_validate(row._mapping)
+    invalidate_cached([boardgame_id])
+    if feature_index.version is not None:
+        note_feature_write(get_catalog_state(session)[0], game=game)
+    return game
 
 
 def delete_boardgame(session: Session, boardgame_id: int) -> bool:
-    db_obj = get_boardgame(session, boardgame_id)
-    if not db_obj:
-        return False
-    session.delete(db_obj)
+    deleted = session.exec(delete_statement(boardgame_id)).first()
     session.commit()
+    if deleted is None:
+        return False
+    invalidate_cached([boardgame_id])
+    if feature_index.version is not None:
+        note_feature_write(get_catalog_state(session)[0], removed_id=boardgame_id)
     return True
+
+
+def bulk_create_boardgames(
+    session: Session, rows: list[dict], upsert: bool = False, with_ids: bool = True
+) -> list[tuple[str, int | None, str | None]]:
+    """
+    Insert (or upsert by case-insensitive name) many games in one transaction.
+    Returns one (status, id, detail) tuple per input row, status being created/updated/error.
+    with_ids=False skips the lookup of the new ids, which bulk loaders do not need.
+    """
+    results: list[tuple[str, int | None, str | None] | None] = [None] * len(rows)
+    batch: dict[str, int] = {}
+    for i, row in enumerate(rows):
+        row["name"] = row["name"].strip()
+        key = name_key(row["name"])
+        if key in batch:
+            results[i] = ("error", None, "Duplicate name in batch")
+        else:
+            batch[key] = i
+
+    existing = get_ids_by_name_key(session, list(batch))
+    to_write = []
+    for key, i in batch.items():
+        if key in existing and not upsert:
+            results[i] = ("error", existing[key], NAME_EXISTS)
+        else:
+            to_write.append(rows[i])
+
+    if to_write:
+        stmt = sqlite_insert(BoardGame.__table__)  # Core insert: no ORM bulk bookkeeping
+        conflict_target = [func.lower(BoardGame.name)]
+        if upsert:
+            table = BoardGame.__table__
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={
+                    **{c: stmt.excluded[c] for c in BOARDGAME_FIELDS},
+                    "version": table.c.version + 1,
+                    "updated_at": utcnow(),
+                },
+            )
+        else:
+            # a concurrent writer may have taken the name since the lookup above
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_target)
+        session.execute(stmt, to_write)  # executemany: one prepared statement for the batch
+    session.commit()
+    invalidate_cached(existing.values() if upsert else ())
+
+    pending = [k for k, i in batch.items() if results[i] is None]
+    ids = get_ids_by_name_key(session, pending) if with_ids else {}
+    for key, i in batch.items():
+        if results[i] is None:
+            results[i] = ("updated" if key in existing else "created", ids.get(key), None)
+    return results
+
+
+def _not_applied(ids: list[int], errors: list[str | None]) -> list[tuple[str, int, str | None]]:
+    """Results of an atomic batch that had failures and so wrote nothing."""
+    return [("error", i, e) if e else ("skipped", i, None) for i, e in zip(ids, errors)]
+
+
+def _duplicate_ids(ids: list[int]) -> list[str | None]:
+    seen: set[int] = set()
+    errors = []
+    for game_id in ids:
+        errors.append("Duplicate id in batch" if game_id in seen else None)
+        seen.add(game_id)
+    return errors
+
+
+def batch_update_boardgames(
+    session: Session, items: list[tuple[int, dict]], atomic: bool = False
+) -> list[tuple[str, int, str | None]]:
+    """
+    Apply many partial updates in one transaction. Items that set the same fields share one
+    executemany UPDATE. Missing ids and name conflicts are found up front, so they are
+    reported per item; with atomic=True any failure means nothing is written.
+    A name held by another game counts as taken even if the same batch renames that game.
+    """
+    ids = [game_id for game_id, _ in items]
+    errors = _duplicate_ids(ids)
+    found: set[int] = set()
+    for i in range(0, len(ids), _IN_CHUNK):
+        found.update(session.exec(select(BoardGame.id).where(BoardGame.id.in_(ids[i:i + _IN_CHUNK]))))
+
+    cleaned: list[dict] = []
+    renames: dict[str, int] = {}  # name key -> item position
+    for n, (game_id, data) in enumerate(items):
+        if errors[n] is None and game_id not in found:
+            errors[n] = "Board game not found"
+        try:
+            data = clean_update_data(data)
+        except ValueError as e:
+            errors[n] = errors[n] or str(e)
+        if errors[n] is None and "name" in data:
+            key = name_key(data["name"])
+            if key in renames:
+                errors[n] = "Duplicate name in batch"
+            else:
+                renames[key] = n
+        cleaned.append(data)
+
+    for key, owner in get_ids_by_name_key(session, list(renames)).items():
+        n = renames[key]
+        if owner != ids[n]:
+            errors[n] = NAME_EXISTS
+
+    if atomic and any(errors):
+        return _not_applied(ids, errors)
+
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for game_id, data, error in zip(ids, cleaned, errors):
+        if error is None:
+            params = {f"v_{k}": v for k, v in data.items()}
+            groups.setdefault(tuple(sorted(data)), []).append({**params, "v_id": game_id})
+
+    table = BoardGame.__table__
+    now = utcnow()
+    try:
+        updated = 0
+        for fields, params in groups.items():
+            # bind names must differ from column names in SET, hence the v_ prefix
+            values = {f: bindparam(f"v_{f}") for f in fields}
+            values.update(version=table.c.version + 1, updated_at=now)
+            stmt = update(table).where(table.c.id == bindparam("v_id")).values(values)
+            updated += session.execute(stmt, params).rowcount
+        if updated < sum(len(params) for params in groups.values()):
+            # deleted since the existence check; the UPDATEs hold the write lock, so what is
+            # missing now was not updated
+            pending = [n for n, error in enumerate(errors) if error is None]
+            present: set[int] = set()
+            for i in range(0, len(pending), _IN_CHUNK):
+                chunk = [ids[n] for n in pending[i:i + _IN_CHUNK]]
+                present.update(session.exec(select(BoardGame.id).where(BoardGame.id.in_(chunk))))
+            for n in pending:
+                if ids[n] not in present:
+                    errors[n] = "Board game not found"
+            if atomic:
+                session.rollback()
+                return _not_applied(ids, errors)
+        session.commit()
+    except IntegrityError as e:  # a name taken by another process since the checks above
+        session.rollback()
+        if is_name_conflict(e):
+            raise ValueError(NAME_EXISTS) from e
+        raise
+
+    invalidate_cached(game_id for game_id, error in zip(ids, errors) if error is None)
+    return [("error", i, e) if e else ("updated", i, None) for i, e in zip(ids, errors)]
+
+
+def batch_delete_boardgames(
+    session: Session, ids: list[int], atomic: bool = False
+) -> list[tuple[str, int, str | None]]:
+    """Delete games by id in one transaction; with atomic=True a missing id deletes nothing."""
+    errors = _duplicate_ids(ids)
+    targets = list(dict.fromkeys(ids))
+    deleted: set[int] = set()
+    for i in range(0, len(targets), _IN_CHUNK):
+        stmt = delete(BoardGame).where(BoardGame.id.in_(targets[i:i + _IN_CHUNK])).returning(BoardGame.id)
+        deleted.update(session.exec(stmt).scalars())
+    errors = [e or (None if game_id in deleted else "Board game not found") for game_id, e in zip(ids, errors)]
+
+    if atomic and any(errors):
+        session.rollback()
+        return _not_applied(ids, errors)
+    session.commit()
+    invalidate_cached(deleted)
+    return [("error", i, e) if e else ("deleted", i, None) for i, e in zip(ids, errors)]
+
+
+def delete_boardgames_matching(session: Session, filters: dict, max_rows: int) -> list[int]:
+    """Delete every game matching the list filters, refusing without writing above max_rows."""
+    conditions = filter_conditions(filters)
+    if not conditions:
+        raise ValueError("Give ids or at least one filter")
+
+    # size the match first: an oversized filter must not delete (and fire triggers) before refusing
+    ids = session.exec(select(BoardGame.id).where(*conditions).limit(max_rows + 1)).all()
+    if len(ids) > max_rows:
+        raise ValueError(f"Filter matches more than the {max_rows} games allowed per batch")
+
+    # only the ids counted above, still matching, so a concurrent insert cannot grow the batch
+    deleted: list[int] = []
+    for i in range(0, len(ids), _IN_CHUNK):
+        stmt = delete(BoardGame).where(BoardGame.id.in_(ids[i:i + _IN_CHUNK]), *conditions)
+        deleted.extend(session.exec(stmt.returning(BoardGame.id)).scalars())
+    session.commit()
+    invalidate_cached(deleted)
+    return sorted(deleted)
@@ -0,0 +1,100 @@
+"""Async counterparts of the core app.crud functions, used when settings.db_io == "async"."""
+from datetime import datetime
+
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.models import BoardGame
+
+
+async def list_boardgames(
+    session: AsyncSession,
+    limit: int = 100,
+    after: str | None = None,
+    sort: str = "id",
+    order: str = "asc",
+    filters: dict | None = None,
+    version: int | None = None,
+) -> tuple[list[Row], str | None]:
+    # shares crud's caches, so both paths see the same hits and invalidations
+    if crud.list_cache.enabled:
+        if version is None:
+            version = (await get_catalog_state(session))[0]
+        key = crud.page_key(version, limit, after, sort, order, filters)
+        page = crud.cached_page(key)
+        if page is not None:
+            return page
+
+    rows = (await session.exec(crud.list_statement(limit, after, sort, order, filters))).all()
+    games, next_cursor = crud.page_from_rows(rows, limit, sort, order)
+    if crud.list_cache.enabled:
+        return crud.remember_page(key, games, next_cursor)
+    return games, next_cursor
+
+
+async def get_catalog_state(session: AsyncSession) -> tuple[int, datetime | None]:
+    return (await session.exec(crud.catalog_state_statement())).first() or (0, None)
+
+
+async def get_boardgame(session: AsyncSession, boardgame_id: int) -> BoardGame | None:
+    game = crud.cached_game(boardgame_id)
+    if game is not None:
+        return game
+    generation = crud.game_cache.generation  # see crud.get_boardgame
+    return crud.remember_game(await session.get(BoardGame, boardgame_id), generation)
+
+
+async def _commit_unique_name(session: AsyncSession, stmt=None) -> Row | None:
+    try:
+        row = (await session.exec(stmt)).first() if stmt is not None else None
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if crud.is_name_conflict(e):
+            raise ValueError(crud.NAME_EXISTS) from e
+        raise
+    return row
+
+
+async def create_boardgame(session: AsyncSession, boardgame: BoardGame) -> BoardGame:
+    boardgame.name = boardgame.name.strip()
+    session.add(boardgame)
+    await _commit_unique_name(session)
+    await session.refresh(boardgame)
+    crud.invalidate_cached()
+    if crud.feature_index.version is not None:
+        crud.note_feature_write((await get_catalog_state(session))[0], game=boardgame)
+    return boardgame
+
+
+async def update_boardgame(
+    session: AsyncSession, boardgame_id: int, data: dict
+) -> BoardGame | None:
+    try:
+        stmt = crud.update_statement(boardgame_id, data)
+    except ValueError:
+        if await session.get(BoardGame, boardgame_id) is None:
+            return None
+        raise
+    row = await _commit_unique_name(session, stmt)
+    if row is None:
+        return None
+
+    game = BoardGame.model_validate(row._mapping)
+    crud.invalidate_cached([boardgame_id])
+    if crud.feature_index.version is not None:
+        crud.note_feature_write((await get_catalog_state(session))[0], game=game)
+    return game
+
+
+async def delete_boardgame(session: AsyncSession, boardgame_id: int) -> bool:
+    deleted = (await session.exec(crud.delete_statement(boardgame_id))).first()
+    await session.commit()
+    if deleted is None:
+        return False
+    crud.invalidate_cached([boardgame_id])
+    if crud.feature_index.version is not None:
+        crud.note_feature_write((await get_catalog_state(session))[0], removed_id=boardgame_id)
+    return True
@@ -1,5 +1,8 @@
+from contextlib import contextmanager
+
 from sqlmodel import SQLModel, Session, create_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import event, text
+from sqlalchemy.pool import NullPool, QueuePool
 
 from app.config import settings
 
@@ -10,25 +13,235 @@ if settings.database_url.startswith("sqlite:///"):
 
 DATABASE_URL = settings.database_url
 
-engine_kwargs = {
-    "echo": settings.database_echo,
+# Per-connection pragmas, applied on connect. WAL lets readers proceed while a writer commits.
+SQLITE_PROFILES = {
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # WAL + NORMAL: no fsync per commit, still crash-consistent
+        "cache_size": "-65536",  # 64 MiB
+        "mmap_size": "268435456",  # 256 MiB
+        "temp_store": "MEMORY",
+    },
+    "readonly": {
+        "query_only": "ON",
+        "cache_size": "-65536",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+    },
 }
+READ_PRAGMAS = {"query_only": "ON"}
+
+if settings.sqlite_profile not in SQLITE_PROFILES:
+    raise ValueError(
+        f"Unknown sqlite_profile {settings.sqlite_profile!r}; "
+        f"expected one of {', '.join(SQLITE_PROFILES)}"
+    )
+
+
+def _pragma_listener(pragmas: dict[str, str]):
+    def on_connect(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+    return on_connect
+
+
+def _make_engine(
+    pool_size: int,
+    pragmas: dict[str, str],
+    url: str = DATABASE_URL,
+    factory=create_engine,
+):
+    engine_kwargs = {
+        "echo": settings.database_echo,
+    }
+
+    if DATABASE_URL.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+
+    if DATABASE_URL == "sqlite://":
+        # the database lives in its one connection; a single-slot pool keeps it open and makes
+        # concurrent requests take turns instead of interleaving transactions on it
+        engine_kwargs.update(poolclass=QueuePool, pool_size=1, max_overflow=0)
+    elif DATABASE_URL.startswith("sqlite"):
+        engine_kwargs["pool_size"] = pool_size
+        engine_kwargs["max_overflow"] = 0
+
+    new_engine = factory(url, **engine_kwargs)
+    if DATABASE_URL.startswith("sqlite"):
+        pragmas = {"busy_timeout": str(settings.sqlite_busy_timeout_ms), **pragmas}
+        # async engines emit pool events on their sync_engine
+        sync_engine = getattr(new_engine, "sync_engine", new_engine)
+        event.listen(sync_engine, "connect", _pragma_listener(pragmas))
+    return new_engine
+
 
-if DATABASE_URL.startswith("sqlite"):
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
+profile = SQLITE_PROFILES[settings.sqlite_profile]
+
+# Writes go through a small pool: SQLite allows one writer at a time anyway, so queueing
+# in the pool is cheaper than spinning on busy_timeout.
+engine = _make_engine(settings.sqlite_write_pool_size, profile)
 
 if DATABASE_URL == "sqlite://":
-    engine_kwargs["poolclass"] = StaticPool
+    read_engine = engine  # a private in-memory database is only reachable through one connection
+else:
+    read_engine = _make_engine(settings.sqlite_read_pool_size, {**profile, **READ_PRAGMAS})
+
+async_engine = async_read_engine = None
+if settings.db_io == "async":
+    if DATABASE_URL == "sqlite://":
+        # the sync engine (schema, CLI, non-core routes) could not see a private in-memory db
+        raise ValueError("db_io=async needs a file database (db_mode=sqlite)")
+
+    # imported lazily: the asyncio extension needs greenlet, which sync deployments can skip
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    async_engine = _make_engine(
+        settings.sqlite_write_pool_size, profile, ASYNC_DATABASE_URL, create_async_engine
+    )
+    async_read_engine = _make_engine(
+        settings.sqlite_read_pool_size,
+        {**profile, **READ_PRAGMAS},
+        ASYNC_DATABASE_URL,
+        create_async_engine,
+    )
+
+
+def named_engines() -> dict:
+    """Every distinct engine of this process by role, for instrumentation."""
+    engines = {"write": engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    if async_engine is not None:
+        engines.update(async_write=async_engine, async_read=async_read_engine)
+    return engines
+
+
+def pool_status() -> dict:
+    """Checked-out connections per engine, and the share of the pool they take (1.0 = saturated)."""
+    status = {}
+    for name, eng in named_engines().items():
+        pool = getattr(eng, "sync_engine", eng).pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        # max_overflow is 0 for every engine here, so size() is the whole capacity
+        size, checked_out = pool.size(), pool.checkedout()
+        status[name] = {"size": size, "checked_out": checked_out, "saturation": round(checked_out / size, 2)}
+    return status
+
+
+# /health connects on its own, outside the pools: a probe queued behind a saturated pool
+# would time out instead of reporting the saturation
+_probe_engine = create_engine(
+    DATABASE_URL,
+    poolclass=NullPool,
+    connect_args={"timeout": 1.0} if DATABASE_URL.startswith("sqlite") else {},
+)
 
-engine = create_engine(DATABASE_URL, **engine_kwargs)
+
+def probe_database() -> None:
+    """Raises if the database cannot be opened and read within about a second."""
+    with _probe_engine.connect() as conn:
+        conn.execute(text("SELECT count(*) FROM sqlite_master"))
 
 
 def create_db_and_tables() -> None:
+    if settings.sqlite_profile == "readonly":
+        return  # the schema must already exist; this instance never writes
+
     import app.models  # noqa: F401  # register SQLModel models in metadata
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(engine)  # also upgrades older schemas, see app.models
 
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def get_read_session():
+    """Session on the read-only pool, for routes that never write."""
+    with Session(read_engine) as session:
+        yield session
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session():
+    async with AsyncSession(async_read_engine) as session:
+        yield session
+
+
+# Durability traded for speed while a bulk load runs; a crash can lose the chunk in flight,
+# which the importer's --start-line resume is designed for.
+BULK_LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": "-262144",  # 256 MiB
+}
+
+
+@contextmanager
+def bulk_load_connection():
+    """
+    Yield a connection with BULK_LOAD_PRAGMAS applied, restoring the previous values on exit.
+    Pragmas are per-connection, so callers must do all their work through this connection.
+    """
+    with engine.connect() as conn:
+        saved = {}
+        if DATABASE_URL.startswith("sqlite"):
+            for pragma, value in BULK_LOAD_PRAGMAS.items():
+                saved[pragma] = conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+        conn.commit()  # leave no transaction open so Sessions bound to conn own their commits
+
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            for pragma, value in saved.items():
+                conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+            conn.commit()
+
+
+@contextmanager
+def triggers_suspended(conn):
+    """
+    Drop the boardgame triggers for a large append, then bring the FTS index, the stats and the
+    catalog version up to date with set-based statements before recreating them.
+    Everything runs in one transaction on conn (SQLite DDL is transactional): other writers wait,
+    and a failure rolls back the rows and the trigger changes together.
+    Only inserts of new rows may happen inside; updates and deletes would not reach the derived tables.
+    """
+    from app.models import SQLITE_DDL, append_catchup
+
+    # the driver would run DDL outside a transaction, so open one explicitly (and take the write lock)
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+    triggers = [
+        row[0]
+        for row in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'boardgame'"
+        )
+    ]
+    after_id = conn.exec_driver_sql("SELECT coalesce(max(id), 0) FROM boardgame").scalar()
+    try:
+        for name in triggers:
+            conn.exec_driver_sql(f'DROP TRIGGER "{name}"')
+        yield conn
+        for statement in [*append_catchup(after_id), *SQLITE_DDL]:
+            conn.exec_driver_sql(statement)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
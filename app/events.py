@@ -0,0 +1,210 @@
+"""
+Server-Sent Events for catalog changes.
+
+One broadcaster per process follows the change log (crud.list_changes) and fans compact
+notifications ({"cursor", "changes": [{"id", "op"}]}) out to subscribers. Following the log
+rather than hooking the write paths means writes from other processes (CLI, other workers)
+are seen too; in-process commits only wake the broadcaster early.
+
+Every subscriber has a bounded queue. A client that falls behind does not hold anyone up:
+its backlog is dropped and replaced by one "resync" event.
+"""
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+
+import anyio
+import orjson
+from sqlmodel import Session, text
+
+from app import crud, database
+from app.config import settings
+
+logger = logging.getLogger("boardgamehub.events")
+
+# (event name, cursor, data)
+Message = tuple[str, int, dict]
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[Message] = asyncio.Queue(maxsize)
+        self.dropped = 0  # messages lost to overflow, for diagnostics
+        # the broadcaster's cursor when this subscription started receiving; every later
+        # change reaches the queue
+        self.start: int | None = None
+        self.started = asyncio.Event()
+
+    def begin(self, cursor: int) -> None:
+        self.start = cursor
+        self.started.set()
+
+    def offer(self, message: Message) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(("resync", message[1], {"cursor": message[1]}))
+
+
+def read_last_seq() -> int:
+    with Session(database.read_engine) as session:
+        seq = session.exec(
+            text("SELECT seq FROM sqlite_sequence WHERE name = 'boardgamechange'")
+        ).first()
+    return seq[0] if seq else 0
+
+
+def read_changes(since: int, limit: int = 1000) -> tuple[list, int, bool]:
+    with Session(database.read_engine) as session:
+        return crud.list_changes(session, since=since, limit=limit)
+
+
+def changes_message(changes: list, cursor: int) -> Message:
+    return "changes", cursor, {"cursor": cursor, "changes": [{"id": i, "op": op} for _, op, i, _ in changes]}
+
+
+class ChangeBroadcaster:
+    def __init__(
+        self,
+        queue_size: int = 256,
+        poll_interval: float = 1.0,
+        max_backoff: float = 30.0,
+        last_seq: Callable[[], int] = read_last_seq,
+        changes: Callable[[int], tuple[list, int, bool]] = read_changes,
+    ):
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.last_seq = last_seq
+        self.changes = changes
+        self.subscribers: set[Subscription] = set()
+        self.cursor: int | None = None  # last seq published; None while nobody listens
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self.subscribers.add(subscription)
+        if self.cursor is not None:
+            subscription.begin(self.cursor)
+        else:
+            self.wake()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+
+    def publish(self, message: Message) -> None:
+        for subscription in list(self.subscribers):
+            subscription.offer(message)
+
+    def wake(self) -> None:
+        """Poll now instead of at the next interval; safe to call from any thread."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def poll(self) -> None:
+        if not self.subscribers:
+            self.cursor = None  # nothing to catch up on when someone connects later
+            return
+        last = await anyio.to_thread.run_sync(self.last_seq)
+        if self.cursor is None or last < self.cursor:
+            if self.cursor is not None:  # the log was reset under us
+                self.publish(("resync", last, {"cursor": last}))
+            self.cursor = last
+            for subscription in self.subscribers:
+                if subscription.start is None:
+                    subscription.begin(last)
+            return
+
+        while self.cursor < last:
+            try:
+                changes, cursor, has_more = await anyio.to_thread.run_sync(self.changes, self.cursor)
+            except crud.ChangesCompacted:
+                self.publish(("resync", last, {"cursor": last}))
+                self.cursor = last
+                return
+            if changes:
+                self.publish(changes_message(changes, cursor))
+            self.cursor = max(cursor, self.cursor)
+            if not has_more:
+                break
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        backoff = 0.0
+        while True:
+            if backoff:
+                await asyncio.sleep(backoff)  # writes do not cut a backoff short
+            else:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+            self._wake.clear()
+            try:
+                await self.poll()
+            except Exception:
+                # e.g. "database is locked": keep following the log once reads work again; the
+                # cursor only moves after a successful read, so nothing is skipped
+                backoff = min(self.max_backoff, max(self.poll_interval, backoff * 2))
+                logger.exception("polling the change log failed; retrying in %.1f s", backoff)
+            else:
+                backoff = 0.0
+
+
+broadcaster = ChangeBroadcaster(settings.events_queue_size, settings.events_poll_interval_seconds)
+
+
+def format_event(event: str, cursor: int, data: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (cursor, event.encode(), orjson.dumps(data))
+
+
+async def event_stream(
+    broadcaster: ChangeBroadcaster, since: int | None = None, keepalive: float = 15.0
+) -> AsyncIterator[bytes]:
+    """
+    The SSE body for one subscriber. With since (a cursor, e.g. from Last-Event-ID), changes
+    missed while disconnected are replayed first; live messages that overlap are harmless,
+    since clients only invalidate.
+    """
+    subscription = broadcaster.subscribe()
+    try:
+        yield b"retry: 3000\n\n"
+        while not subscription.started.is_set():
+            try:
+                await asyncio.wait_for(subscription.started.wait(), keepalive)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+        cursor = subscription.start
+        if since is None:
+            yield format_event("ready", cursor, {"cursor": cursor})
+        else:
+            # reads the log as it is now, so everything up to subscription.start is covered
+            cursor = since
+            try:
+                has_more = True
+                while has_more:
+                    batch, cursor, has_more = await anyio.to_thread.run_sync(broadcaster.changes, cursor)
+                    if batch:
+                        yield format_event(*changes_message(batch, cursor))
+            except crud.ChangesCompacted:
+                cursor = await anyio.to_thread.run_sync(broadcaster.last_seq)
+                yield format_event("resync", cursor, {"cursor": cursor})
+
+        while True:
+            try:
+                event, seq, data = await asyncio.wait_for(subscription.queue.get(), keepalive)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event == "changes" and seq <= cursor:
+                continue  # already replayed
+            cursor = max(cursor, seq)
+            yield format_event(event, seq, data)
+    finally:
+        broadcaster.unsubscribe(subscription)
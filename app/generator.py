@@ -0,0 +1,126 @@
+"""Deterministic synthetic catalogs for load testing, generated in vectorized batches."""
+import math
+from collections.abc import Iterator
+
+import numpy as np
+
+PREFIXES = [
+    "", "The ", "Age of the ", "Rise of the ", "Fall of the ", "Tales of the ", "Return of the ",
+    "Legends of the ", "Quest for the ", "War of the ", "Lords of the ", "Secrets of the ",
+    "Dawn of the ", "Heart of the ", "Shadows of the ", "Echoes of the ",
+]
+ADJECTIVES = [
+    "Ancient", "Arcane", "Brass", "Burning", "Celestial", "Clockwork", "Crimson", "Crystal",
+    "Cursed", "Distant", "Drowned", "Eastern", "Emerald", "Endless", "Forgotten", "Frozen",
+    "Gilded", "Glorious", "Golden", "Grand", "Hidden", "Hollow", "Imperial", "Iron",
+    "Last", "Little", "Lost", "Lunar", "Merchant", "Midnight", "Mystic", "Northern",
+    "Obsidian", "Pale", "Quiet", "Restless", "Rising", "Royal", "Rusty", "Sacred",
+    "Scarlet", "Secret", "Shattered", "Silent", "Silver", "Sunken", "Tiny", "Twilight",
+    "Velvet", "Wandering", "Wild", "Winter",
+]
+NOUNS = [
+    "Abbeys", "Alchemists", "Armada", "Bazaar", "Beacons", "Caravans", "Castles", "Cathedrals",
+    "Citadels", "Colonies", "Crowns", "Dragons", "Dungeons", "Dynasties", "Empires", "Expeditions",
+    "Farmers", "Fjords", "Forests", "Forges", "Gardens", "Gears", "Guilds", "Harbors",
+    "Heists", "Islands", "Kingdoms", "Labyrinths", "Legends", "Lighthouses", "Mines", "Monks",
+    "Oracles", "Orchards", "Outposts", "Pirates", "Planets", "Potions", "Railways", "Relics",
+    "Rivers", "Ruins", "Scrolls", "Settlers", "Spires", "Temples", "Towers", "Traders",
+    "Vaults", "Vineyards", "Voyages", "Wizards",
+]
+PLACES = [
+    "", " of Avalon", " of Babel", " of Carthage", " of Eldoria", " of the Abyss", " of the Deep",
+    " of the East", " of the Nile", " of the North", " of the Sands", " of the Steppe", " of Valoria",
+    ": Legacy", ": Duel", ": Reforged", ": Big Box", ": Second Edition", ": The Card Game", ": Origins",
+    " of Atlantis", " of Kyoto", " of Mars", " of Venice",
+]
+FIRST_NAMES = [
+    "Alex", "Ana", "Bruno", "Chiara", "Daniel", "Elena", "Felix", "Greta", "Hiro", "Ines",
+    "Jonas", "Kasia", "Luis", "Maya", "Noah", "Olga", "Paolo", "Quinn", "Rosa", "Stefan",
+    "Tomas", "Uwe", "Vital", "Wolfgang", "Yuki", "Zoe",
+]
+LAST_NAMES = [
+    "Bauer", "Bianchi", "Castro", "Dubois", "Eriksen", "Fischer", "Garcia", "Hansen", "Ito",
+    "Jensen", "Kowalski", "Lang", "Moreau", "Novak", "Ortiz", "Petrov", "Rossi", "Schmidt",
+    "Tanaka", "Ullmann", "Varga", "Weber", "Yamada", "Zimmermann",
+]
+DESIGNERS = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+# Zipf-like popularity: a few prolific designers and a long tail
+_DESIGNER_WEIGHTS = 1 / (np.arange(len(DESIGNERS)) + 5.0) ** 1.2
+_DESIGNER_WEIGHTS /= _DESIGNER_WEIGHTS.sum()
+
+BATCH_SIZE = 50_000  # fixed, so the output for a seed does not depend on how it is consumed
+_NAME_SPACE = len(PREFIXES) * len(ADJECTIVES) * len(NOUNS) * len(PLACES)
+
+
+def _name_stride(seed: int) -> int:
+    """A per-seed multiplier coprime with _NAME_SPACE, so i -> i * stride % space is a bijection."""
+    stride = 7919 + 2 * (seed % 10_000)
+    while math.gcd(stride, _NAME_SPACE) != 1:
+        stride += 1
+    return stride
+
+
+def game_names(start: int, count: int, seed: int) -> list[str]:
+    """Names for indexes [start, start + count); unique across all indexes for a given seed."""
+    index = np.arange(start, start + count, dtype=np.int64)
+    code = (index * _name_stride(seed) + seed) % _NAME_SPACE
+    code, adjective = np.divmod(code, len(ADJECTIVES))
+    code, noun = np.divmod(code, len(NOUNS))
+    prefix, place = np.divmod(code, len(PLACES))
+    cycle = index // _NAME_SPACE  # once every combination is used, number the next round
+
+    return [
+        f"{PREFIXES[f]}{ADJECTIVES[a]} {NOUNS[n]}{PLACES[p]}" + (f" {c + 1}" if c else "")
+        for f, a, n, p, c in zip(
+            prefix.tolist(), adjective.tolist(), noun.tolist(), place.tolist(), cycle.tolist()
+        )
+    ]
+
+
+def _batch(rng: np.random.Generator, start: int, size: int, seed: int) -> list[dict]:
+    # heavier games run longer and rate a little higher, as on real catalogs
+    complexity = np.clip(rng.normal(2.4, 0.8, size), 1.0, 5.0).round(2)
+    play_time = np.exp(rng.normal(np.log(15 + 25 * complexity), 0.35))
+    play_time = np.clip((play_time / 5).round() * 5, 5, 600).astype(np.int64)
+    rating = np.clip(rng.normal(6.6 + 0.35 * (complexity - 2.4), 0.8, size), 1.0, 10.0).round(2)
+    rated = rng.random(size) >= 0.03
+
+    min_players = rng.choice([1, 2, 3, 4], size, p=[0.2, 0.6, 0.15, 0.05])
+    max_players = min_players + rng.choice([0, 1, 2, 3, 4, 6], size, p=[0.05, 0.15, 0.35, 0.25, 0.15, 0.05])
+    year = np.clip(2025 - rng.exponential(9.0, size).astype(np.int64), 1950, 2025)
+
+    designer = rng.choice(len(DESIGNERS), size, p=_DESIGNER_WEIGHTS)
+    credited = rng.random(size) >= 0.05
+
+    names = game_names(start, size, seed)
+    return [
+        {
+            "name": name,
+            "designer": DESIGNERS[d] if has_designer else None,
+            "year_published": y,
+            "min_players": lo,
+            "max_players": hi,
+            "play_time_min": t,
+            "complexity": c,
+            "rating": r if has_rating else None,
+        }
+        for name, d, has_designer, y, lo, hi, t, c, r, has_rating in zip(
+            names,
+            designer.tolist(),
+            credited.tolist(),
+            year.tolist(),
+            min_players.tolist(),
+            max_players.tolist(),
+            play_time.tolist(),
+            complexity.tolist(),
+            rating.tolist(),
+            rated.tolist(),
+        )
+    ]
+
+
+def generate_games(count: int, seed: int = 0) -> Iterator[list[dict]]:
+    """Yield batches of game rows (dicts of BoardGameCreate fields); the same seed gives the same rows."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, count, BATCH_SIZE):
+        yield _batch(rng, start, min(BATCH_SIZE, count - start), seed)
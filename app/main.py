@@ -1,19 +1,27 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, text
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
-from app.database import create_db_and_tables, engine
+from app import admission, crud, database, events, metrics, profiling, slowlog
+from app.config import settings
+from app.database import create_db_and_tables
 from app.routers.boardgames import router as boardgames_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    broadcaster = asyncio.create_task(events.broadcaster.run())
+    crud.write_listeners.append(events.broadcaster.wake)
     yield
+    crud.write_listeners.remove(events.broadcaster.wake)
+    broadcaster.cancel()
+    with suppress(asyncio.CancelledError):
+        await broadcaster
 
 
 
@@ -33,13 +41,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# inside the metrics middleware (added later, so it wraps this one): shed requests are still counted
+limiters = admission.limiters_from_settings(settings)
+if settings.admission_enabled:
+    app.add_middleware(
+        admission.AdmissionMiddleware,
+        limiters=limiters,
+        exempt=("/health", "/metrics", "/boardgames/events"),
+        retry_after=settings.admission_retry_after_seconds,
+    )
+
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+    if settings.admission_enabled:
+        metrics.instrument_admission(limiters)
+    for name, eng in database.named_engines().items():
+        metrics.instrument_engine(eng, name)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(
+            metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
+if settings.slow_query_ms > 0:
+    app.add_middleware(slowlog.RequestContextMiddleware)
+    slow_queries = slowlog.SlowQueryLog(
+        settings.slow_query_ms,
+        interval_seconds=settings.slow_query_interval_seconds,
+        max_per_minute=settings.slow_query_max_per_minute,
+        explain=settings.slow_query_explain,
+    )
+    for name, eng in database.named_engines().items():
+        slow_queries.instrument(eng, name)
+
+
+if settings.profiling_enabled:
+    app.add_middleware(
+        profiling.ProfilingMiddleware,
+        directory=settings.profiling_dir,
+        header=settings.profiling_header,
+        token=settings.profiling_token,
+        sample_rate=settings.profiling_sample_rate,
+        interval=settings.profiling_interval_ms / 1000,
+    )
+
 
 @app.get("/health")
 def health():
     try:
-        with Session(engine) as session:
-            session.exec(text("SELECT 1"))
-        return {"status": "ok", "database": "ok"}
+        database.probe_database()
+        return {
+            "status": "ok",
+            "database": "ok",
+            "cache": crud.cache_stats(),
+            "pools": database.pool_status(),
+            "admission": {name: limiter.stats() for name, limiter in limiters.items()},
+        }
     except Exception:
         return JSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -0,0 +1,279 @@
+"""
+In-process metrics in the Prometheus text format, without the prometheus_client dependency.
+
+Every thread writes to its own shard, so recording never takes a lock; a scrape sums the
+shards. Counters and histograms only grow, so a scrape racing a writer is at most one
+observation behind.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import event
+
+from app.cache import MISSING, TTLCache
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# name -> (type, help, label names, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by route and status.", ("method", "route", "status"), None),
+    "http_request_duration_seconds": (
+        "histogram", "HTTP request latency, including streamed bodies.", ("method", "route"), LATENCY_BUCKETS
+    ),
+    "http_requests_in_flight": ("gauge", "HTTP requests being served.", (), None),
+    "db_statement_duration_seconds": (
+        "histogram", "Time in cursor.execute per normalized statement.", ("engine", "statement"), DB_BUCKETS
+    ),
+    "db_pool_size": ("gauge", "Configured connections in the pool.", ("engine",), None),
+    "db_pool_checked_out": ("gauge", "Connections currently checked out.", ("engine",), None),
+    "db_pool_overflow": ("gauge", "Connections open beyond pool_size.", ("engine",), None),
+    "admission_active": ("gauge", "Requests holding an admission slot.", ("class",), None),
+    "admission_queued": ("gauge", "Requests waiting for an admission slot.", ("class",), None),
+    "admission_rejected_total": ("counter", "Requests shed with 503 by admission control.", ("class",), None),
+}
+
+Sample = tuple[str, tuple, float]
+
+
+class _Shard:
+    __slots__ = ("values", "histograms")
+
+    def __init__(self):
+        self.values: defaultdict[tuple, float] = defaultdict(float)  # (name, labels) -> value
+        self.histograms: dict[tuple, list] = {}  # (name, labels) -> [bucket counts..., sum]
+
+
+class Registry:
+    def __init__(self, metrics: dict = METRICS):
+        self.metrics = metrics
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, _Shard]] = []
+        # counts of threads that have exited (threadpool workers are retired when idle), so
+        # the shard list tracks live threads instead of every thread the process ever ran
+        self._retired = _Shard()
+        self._shards_lock = threading.Lock()  # taken once per thread, when its shard is created
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead(self) -> None:
+        """Fold the shards of exited threads into _retired; needs _shards_lock."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                _add_shard(self._retired.values, self._retired.histograms, shard)
+        self._shards = live
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1.0) -> None:
+        self._shard().values[(name, labels)] += value
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        buckets = self.metrics[name][3]
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0] * (len(buckets) + 2)
+        counts[bisect_left(buckets, value)] += 1  # the slot after the last bucket is +Inf
+        counts[-1] += value
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callback that reports gauge samples at scrape time."""
+        self._collectors.append(collector)
+
+    def clear(self) -> None:
+        with self._shards_lock:
+            for shard in (self._retired, *(shard for _, shard in self._shards)):
+                shard.values.clear()
+                shard.histograms.clear()
+
+    def collect(self) -> tuple[dict[tuple, float], dict[tuple, list]]:
+        values: defaultdict[tuple, float] = defaultdict(float)
+        histograms: dict[tuple, list] = {}
+        with self._shards_lock:
+            self._retire_dead()
+            _add_shard(values, histograms, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            _add_shard(values, histograms, shard)
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                values[(name, labels)] = value
+        return values, histograms
+
+    def render(self) -> str:
+        values, histograms = self.collect()
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in self.metrics.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            if kind != "histogram":
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(label_names, labels)} {_number(value)}")
+                continue
+
+            for (metric, labels), counts in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip((*buckets, float("inf")), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    lines.append(f"{name}_bucket{_labels((*label_names, 'le'), (*labels, le))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(label_names, labels)} {_number(counts[-1])}")
+                lines.append(f"{name}_count{_labels(label_names, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _add_shard(values: dict, histograms: dict, shard: _Shard) -> None:
+    for key, value in list(shard.values.items()):
+        values[key] = values.get(key, 0.0) + value
+    for key, counts in list(shard.histograms.items()):
+        total = histograms.setdefault(key, [0] * len(counts))
+        for i, c in enumerate(list(counts)):
+            total[i] += c
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+registry = Registry()
+
+
+# ---- HTTP ----
+def route_template(scope) -> str:
+    """Path template of the matched route, e.g. /boardgames/{boardgame_id}."""
+    # newer FastAPI records included routers' routes with their own (unprefixed) path in "route"
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if context is not None and getattr(context, "path", None):
+        return context.path
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: counts and times requests by route template, streaming included."""
+
+    def __init__(self, app, registry: Registry = registry, exclude: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.registry = registry
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            return await self.app(scope, receive, send)
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.inc("http_requests_in_flight")
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.inc("http_requests_in_flight", value=-1)
+            route = route_template(scope)
+            method = scope["method"]
+            self.registry.inc("http_requests_total", (method, route, str(status)))
+            self.registry.observe(
+                "http_request_duration_seconds", (method, route), time.perf_counter() - started
+            )
+
+
+def instrument_admission(limiters: dict, registry: Registry = registry) -> None:
+    """Report each admission class's slots, queue and rejections at scrape time."""
+
+    def admission_gauges() -> Iterable[Sample]:
+        for name, limiter in limiters.items():
+            yield "admission_active", (name,), limiter.active
+            yield "admission_queued", (name,), limiter.queued
+            yield "admission_rejected_total", (name,), limiter.rejected
+
+    registry.add_collector(admission_gauges)
+
+
+# ---- Database ----
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACES = re.compile(r"\s+")
+_MAX_STATEMENTS = 1000  # label cardinality cap; any new label beyond it is reported as "other"
+_statement_labels: set[str] = set()
+# raw SQL -> label, so normalizing is paid once per statement text. Bounded on its own: IN-lists
+# give one raw text per arity, which all share a label and must not use up the label cap
+_label_memo = TTLCache(maxsize=4096, ttl=float("inf"))
+
+
+def statement_label(statement: str) -> str:
+    """SQL with literals and IN-lists collapsed, so each distinct query is one label."""
+    label = _label_memo.get(statement)
+    if label is MISSING:
+        label = _SPACES.sub(" ", statement).strip()
+        label = _PLACEHOLDER_LISTS.sub("(?)", _LITERALS.sub("?", label))
+        if label not in _statement_labels:
+            if len(_statement_labels) >= _MAX_STATEMENTS:
+                return "other"  # not memoized: a label seen before the cap still resolves
+            _statement_labels.add(label)
+        _label_memo.set(statement, label)
+    return label
+
+
+def instrument_engine(engine, name: str, registry: Registry = registry) -> None:
+    """Time every cursor execution on engine and report its pool gauges at scrape time."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        registry.observe("db_statement_duration_seconds", (name, statement_label(statement)), elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context):
+        # after_cursor_execute is skipped for failed statements; drop their start time
+        if context.connection is not None and context.connection.info.get("metrics_started"):
+            context.connection.info["metrics_started"].pop()
+
+    def pool_gauges() -> Iterable[Sample]:
+        pool = sync_engine.pool
+        # StaticPool and friends have no size/overflow accounting
+        for metric, attr in (
+            ("db_pool_size", "size"),
+            ("db_pool_checked_out", "checkedout"),
+            ("db_pool_overflow", "overflow"),
+        ):
+            if hasattr(pool, attr):
+                yield metric, (name,), max(0, getattr(pool, attr)())
+
+    registry.add_collector(pool_gauges)
@@ -1,17 +1,246 @@
+from datetime import datetime, timezone
 from typing import Optional
+from sqlalchemy import Index, event, func
+from sqlalchemy.schema import CreateColumn, CreateIndex
 from sqlmodel import SQLModel, Field
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class BoardGame(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
 
-    name: str
+    name: str = Field(index=True)
     designer: Optional[str] = None
-    year_published: Optional[int] = None
+    year_published: Optional[int] = Field(default=None, index=True)
 
     min_players: int
     max_players: int
 
     play_time_min: Optional[int] = None  # minutes
     complexity: Optional[float] = None   # e.g. 1.0 - 5.0
-    rating: Optional[float] = None       # e.g. 0.0 - 10.0
+    rating: Optional[float] = Field(default=None, index=True)  # e.g. 0.0 - 10.0
+
+    # bumped on every update; backs the per-row ETag
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_column_kwargs={"default": utcnow, "onupdate": utcnow}
+    )
+
+
+# Names are unique case-insensitively; the expression index also serves lower(name) lookups.
+Index("ux_boardgame_name_lower", func.lower(BoardGame.name), unique=True)
+
+
+class CatalogState(SQLModel, table=True):
+    """Single row (id=1) whose version is bumped by triggers on every boardgame change."""
+    id: int = Field(default=1, primary_key=True)
+    version: int = 0
+    updated_at: Optional[datetime] = None
+    # change-log seq below which compaction may have dropped tombstones; see crud.compact_changes()
+    changes_floor: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # random per database, set when the row is created: versions restart at 0 after a reset or
+    # in a replaced file, so anything memoized per version is keyed on (instance_id, version)
+    instance_id: Optional[str] = None
+
+
+class BoardGameChange(SQLModel, table=True):
+    """
+    Append-only change log written by triggers on boardgame, in the writing transaction.
+    AUTOINCREMENT keeps seq monotonic: numbers are never reused, even after compaction.
+    """
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    boardgame_id: int
+    op: str  # upsert | delete
+    changed_at: Optional[datetime] = None
+
+
+# latest change per game, for the change feed and compaction
+Index("ix_boardgamechange_game_seq", BoardGameChange.boardgame_id, BoardGameChange.seq)
+
+
+class BoardGameStat(SQLModel, table=True):
+    """
+    Catalog aggregates per (dimension, bucket), e.g. ("year", "1995") or ("designer", "Uwe Rosenberg").
+    Maintained incrementally by triggers on boardgame, so reading stats never scans the catalog.
+    """
+    dimension: str = Field(primary_key=True)
+    bucket: str = Field(primary_key=True)
+    games: int = 0
+    rating_sum: float = 0.0
+    rating_n: int = 0
+    complexity_sum: float = 0.0
+    complexity_n: int = 0
+
+
+# serves "top designers by number of games" without sorting every designer
+Index("ix_boardgamestat_dimension_games", BoardGameStat.dimension, BoardGameStat.games)
+
+
+# ---- SQLite objects that SQLModel metadata cannot express ----
+# All statements are idempotent: they run after every create_all(), which also upgrades
+# databases created before the objects existed.
+
+_BUMP_CATALOG = (
+    "UPDATE catalogstate SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;"
+)
+
+_LOG_CHANGE = (
+    "INSERT INTO boardgamechange (boardgame_id, op, changed_at) "
+    "VALUES ({r}.id, '{op}', CURRENT_TIMESTAMP);"
+)
+_CHANGE_BACKFILL = (
+    "INSERT INTO boardgamechange (boardgame_id, op, changed_at) "
+    "SELECT id, 'upsert', CURRENT_TIMESTAMP FROM boardgame WHERE {where} ORDER BY id"
+)
+
+_FTS_INSERT = (
+    "INSERT INTO boardgame_fts (rowid, name, designer) VALUES (new.id, new.name, new.designer);"
+)
+_FTS_DELETE = (
+    "INSERT INTO boardgame_fts (boardgame_fts, rowid, name, designer) "
+    "VALUES ('delete', old.id, old.name, old.designer);"
+)
+
+# dimension -> (bucket expression, row filter); {r} is new/old in triggers, boardgame in backfills
+STAT_DIMENSIONS = {
+    "total": ("''", "1"),
+    "rating": ("CAST(min(max({r}.rating, 0), 9.999) AS INTEGER)", "{r}.rating IS NOT NULL"),
+    "year": ("{r}.year_published", "{r}.year_published IS NOT NULL"),
+    "min_players": ("{r}.min_players", "1"),
+    "max_players": ("{r}.max_players", "1"),
+    "designer": ("{r}.designer", "{r}.designer IS NOT NULL"),
+}
+_STAT_COLUMNS = "dimension, bucket, games, rating_sum, rating_n, complexity_sum, complexity_n"
+_STAT_UPSERT = (
+    "ON CONFLICT (dimension, bucket) DO UPDATE SET "
+    "games = games + excluded.games, "
+    "rating_sum = rating_sum + excluded.rating_sum, rating_n = rating_n + excluded.rating_n, "
+    "complexity_sum = complexity_sum + excluded.complexity_sum, "
+    "complexity_n = complexity_n + excluded.complexity_n"
+)
+
+
+def _stat_delta(r: str, sign: int) -> str:
+    """Statements adding (sign=1) or removing (sign=-1) row r from every aggregate."""
+    statements = []
+    for dimension, (bucket, condition) in STAT_DIMENSIONS.items():
+        statements.append(
+            f"INSERT INTO boardgamestat ({_STAT_COLUMNS}) "
+            f"SELECT '{dimension}', {bucket.format(r=r)}, {sign}, "
+            f"{sign} * coalesce({r}.rating, 0), {sign} * ({r}.rating IS NOT NULL), "
+            f"{sign} * coalesce({r}.complexity, 0), {sign} * ({r}.complexity IS NOT NULL) "
+            f"WHERE {condition.format(r=r)} "
+            f"{_STAT_UPSERT};"
+        )
+    return " ".join(statements)
+
+
+def _stat_backfill(where: str = "1") -> list[str]:
+    """Set-based equivalent of the stats triggers for the boardgame rows matching where."""
+    return [
+        f"INSERT INTO boardgamestat ({_STAT_COLUMNS}) "
+        f"SELECT '{dimension}', {bucket.format(r='boardgame')}, count(*), "
+        "total(rating), count(rating), total(complexity), count(complexity) "
+        f"FROM boardgame WHERE {condition.format(r='boardgame')} AND {where} GROUP BY 2 "
+        f"{_STAT_UPSERT}"
+        for dimension, (bucket, condition) in STAT_DIMENSIONS.items()
+    ]
+
+
+SQLITE_DDL = [
+    "INSERT OR IGNORE INTO catalogstate (id, version, updated_at, instance_id) "
+    "VALUES (1, 0, CURRENT_TIMESTAMP, lower(hex(randomblob(8))))",
+    "UPDATE catalogstate SET instance_id = lower(hex(randomblob(8))) WHERE instance_id IS NULL",
+    *(
+        f"CREATE TRIGGER IF NOT EXISTS boardgame_catalog_{op.lower()} AFTER {op} ON boardgame "
+        f"BEGIN {_BUMP_CATALOG} END"
+        for op in ("INSERT", "UPDATE", "DELETE")
+    ),
+    *(
+        f"CREATE TRIGGER IF NOT EXISTS boardgame_changes_{op.lower()} AFTER {op} ON boardgame "
+        f"BEGIN {_LOG_CHANGE.format(r=row, op=kind)} END"
+        for op, row, kind in (("INSERT", "new", "upsert"), ("UPDATE", "new", "upsert"), ("DELETE", "old", "delete"))
+    ),
+    # full-text index over name/designer; external content, so rows are stored only once
+    "CREATE VIRTUAL TABLE IF NOT EXISTS boardgame_fts USING fts5("
+    "name, designer, content='boardgame', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS boardgame_fts_insert AFTER INSERT ON boardgame "
+    f"BEGIN {_FTS_INSERT} END",
+    f"CREATE TRIGGER IF NOT EXISTS boardgame_fts_delete AFTER DELETE ON boardgame "
+    f"BEGIN {_FTS_DELETE} END",
+    f"CREATE TRIGGER IF NOT EXISTS boardgame_fts_update AFTER UPDATE OF name, designer ON boardgame "
+    f"BEGIN {_FTS_DELETE} {_FTS_INSERT} END",
+    f"CREATE TRIGGER IF NOT EXISTS boardgame_stats_insert AFTER INSERT ON boardgame "
+    f"BEGIN {_stat_delta('new', 1)} END",
+    f"CREATE TRIGGER IF NOT EXISTS boardgame_stats_delete AFTER DELETE ON boardgame "
+    f"BEGIN {_stat_delta('old', -1)} END",
+    "CREATE TRIGGER IF NOT EXISTS boardgame_stats_update AFTER UPDATE OF "
+    "rating, complexity, year_published, min_players, max_players, designer ON boardgame "
+    f"BEGIN {_stat_delta('old', -1)} {_stat_delta('new', 1)} END",
+]
+
+# Derived tables filled from boardgame when they are first created on an existing database
+SQLITE_BACKFILL = {
+    "boardgame_fts": ["INSERT INTO boardgame_fts (boardgame_fts) VALUES ('rebuild')"],
+    "boardgamestat": _stat_backfill(),
+    "boardgamechange": [_CHANGE_BACKFILL.format(where="1")],
+}
+
+
+
+def append_catchup(after_id: int) -> list[str]:
+    """
+    Statements doing the work of the boardgame triggers, in bulk, for rows with id > after_id
+    that were inserted while the triggers were dropped (see database.triggers_suspended()).
+    """
+    where = f"boardgame.id > {int(after_id)}"
+    return [
+        "INSERT INTO boardgame_fts (rowid, name, designer) "
+        f"SELECT id, name, designer FROM boardgame WHERE {where}",
+        *_stat_backfill(where),
+        _CHANGE_BACKFILL.format(where=where),
+        _BUMP_CATALOG.rstrip(";"),
+    ]
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def _drop_sqlite_extras(target, connection, **kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    # boardgame_fts is raw DDL outside the metadata; left behind by drop_all(), it would keep
+    # the old catalog's rowids, and create_all() only rebuilds it when it is missing. The
+    # triggers go with the boardgame table.
+    connection.exec_driver_sql("DROP TABLE IF EXISTS boardgame_fts")
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _upgrade_sqlite_schema(target, connection, **kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+
+    # create_all() skips existing tables, so add columns and indexes introduced since
+    for table in target.sorted_tables:
+        existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+    # tables that existed before this create_all() call
+    existing_tables = {
+        row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")
+    } - {table.name for table in kw.get("tables", [])}
+    for statement in SQLITE_DDL:
+        connection.exec_driver_sql(statement)
+    for table_name, statements in SQLITE_BACKFILL.items():
+        if table_name not in existing_tables:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
@@ -0,0 +1,164 @@
+"""
+Opt-in request profiling: a sampling profiler that records collapsed stacks
+("frame;frame;frame count" lines, as read by flamegraph.pl, speedscope or inferno).
+
+The sampler reads sys._current_frames() from a background thread, so it sees the event loop
+and the threadpool worker running a sync endpoint alike. It samples the whole process, which
+means requests running concurrently with a profiled one show up in its profile too.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import anyio
+
+from app.metrics import route_template
+
+# leaf frames of threads that are parked rather than working
+_IDLE_LEAVES = {
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("selectors.py", "EpollSelector.select"),
+    ("selectors.py", "KqueueSelector.select"),
+    ("selectors.py", "PollSelector.select"),
+    ("selectors.py", "SelectSelector.select"),
+}
+_short_paths: dict[str, str] = {}
+
+
+def _short_path(filename: str) -> str:
+    short = _short_paths.get(filename)
+    if short is None:
+        marker = "site-packages" + os.sep
+        if marker in filename:
+            short = filename.split(marker, 1)[1]
+        else:
+            try:
+                short = os.path.relpath(filename)
+            except ValueError:
+                short = filename
+            if short.startswith(".."):
+                short = os.path.basename(filename)
+        _short_paths[filename] = short
+    return short
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """Counts the stacks of every other thread every interval seconds while running."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_qualname)
+                if leaf in _IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests whose trigger header carries token, plus a random sample_rate share of
+    all requests, and writes one .collapsed file per request to directory. The file name is
+    returned in the X-Profile-Id response header. Profiling slows the whole process, so only
+    one request is profiled at a time; others that ask meanwhile run unprofiled.
+    """
+
+    def __init__(
+        self,
+        app,
+        directory: str | Path,
+        header: str = "X-Profile",
+        token: str | None = None,
+        sample_rate: float = 0.0,
+        interval: float = 0.002,
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.header = header.lower().encode()
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.active = False  # one event loop, so a plain flag is enough
+
+    def _wanted(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == self.header and hmac.compare_digest(value, self.token):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.active or not self._wanted(scope):
+            return await self.app(scope, receive, send)
+        self.active = True
+        try:
+            await self._profiled(scope, receive, send)
+        finally:
+            self.active = False
+
+    async def _profiled(self, scope, receive, send):
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval).start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            route = f"{scope['method']} {route_template(scope)}"
+            await anyio.to_thread.run_sync(self._write, profile_id, route, elapsed_ms, profiler)
+
+    def _write(self, profile_id: str, route: str, elapsed_ms: float, profiler: SamplingProfiler) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile_id}.collapsed"
+        header = f"# {route} {elapsed_ms:.1f} ms, {profiler.samples} samples every {self.interval * 1000:g} ms\n"
+        path.write_text(header + profiler.collapsed(), encoding="utf-8")
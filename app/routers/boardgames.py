@@ -1,20 +1,319 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal
+
+import orjson
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlmodel import Session
 
-from app.database import get_session
-from app import crud
+from app.config import settings
+from app.database import get_read_session, get_session
+from app.routers.conditional import is_not_modified, not_modified, row_etag, validator_headers
+from app.routers.encoding import changes_response, game_response, games_response
+from app.routers.params import filter_params, page_params
+from app import crud, events
 from app.models import BoardGame
-from app.schemas import BoardGameCreate, BoardGameRead, BoardGameUpdate
+from app.schemas import (
+    BatchResult,
+    BatchUpdateItem,
+    BoardGameCreate,
+    BoardGameRead,
+    BoardGameUpdate,
+    BulkItemResult,
+    BulkResult,
+    CatalogStats,
+    ChangeFeed,
+)
 
 router = APIRouter(prefix="/boardgames", tags=["BoardGames"])
 
+EXPORT_FIELDS = ["id", *BoardGameCreate.model_fields]
+EXPORT_FLUSH_ROWS = 256  # rows per body chunk; keeps chunks small without one send per row
+
+
+def _ndjson_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    buf = []
+    for row in rows:
+        buf.append(orjson.dumps(dict(zip(EXPORT_FIELDS, row))).decode())
+        if len(buf) == EXPORT_FLUSH_ROWS:
+            yield "\n".join(buf) + "\n"
+            buf.clear()
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def _validation_detail(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _batch_response(results: list[BulkItemResult], atomic: bool):
+    failed = sum(r.status == "error" for r in results)
+    body = BatchResult(
+        updated=sum(r.status == "updated" for r in results),
+        deleted=sum(r.status == "deleted" for r in results),
+        failed=failed,
+        committed=not (atomic and failed),
+        results=results,
+    )
+    if not body.committed:
+        return JSONResponse(status_code=409, content=body.model_dump())
+    return body
+
+
+def _csv_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    yield out.getvalue()  # the header goes out before the first row is fetched
+
+    out.seek(0)
+    out.truncate()
+    for n, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if n % EXPORT_FLUSH_ROWS == 0:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue()
 
-@router.get("/", response_model=list[BoardGameRead])
-def list_boardgames(session: Session = Depends(get_session)):
-    return crud.list_boardgames(session)
 
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_boardgames(
+    items: list[dict[str, Any]] = Body(..., max_length=settings.bulk_max_items),
+    upsert: bool = Query(False, description="Update games whose name already exists"),
+    session: Session = Depends(get_session),
+):
+    # items are validated one by one so a bad row is reported instead of failing the batch
+    results: list[BulkItemResult | None] = [None] * len(items)
+    rows, positions = [], []
+    for i, item in enumerate(items):
+        try:
+            rows.append(BoardGameCreate.model_validate(item).model_dump())
+            positions.append(i)
+        except ValidationError as e:
+            results[i] = BulkItemResult(index=i, status="error", detail=_validation_detail(e))
+
+    for i, (status, game_id, detail) in zip(
+        positions, crud.bulk_create_boardgames(session, rows, upsert=upsert)
+    ):
+        results[i] = BulkItemResult(index=i, status=status, id=game_id, detail=detail)
+
+    return BulkResult(
+        created=sum(r.status == "created" for r in results),
+        updated=sum(r.status == "updated" for r in results),
+        failed=sum(r.status == "error" for r in results),
+        results=results,
+    )
+
+
+ATOMIC_QUERY = Query(False, description="All or nothing: write nothing if any item fails (409)")
+
+
+@router.patch("/batch", response_model=BatchResult)
+def batch_update_boardgames(
+    items: list[dict[str, Any]] = Body(..., max_length=settings.bulk_max_items),
+    atomic: bool = ATOMIC_QUERY,
+    session: Session = Depends(get_session),
+):
+    """Partial updates ({"id": ..., <fields to change>}) applied in one transaction."""
+    results: list[BulkItemResult | None] = [None] * len(items)
+    updates, positions = [], []
+    for i, item in enumerate(items):
+        try:
+            parsed = BatchUpdateItem.model_validate(item)
+        except ValidationError as e:
+            # the raw id may be what failed validation; echo it back only when it is usable
+            game_id = item.get("id")
+            if isinstance(game_id, bool) or not isinstance(game_id, int):
+                game_id = None
+            results[i] = BulkItemResult(index=i, status="error", id=game_id, detail=_validation_detail(e))
+            continue
+        updates.append((parsed.id, parsed.model_dump(exclude_unset=True, exclude={"id"})))
+        positions.append(i)
 
-@router.post("/", response_model=BoardGameRead, status_code=201)
+    if atomic and positions != list(range(len(items))):
+        outcomes = [("skipped", game_id, None) for game_id, _ in updates]
+    else:
+        try:
+            outcomes = crud.batch_update_boardgames(session, updates, atomic=atomic)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    for i, (status, game_id, detail) in zip(positions, outcomes):
+        results[i] = BulkItemResult(index=i, status=status, id=game_id, detail=detail)
+    return _batch_response(results, atomic)
+
+
+@router.delete("/batch", response_model=BatchResult)
+def batch_delete_boardgames(
+    ids: list[int] | None = Body(None, embed=True, max_length=settings.bulk_max_items),
+    filters: dict = Depends(filter_params),
+    atomic: bool = ATOMIC_QUERY,
+    session: Session = Depends(get_session),
+):
+    """Delete the games listed in {"ids": [...]}, or every game matching the list filters."""
+    if ids is not None and filters:
+        raise HTTPException(status_code=400, detail="Give either ids or filters, not both")
+    try:
+        if ids is not None:
+            outcomes = crud.batch_delete_boardgames(session, ids, atomic=atomic)
+        else:
+            deleted = crud.delete_boardgames_matching(session, filters, settings.bulk_max_items)
+            outcomes = [("deleted", game_id, None) for game_id in deleted]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results = [
+        BulkItemResult(index=i, status=status, id=game_id, detail=detail)
+        for i, (status, game_id, detail) in enumerate(outcomes)
+    ]
+    return _batch_response(results, atomic)
+
+
+@router.get("/search", response_model=list[BoardGameRead])
+def search_boardgames(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in name or designer"),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    session: Session = Depends(get_read_session),
+):
+    """Ranked (bm25) full-text search; the last word also matches as a prefix."""
+    try:
+        games, next_cursor = crud.search_boardgames(session, q, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return games_response(games, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+@router.get("/stats", response_model=CatalogStats)
+def catalog_stats(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+):
+    """Rating histogram, games per year, player-count coverage and top designers."""
+    version, modified = crud.get_catalog_state(session)
+    headers = validator_headers(f'"stats-{version}"', modified)
+    if is_not_modified(request, headers["ETag"], modified):
+        return not_modified(headers)
+
+    response.headers.update(headers)
+    return crud.get_catalog_stats(session, version=version)
+
+
+@router.get("/recommend", response_model=list[BoardGameRead])
+def recommend_boardgames(
+    players: int | None = Query(None, ge=1, description="Number of players at the table"),
+    max_minutes: int | None = Query(None, ge=1, description="Longest acceptable play time"),
+    k: int = Query(10, ge=1, le=100),
+    session: Session = Depends(get_read_session),
+):
+    """Best-rated games that support the player count and fit the time budget."""
+    return games_response(crud.recommend_boardgames(session, players=players, max_minutes=max_minutes, k=k))
+
+
+@router.get("/{boardgame_id}/similar", response_model=list[BoardGameRead])
+def similar_boardgames(
+    boardgame_id: int,
+    k: int = Query(10, ge=1, le=100),
+    session: Session = Depends(get_read_session),
+):
+    """Nearest games by complexity, rating, play time, player range and year."""
+    games = crud.similar_boardgames(session, boardgame_id, k=k)
+    if games is None:
+        raise HTTPException(status_code=404, detail="Board game not found")
+    return games_response(games)
+
+
+@router.get("/changes", response_model=ChangeFeed)
+def list_changes(
+    since: int = Query(0, ge=0, description="cursor from the previous call; 0 for a full snapshot"),
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    session: Session = Depends(get_read_session),
+):
+    """Games created, updated (upsert) or deleted (tombstone) since a cursor, oldest first."""
+    try:
+        changes, cursor, has_more = crud.list_changes(session, since=since, limit=limit)
+    except crud.ChangesCompacted as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    return changes_response(changes, cursor, has_more)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def change_events(
+    since: int | None = Query(None, ge=0, description="replay changes after this cursor first"),
+    last_event_id: int | None = Header(None, ge=0),
+):
+    """
+    Server-Sent Events: a "changes" event ({"cursor", "changes": [{"id", "op"}]}) whenever
+    games are written, so dashboards refetch only those rows. Reconnecting with Last-Event-ID
+    replays what was missed; "resync" means the client must drop everything it holds.
+    """
+    return StreamingResponse(
+        events.event_stream(
+            events.broadcaster,
+            since=last_event_id if last_event_id is not None else since,
+            keepalive=settings.events_keepalive_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export")
+def export_boardgames(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    session: Session = Depends(get_read_session),
+):
+    """Stream the whole catalog row by row; memory use does not grow with catalog size."""
+    rows = crud.iter_boardgame_rows(session, EXPORT_FIELDS)
+    if format == "csv":
+        body, media_type = _csv_chunks(rows), "text/csv"
+    else:
+        body, media_type = _ndjson_chunks(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="boardgames.{format}"'},
+    )
+
+
+# ---- Core CRUD ----
+# Registered last so the literal paths above win over /{boardgame_id}.
+# With db_io=async the same routes are served by app.routers.boardgames_async instead.
+crud_router = APIRouter()
+
+
+@crud_router.get("/", response_model=list[BoardGameRead])
+def list_boardgames(
+    request: Request,
+    page: dict = Depends(page_params),
+    filters: dict = Depends(filter_params),
+    session: Session = Depends(get_read_session),
+):
+    # the catalog version changes on every write, so a match means nothing changed
+    version, modified = crud.get_catalog_state(session)
+    headers = validator_headers(f'"catalog-{version}"', modified)
+    if is_not_modified(request, headers["ETag"], modified):
+        return not_modified(headers)
+
+    try:
+        games, next_cursor = crud.list_boardgames(session, **page, filters=filters, version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return games_response(games, headers)
+
+
+@crud_router.post("/", response_model=BoardGameRead, status_code=201)
 def create_boardgame(payload: BoardGameCreate, session: Session = Depends(get_session)):
     boardgame_obj = BoardGame(**payload.model_dump())
     try:
@@ -23,15 +322,23 @@ def create_boardgame(payload: BoardGameCreate, session: Session = Depends(get_se
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{boardgame_id}", response_model=BoardGameRead)
-def get_boardgame(boardgame_id: int, session: Session = Depends(get_session)):
+@crud_router.get("/{boardgame_id}", response_model=BoardGameRead)
+def get_boardgame(
+    boardgame_id: int,
+    request: Request,
+    session: Session = Depends(get_read_session),
+):
     game = crud.get_boardgame(session, boardgame_id)
     if not game:
         raise HTTPException(status_code=404, detail="Board game not found")
-    return game
 
+    headers = validator_headers(row_etag(game), game.updated_at)
+    if is_not_modified(request, headers["ETag"], game.updated_at):
+        return not_modified(headers)
+    return game_response(game, headers)
 
-@router.put("/{boardgame_id}", response_model=BoardGameRead)
+
+@crud_router.put("/{boardgame_id}", response_model=BoardGameRead)
 def update_boardgame(
     boardgame_id: int,
     payload: BoardGameUpdate,
@@ -51,9 +358,17 @@ def update_boardgame(
     return updated
 
 
-@router.delete("/{boardgame_id}", status_code=204)
+@crud_router.delete("/{boardgame_id}", status_code=204)
 def delete_boardgame(boardgame_id: int, session: Session = Depends(get_session)):
     ok = crud.delete_boardgame(session, boardgame_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Board game not found")
     return None
+
+
+if settings.db_io == "async":
+    from app.routers.boardgames_async import router as async_crud_router
+
+    router.include_router(async_crud_router)
+else:
+    router.include_router(crud_router)
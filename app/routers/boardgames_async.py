@@ -0,0 +1,96 @@
+"""
+Core CRUD routes on the aiosqlite engine (settings.db_io == "async").
+Handlers run on the event loop instead of occupying a threadpool worker per request.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud_async
+from app.database import get_async_read_session, get_async_session
+from app.models import BoardGame
+from app.routers.conditional import is_not_modified, not_modified, row_etag, validator_headers
+from app.routers.encoding import game_response, games_response
+from app.routers.params import filter_params, page_params
+from app.schemas import BoardGameCreate, BoardGameRead, BoardGameUpdate
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[BoardGameRead])
+async def list_boardgames(
+    request: Request,
+    page: dict = Depends(page_params),
+    filters: dict = Depends(filter_params),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    # the catalog version changes on every write, so a match means nothing changed
+    version, modified = await crud_async.get_catalog_state(session)
+    headers = validator_headers(f'"catalog-{version}"', modified)
+    if is_not_modified(request, headers["ETag"], modified):
+        return not_modified(headers)
+
+    try:
+        games, next_cursor = await crud_async.list_boardgames(session, **page, filters=filters, version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return games_response(games, headers)
+
+
+@router.post("/", response_model=BoardGameRead, status_code=201)
+async def create_boardgame(
+    payload: BoardGameCreate, session: AsyncSession = Depends(get_async_session)
+):
+    boardgame_obj = BoardGame(**payload.model_dump())
+    try:
+        return await crud_async.create_boardgame(session, boardgame_obj)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{boardgame_id}", response_model=BoardGameRead)
+async def get_boardgame(
+    boardgame_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    game = await crud_async.get_boardgame(session, boardgame_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="Board game not found")
+
+    headers = validator_headers(row_etag(game), game.updated_at)
+    if is_not_modified(request, headers["ETag"], game.updated_at):
+        return not_modified(headers)
+    return game_response(game, headers)
+
+
+@router.put("/{boardgame_id}", response_model=BoardGameRead)
+async def update_boardgame(
+    boardgame_id: int,
+    payload: BoardGameUpdate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        updated = await crud_async.update_boardgame(
+            session,
+            boardgame_id,
+            payload.model_dump(exclude_unset=True),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not updated:
+        raise HTTPException(status_code=404, detail="Board game not found")
+    return updated
+
+
+@router.delete("/{boardgame_id}", status_code=204)
+async def delete_boardgame(
+    boardgame_id: int, session: AsyncSession = Depends(get_async_session)
+):
+    ok = await crud_async.delete_boardgame(session, boardgame_id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Board game not found")
+    return None
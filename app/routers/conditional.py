@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    # no-cache: clients may store the body but must revalidate it before every use
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def row_etag(game) -> str:
+    """
+    Per-row validator. SQLite hands a deleted max id to the next insert, whose version starts
+    at 1 again, so id-version can repeat; updated_at to the microsecond tells the rows apart.
+    """
+    if game.updated_at is None:  # rows written before updated_at existed
+        return f'"{game.id}-{game.version}"'
+    return f'"{game.id}-{game.version}-{game.updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match (which wins when present) or else If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
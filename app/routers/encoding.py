@@ -0,0 +1,39 @@
+"""
+Fast JSON bodies for the read-only routes.
+
+Rows come straight from the database in BoardGameRead's field order, so validating them
+again through response_model only costs time; they are encoded with orjson instead and
+returned as a ready Response. response_model stays on the routes for the OpenAPI schema.
+"""
+from collections.abc import Iterable, Mapping
+
+import orjson
+from fastapi import Response
+
+from app.crud import READ_FIELDS
+
+
+def games_json(rows: Iterable[tuple]) -> bytes:
+    return orjson.dumps([dict(zip(READ_FIELDS, row)) for row in rows])
+
+
+def json_response(body: bytes, headers: Mapping[str, str] | None = None, status_code: int = 200) -> Response:
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def games_response(rows: Iterable[tuple], headers: Mapping[str, str] | None = None) -> Response:
+    return json_response(games_json(rows), headers)
+
+
+def game_response(game, headers: Mapping[str, str] | None = None) -> Response:
+    """One game from an object with BoardGameRead's attributes (e.g. a cached BoardGame)."""
+    return json_response(orjson.dumps({f: getattr(game, f) for f in READ_FIELDS}), headers)
+
+
+def changes_response(changes: list[tuple], cursor: int, has_more: bool) -> Response:
+    """A ChangeFeed body from crud.list_changes() output."""
+    entries = [
+        {"seq": seq, "op": op, "id": game_id, "game": dict(zip(READ_FIELDS, row)) if row else None}
+        for seq, op, game_id, row in changes
+    ]
+    return json_response(orjson.dumps({"changes": entries, "cursor": cursor, "has_more": has_more}))
@@ -0,0 +1,31 @@
+from typing import Literal
+
+from fastapi import Query
+
+from app.config import settings
+
+
+def page_params(
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    after: str | None = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    sort: Literal["id", "name", "rating", "year_published"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+) -> dict:
+    """Keyset pagination query parameters, shared by the sync and async list routes."""
+    return {"limit": limit, "after": after, "sort": sort, "order": order}
+
+
+def filter_params(
+    designer: str | None = Query(None, description="Exact designer name, case-insensitive"),
+    players: int | None = Query(None, ge=1, description="Games that support this many players"),
+    min_rating: float | None = Query(None, ge=0, le=10),
+    max_play_time: int | None = Query(None, ge=0, description="Longest play time in minutes"),
+) -> dict:
+    """Optional list filters; only the ones that were given are returned."""
+    filters = {
+        "designer": designer,
+        "players": players,
+        "min_rating": min_rating,
+        "max_play_time": max_play_time,
+    }
+    return {k: v for k, v in filters.items() if v is not None}
@@ -1,4 +1,6 @@
 from typing import Optional
+
+from pydantic import field_validator
 from sqlmodel import SQLModel
 
 
@@ -32,3 +34,66 @@ class BoardGameUpdate(SQLModel):
     play_time_min: Optional[int] = None
     complexity: Optional[float] = None
     rating: Optional[float] = None
+
+
+class BatchUpdateItem(BoardGameUpdate):
+    id: int
+
+    @field_validator("name", "min_players", "max_players")
+    @classmethod
+    def not_null(cls, value):
+        # NOT NULL columns: an explicit null is an error for this item, not for the batch
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
+
+
+class BulkItemResult(SQLModel):
+    index: int
+    status: str  # created | updated | deleted | error | skipped (an atomic batch was not applied)
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkResult(SQLModel):
+    created: int
+    updated: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class BatchResult(SQLModel):
+    updated: int
+    deleted: int
+    failed: int
+    committed: bool  # False when an atomic batch had a failure and nothing was written
+    results: list[BulkItemResult]
+
+
+class ChangeEntry(SQLModel):
+    seq: int
+    op: str  # upsert | delete (a tombstone: the game no longer exists)
+    id: int
+    game: Optional[BoardGameRead] = None  # current state, for upserts
+
+
+class ChangeFeed(SQLModel):
+    changes: list[ChangeEntry]
+    cursor: int  # pass back as since= on the next call
+    has_more: bool
+
+
+class DesignerStats(SQLModel):
+    designer: str
+    games: int
+    average_complexity: Optional[float] = None
+
+
+class CatalogStats(SQLModel):
+    total_games: int
+    average_rating: Optional[float] = None
+    average_complexity: Optional[float] = None
+    rating_histogram: dict[str, int]  # "7-8": games rated 7 <= r < 8 ("9-10" includes 10)
+    games_per_year: dict[int, int]
+    player_count_coverage: dict[int, int]  # n: games playable with exactly n players
+    top_designers: list[DesignerStats]
@@ -0,0 +1,194 @@
+"""In-memory NumPy feature matrix for similar-game and recommendation queries."""
+import threading
+import warnings
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+FEATURES = ("complexity", "rating", "play_time_min", "min_players", "max_players", "year_published")
+# relative importance of each feature in the similarity distance
+WEIGHTS = np.array([1.5, 1.0, 1.0, 0.75, 0.75, 0.5], dtype=np.float32)
+# squared distance charged for a feature missing on either side: one standard deviation
+_MISSING = WEIGHTS**2
+_PLAY_TIME = FEATURES.index("play_time_min")
+_RATING = FEATURES.index("rating")
+_MIN_PLAYERS = FEATURES.index("min_players")
+_MAX_PLAYERS = FEATURES.index("max_players")
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k smallest scores, ordered by (score, id); O(n) via argpartition."""
+    if k < len(scores):
+        candidates = np.argpartition(scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((ids[candidates], scores[candidates]))]
+
+
+class FeatureIndex:
+    """
+    Catalog features as a dense float32 matrix, one row per game.
+    Tied to a catalog version: single-row writes are applied in place when they are the next
+    version, anything else (bulk writes, other workers) leaves it stale until the next refresh().
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version: int | None = None
+            self._n = 0
+            self._pos: dict[int, int] = {}
+            self._ids = np.empty(self._capacity, dtype=np.int64)
+            self._raw = np.empty((self._capacity, len(FEATURES)), dtype=np.float32)
+            self._packed = np.empty((self._capacity, 3 * len(FEATURES)), dtype=np.float32)
+            self._mean = np.zeros(len(FEATURES), dtype=np.float32)
+            self._std = np.ones(len(FEATURES), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def is_current(self, version: int) -> bool:
+        return self.version == version
+
+    def refresh(self, version: int, load: Callable[[], Iterable[tuple]]) -> None:
+        """Rebuild from load() -> (id, *FEATURES) rows unless already at version."""
+        if self.is_current(version):
+            return
+        with self._lock:
+            if not self.is_current(version):
+                self._rebuild(list(load()), version)
+
+    def _rebuild(self, rows: list[tuple], version: int) -> None:
+        # plain tuples first: NumPy reads SQLAlchemy Rows element by element, over 20x slower
+        data = np.array([tuple(r) for r in rows], dtype=np.float64).reshape(len(rows), len(FEATURES) + 1)
+        n = len(rows)
+        self._reserve(n, keep=False)
+        self._ids[:n] = data[:, 0].astype(np.int64)
+        self._raw[:n] = data[:, 1:]
+        self._pos = {int(game_id): i for i, game_id in enumerate(self._ids[:n])}
+        self._n = n
+
+        transformed = self._transform(self._raw[:n])
+        if n:
+            # a feature nobody has filled in yet is all NaN; nanmean/nanstd warn about it
+            # through the warnings module, and the NaN is replaced below
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                mean = np.nanmean(transformed, axis=0)
+                std = np.nanstd(transformed, axis=0)
+            self._mean = np.nan_to_num(mean).astype(np.float32)
+            self._std = np.where(np.isnan(std) | (std == 0), 1, std).astype(np.float32)
+        self._packed[:n] = self._pack(self._scale(transformed))
+        self.version = version
+
+    @staticmethod
+    def _transform(raw: np.ndarray) -> np.ndarray:
+        # log scale: 30 vs 60 minutes matters more than 300 vs 330
+        out = raw.copy()
+        out[..., _PLAY_TIME] = np.log1p(np.maximum(out[..., _PLAY_TIME], 0))
+        return out
+
+    def _scale(self, transformed: np.ndarray) -> np.ndarray:
+        return (transformed - self._mean) / self._std * WEIGHTS
+
+    @staticmethod
+    def _pack(z: np.ndarray) -> np.ndarray:
+        """
+        [z², z, present] per row, with missing features zeroed. The NaN-aware squared distance
+        to a query row then expands into a single matrix-vector product (see similar()).
+        """
+        present = ~np.isnan(z)
+        z = np.where(present, z, 0)
+        return np.concatenate([z * z, z, present], axis=-1)
+
+    def _reserve(self, n: int, keep: bool = True) -> None:
+        if n <= len(self._ids):
+            return
+        capacity = max(n, 2 * len(self._ids))
+        for name in ("_ids", "_raw", "_packed"):
+            old = getattr(self, name)
+            new = np.empty((capacity, *old.shape[1:]), dtype=old.dtype)
+            if keep:
+                new[: self._n] = old[: self._n]
+            setattr(self, name, new)
+
+    def apply(self, version: int, row: tuple | None = None, removed_id: int | None = None) -> None:
+        """
+        Apply one committed write: row is (id, *FEATURES) for an insert/update, removed_id for a delete.
+        Only valid as the write that produced version; otherwise the index is marked stale.
+        """
+        with self._lock:
+            if self.version is None:
+                return
+            if self.version != version - 1:
+                self.version = None
+                return
+            if row is not None:
+                self._upsert(row)
+            if removed_id is not None:
+                self._remove(removed_id)
+            self.version = version
+
+    def _upsert(self, row: tuple) -> None:
+        game_id = int(row[0])
+        i = self._pos.get(game_id)
+        if i is None:
+            self._reserve(self._n + 1)
+            i = self._n
+            self._n += 1
+            self._pos[game_id] = i
+            self._ids[i] = game_id
+        self._raw[i] = np.array(row[1:], dtype=np.float64)
+        self._packed[i] = self._pack(self._scale(self._transform(self._raw[i])))
+
+    def _remove(self, game_id: int) -> None:
+        # swap the last row into the hole so the live rows stay contiguous
+        i = self._pos.pop(game_id, None)
+        if i is None:
+            return
+        last = self._n - 1
+        if i != last:
+            for arr in (self._ids, self._raw, self._packed):
+                arr[i] = arr[last]
+            self._pos[int(self._ids[i])] = i
+        self._n = last
+
+    def similar(self, game_id: int, k: int = 10) -> list[int] | None:
+        """Ids of the k nearest games by weighted feature distance, or None if game_id is unknown."""
+        with self._lock:
+            i = self._pos.get(game_id)
+            if i is None:
+                return None
+            n, f = self._n, len(FEATURES)
+            packed, ids = self._packed[:n], self._ids[:n]
+            z, present = packed[i, f : 2 * f], packed[i, 2 * f :]
+            # sum over features present in both rows of (zr - zq)², plus _MISSING for the rest:
+            # zr²·pq - 2·zr·zq + pr·(zq² - _MISSING·pq) + sum(_MISSING)
+            query = np.concatenate([present, -2 * z, z * z - _MISSING * present])
+            dist = packed @ query + _MISSING.sum()
+            dist[i] = np.inf
+            picked = _top_k(dist, ids, min(k, n - 1)) if n > 1 else []
+            return [int(ids[j]) for j in picked]
+
+    def recommend(
+        self, players: int | None = None, max_minutes: int | None = None, k: int = 10
+    ) -> list[int]:
+        """Best-rated games that fit the player count and time budget; unrated games come last."""
+        with self._lock:
+            n = self._n
+            raw, ids = self._raw[:n], self._ids[:n]
+            mask = np.ones(n, dtype=bool)
+            with np.errstate(invalid="ignore"):
+                if players is not None:
+                    mask &= (raw[:, _MIN_PLAYERS] <= players) & (raw[:, _MAX_PLAYERS] >= players)
+                if max_minutes is not None:
+                    mask &= raw[:, _PLAY_TIME] <= max_minutes
+
+            rows = np.flatnonzero(mask)
+            scores = -np.nan_to_num(raw[rows, _RATING], nan=-1.0)
+            picked = _top_k(scores, ids[rows], min(k, len(rows))) if len(rows) else []
+            return [int(ids[rows[j]]) for j in picked]
@@ -0,0 +1,135 @@
+"""
+Slow-query log: statements slower than a threshold are logged with redacted parameters,
+the route that ran them and SQLite's EXPLAIN QUERY PLAN, at most once per interval per
+query shape and never more than max_per_minute lines overall.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.metrics import route_template, statement_label
+
+logger = logging.getLogger("boardgamehub.slow_query")
+
+# ASGI scope of the request being served; the route template is resolved only when logging
+current_scope: ContextVar[dict | None] = ContextVar("current_scope", default=None)
+
+
+class RequestContextMiddleware:
+    """Expose the current request to code deeper in the stack (threadpool included)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+def redact(parameters) -> str:
+    """Types and sizes only: values may be user data."""
+
+    def one(value) -> str:
+        if value is None:
+            return "None"
+        if isinstance(value, (str, bytes)):
+            return f"<{type(value).__name__}:{len(value)}>"
+        return f"<{type(value).__name__}>"
+
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {one(v)}" for k, v in parameters.items()) + "}"
+    return "(" + ", ".join(one(v) for v in parameters or ()) + ")"
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        interval_seconds: float = 60.0,
+        max_per_minute: int = 30,
+        explain: bool = True,
+        clock=time.monotonic,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_seconds
+        self.max_per_minute = max_per_minute
+        self.explain = explain
+        self.clock = clock
+        self._lock = threading.Lock()  # only taken for statements already over the threshold
+        self._last_logged: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+        self._window = (0.0, 0)  # (minute start, lines logged in it)
+
+    def _admit(self, label: str) -> int | None:
+        """Number of suppressed repeats to report if this one should be logged, else None."""
+        now = self.clock()
+        with self._lock:
+            last = self._last_logged.get(label)
+            window_start, logged = self._window
+            if now - window_start >= 60:
+                window_start, logged = now, 0
+            if (last is not None and now - last < self.interval) or logged >= self.max_per_minute:
+                self._suppressed[label] = self._suppressed.get(label, 0) + 1
+                return None
+            self._last_logged[label] = now
+            self._window = (window_start, logged + 1)
+            return self._suppressed.pop(label, 0)
+
+    def _plan(self, cursor, statement: str, parameters) -> str:
+        try:
+            rows = cursor.connection.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "; ".join(str(row[-1]) for row in rows.fetchall())
+        except Exception as e:  # the plan is best effort; never fail the query because of it
+            return f"unavailable ({e})"
+
+    def instrument(self, engine, name: str) -> None:
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slowlog_started", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["slowlog_started"].pop()
+            if elapsed >= self.threshold:
+                self._report(cursor, name, statement, parameters, executemany, elapsed)
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _failed(context):
+            if context.connection is not None and context.connection.info.get("slowlog_started"):
+                context.connection.info["slowlog_started"].pop()
+
+    def _report(self, cursor, engine_name, statement, parameters, executemany, elapsed) -> None:
+        label = statement_label(statement)
+        suppressed = self._admit(label)
+        if suppressed is None:
+            return
+
+        scope = current_scope.get()
+        route = f"{scope['method']} {route_template(scope)}" if scope else "-"
+        if executemany:
+            params = f"executemany x{len(parameters)}, first {redact(parameters[0] if parameters else ())}"
+            parameters = parameters[0] if parameters else ()
+        else:
+            params = redact(parameters)
+        plan = self._plan(cursor, statement, parameters) if self.explain else "-"
+
+        logger.warning(
+            "slow query %.1f ms on %s [%s]: %s | params %s | plan: %s%s",
+            elapsed * 1000,
+            route,
+            engine_name,
+            label,
+            params,
+            plan,
+            f" | {suppressed} similar suppressed" if suppressed else "",
+        )
@@ -0,0 +1,84 @@
+"""
+Requests/second of the sync (threadpool) and async (aiosqlite) database paths.
+
+Starts one uvicorn server per mode on a fresh SQLite file, seeds it through
+POST /boardgames/bulk, then fires GET /boardgames/{id} and GET /boardgames/
+from --concurrency clients at once.
+
+    uv run python -m benchmarks.async_vs_sync --concurrency 500 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import start_server, stop_server
+
+
+async def drive(base_url: str, games: int, total: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        seed = [
+            {"name": f"Bench game {i}", "min_players": 1 + i % 4, "max_players": 4 + i % 4}
+            for i in range(games)
+        ]
+        (await client.post("/boardgames/bulk", json=seed)).raise_for_status()
+
+        remaining = total
+        errors = 0
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            rnd = random.Random()
+            while remaining > 0:
+                remaining -= 1
+                if rnd.random() < 0.8:
+                    url = f"/boardgames/{rnd.randint(1, games)}"
+                else:
+                    url = "/boardgames/?limit=20"
+                r = await client.get(url)
+                errors += r.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {"requests": total, "errors": errors, "seconds": round(elapsed, 3), "rps": round(total / elapsed, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for db_io in ("sync", "async"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                "BOARDGAME_DB_MODE": "sqlite",
+                "BOARDGAME_DB_IO": db_io,
+                "BOARDGAME_DATABASE_URL_SQLITE": f"sqlite:///{Path(tmp) / 'bench.db'}",
+                "BOARDGAME_SQLITE_PROFILE": "throughput",
+            }
+            proc = start_server(env, args.port)
+            try:
+                results[db_io] = asyncio.run(
+                    drive(f"http://127.0.0.1:{args.port}", args.games, args.requests, args.concurrency)
+                )
+            finally:
+                stop_server(proc)
+
+    results["speedup"] = round(results["async"]["rps"] / results["sync"]["rps"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
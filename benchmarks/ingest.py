@@ -0,0 +1,80 @@
+"""
+Rows per second of `cli.py import` into a fresh SQLite file.
+
+Writes --rows generated games (app.generator) to an NDJSON file, then imports it into an
+empty database once per path:
+
+  plain   the default import: chunks are inserted with the per-row triggers suspended and
+          the derived tables (search index, stats, change log) caught up once per chunk
+  upsert  --upsert, which keeps the triggers running for every row
+
+    uv run python -m benchmarks.ingest --rows 200000
+    uv run python -m benchmarks.ingest --rows 200000 --min-rows-per-s 12000
+
+With --min-rows-per-s, a plain import slower than that exits with status 1.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.generator import generate_games
+
+CLI = Path(__file__).resolve().parent.parent / "cli.py"
+
+
+def write_games(path: Path, count: int) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for batch in generate_games(count, seed=1):
+            f.writelines(json.dumps(game) + "\n" for game in batch)
+
+
+def time_import(source: Path, database: Path, chunk_size: int, upsert: bool) -> float:
+    env = {
+        **os.environ,
+        "BOARDGAME_DB_MODE": "sqlite",
+        "BOARDGAME_DATABASE_URL_SQLITE": f"sqlite:///{database}",
+        "BOARDGAME_SLOW_QUERY_MS": "0",
+    }
+    cmd = [sys.executable, str(CLI), "import", str(source), "--chunk-size", str(chunk_size)]
+    if upsert:
+        cmd.append("--upsert")
+    # the schema is created before the clock starts, so only the import itself is timed
+    subprocess.run([sys.executable, str(CLI), "reset", "--yes"], env=env, check=True, capture_output=True)
+    started = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="games to import")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--no-upsert", action="store_true", help="only time the plain import")
+    parser.add_argument("--min-rows-per-s", type=float, help="fail if the plain import is slower")
+    args = parser.parse_args()
+
+    paths = ["plain"] if args.no_upsert else ["plain", "upsert"]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "games.ndjson"
+        write_games(source, args.rows)
+        for name in paths:
+            elapsed = time_import(source, Path(tmp) / f"{name}.db", args.chunk_size, name == "upsert")
+            results[name] = {"seconds": round(elapsed, 2), "rows_per_s": round(args.rows / elapsed)}
+    print(json.dumps({"rows": args.rows, "chunk_size": args.chunk_size, "results": results}, indent=2))
+
+    if args.min_rows_per_s and results["plain"]["rows_per_s"] < args.min_rows_per_s:
+        print(
+            f"plain import: {results['plain']['rows_per_s']} rows/s < {args.min_rows_per_s:g}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
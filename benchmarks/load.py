@@ -0,0 +1,325 @@
+"""
+Latency and throughput of every /boardgames route, as JSON that can be diffed against a baseline.
+
+For each --modes x --sizes combination it starts uvicorn on a fresh database, seeds the catalog
+through POST /boardgames/bulk, then drives each route in turn from --concurrency clients and
+reports requests/second and p50/p95/p99 latency per route.
+
+    uv run python -m benchmarks.load --sizes 1000,100000 --modes memory,sqlite --out bench.json
+    uv run python -m benchmarks.load --baseline bench.json --threshold 0.2   # exit 1 on regression
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import percentile, start_server, stop_server
+
+SEED_BATCH = 10000  # matches the default bulk_max_items
+DESIGNERS = [f"Designer {i}" for i in range(200)]
+SEARCH_WORDS = ["bench", "game", "designer", "ben", "des", "game 12"]
+BATCH_ITEMS = 10  # items per /bulk and /batch request
+
+
+@dataclass
+class Catalog:
+    size: int
+    created: list[int] = field(default_factory=list)  # ids made by the POST phase, deleted later
+    counter: int = 0
+
+    def next_name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix} {self.counter}"
+
+
+def game_payload(rnd: random.Random, name: str) -> dict:
+    lo = rnd.randint(1, 4)
+    return {
+        "name": name,
+        "designer": rnd.choice(DESIGNERS),
+        "year_published": rnd.randint(1980, 2025),
+        "min_players": lo,
+        "max_players": lo + rnd.randint(0, 4),
+        "play_time_min": rnd.choice([15, 30, 45, 60, 90, 120, 180, 240]),
+        "complexity": round(rnd.uniform(1, 5), 2),
+        "rating": round(rnd.uniform(4, 9.5), 2),
+    }
+
+
+# Each route builds (method, url, json body) for one request. Order matters: reads run on the
+# seeded catalog, then writes, and DELETE removes only what POST created.
+def _list(rnd, cat):
+    sort = rnd.choice(["id", "name", "rating", "year_published"])
+    return "GET", f"/boardgames/?limit=20&sort={sort}&order={rnd.choice(['asc', 'desc'])}", None
+
+
+def _list_filtered(rnd, cat):
+    return "GET", f"/boardgames/?limit=20&players={rnd.randint(1, 6)}&min_rating={rnd.randint(5, 8)}", None
+
+
+def _get(rnd, cat):
+    return "GET", f"/boardgames/{rnd.randint(1, cat.size)}", None
+
+
+def _search(rnd, cat):
+    return "GET", f"/boardgames/search?q={rnd.choice(SEARCH_WORDS)}&limit=20", None
+
+
+def _stats(rnd, cat):
+    return "GET", "/boardgames/stats", None
+
+
+def _similar(rnd, cat):
+    return "GET", f"/boardgames/{rnd.randint(1, cat.size)}/similar?k=10", None
+
+
+def _recommend(rnd, cat):
+    return "GET", f"/boardgames/recommend?players={rnd.randint(1, 6)}&max_minutes={rnd.choice([30, 60, 120])}", None
+
+
+def _export(rnd, cat):
+    return "GET", "/boardgames/export?format=ndjson", None
+
+
+def _changes(rnd, cat):
+    # seeding logged at least cat.size changes, so any cursor up to it is still valid
+    return "GET", f"/boardgames/changes?since={rnd.randint(0, cat.size)}&limit=100", None
+
+
+def _events(rnd, cat):
+    # measured to the first event ("ready"), then the stream is closed; see run_route
+    return "GET", "/boardgames/events", None
+
+
+def _create(rnd, cat):
+    return "POST", "/boardgames/", game_payload(rnd, cat.next_name("Bench new"))
+
+
+def _update(rnd, cat):
+    return "PUT", f"/boardgames/{rnd.randint(1, cat.size)}", {"rating": round(rnd.uniform(4, 9.5), 2)}
+
+
+def _bulk(rnd, cat):
+    return "POST", "/boardgames/bulk", [game_payload(rnd, cat.next_name("Bench bulk")) for _ in range(BATCH_ITEMS)]
+
+
+def _batch_update(rnd, cat):
+    ids = rnd.sample(range(1, cat.size + 1), min(BATCH_ITEMS, cat.size))
+    return "PATCH", "/boardgames/batch", [{"id": i, "rating": round(rnd.uniform(4, 9.5), 2)} for i in ids]
+
+
+def _batch_delete(rnd, cat):
+    return "DELETE", "/boardgames/batch", {"ids": [cat.created.pop() for _ in range(BATCH_ITEMS)]}
+
+
+def _delete(rnd, cat):
+    return "DELETE", f"/boardgames/{cat.created.pop()}", None
+
+
+# name -> (request builder, share of --requests, max concurrency or None)
+ROUTES = {
+    "GET /boardgames/": (_list, 1.0, None),
+    "GET /boardgames/?filters": (_list_filtered, 1.0, None),
+    "GET /boardgames/{id}": (_get, 1.0, None),
+    "GET /boardgames/search": (_search, 1.0, None),
+    "GET /boardgames/stats": (_stats, 1.0, None),
+    "GET /boardgames/{id}/similar": (_similar, 0.5, None),
+    "GET /boardgames/recommend": (_recommend, 0.5, None),
+    "GET /boardgames/export": (_export, 0.002, 2),
+    "GET /boardgames/changes": (_changes, 0.5, None),
+    "GET /boardgames/events": (_events, 0.1, None),
+    "POST /boardgames/": (_create, 0.5, None),
+    "PUT /boardgames/{id}": (_update, 0.5, None),
+    "POST /boardgames/bulk": (_bulk, 0.1, None),
+    "PATCH /boardgames/batch": (_batch_update, 0.1, None),
+    "DELETE /boardgames/batch": (_batch_delete, 0.02, None),
+    "DELETE /boardgames/{id}": (_delete, 0.5, None),
+}
+# routes that use up the ids POST /boardgames/ created, and how many each request takes
+CONSUMERS = {_batch_delete: BATCH_ITEMS, _delete: 1}
+
+
+async def seed(client: httpx.AsyncClient, size: int, seed_value: int) -> None:
+    rnd = random.Random(seed_value)
+    for start in range(0, size, SEED_BATCH):
+        batch = [game_payload(rnd, f"Bench game {i}") for i in range(start, min(size, start + SEED_BATCH))]
+        r = await client.post("/boardgames/bulk", json=batch, timeout=600.0)
+        r.raise_for_status()
+
+
+async def first_event(client: httpx.AsyncClient, url: str) -> bool:
+    """Open an SSE stream and wait for its first event, which is as far as a client has to wait."""
+    async with client.stream("GET", url) as r:
+        if r.status_code >= 400:
+            return False
+        async for line in r.aiter_lines():
+            if line.startswith("event:"):
+                return True
+    return False
+
+
+async def run_route(
+    client: httpx.AsyncClient, build, cat: Catalog, total: int, concurrency: int, seed_value: int
+) -> dict:
+    latencies: list[float] = []
+    errors = shed = 0
+    remaining = total
+    creates = build is _create
+    streams = build is _events
+
+    async def worker(n: int) -> None:
+        nonlocal remaining, errors, shed
+        rnd = random.Random(seed_value * 1000 + n)
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = build(rnd, cat)
+            started = time.perf_counter()
+            try:
+                if streams:
+                    ok = await first_event(client, url)
+                else:
+                    r = await client.request(method, url, json=body)
+                    ok = r.status_code < 400
+                    if r.status_code == 503:  # admission control shed it: load, not a failure
+                        shed += 1
+                        ok = True
+            except httpx.HTTPError:
+                r, ok = None, False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+            if creates and ok and r.status_code < 400:
+                cat.created.append(r.json()["id"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "shed": shed,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def drive(base_url: str, size: int, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        await seed(client, size, args.seed)
+        cat = Catalog(size)
+        results = {}
+        for name in args.routes:
+            build, share, max_concurrency = ROUTES[name]
+            total = max(2, int(args.requests * share))
+            if build in CONSUMERS:
+                total = min(total, len(cat.created) // CONSUMERS[build])
+                if not total:
+                    continue
+            concurrency = min(args.concurrency, max_concurrency or args.concurrency, total)
+            results[name] = await run_route(client, build, cat, total, concurrency, args.seed)
+    return results
+
+
+def server_env(mode: str, tmp: Path, cache: bool, concurrency: int) -> dict[str, str]:
+    env = {
+        "BOARDGAME_DB_MODE": mode,
+        "BOARDGAME_CACHE_ENABLED": str(cache).lower(),
+        # every client may be waiting at once; the limits stay at the pool sizes, so the
+        # queues only change whether a burst waits or is shed
+        "BOARDGAME_ADMISSION_READ_QUEUE": str(concurrency),
+        "BOARDGAME_ADMISSION_WRITE_QUEUE": str(concurrency),
+    }
+    if mode == "sqlite":
+        env["BOARDGAME_DATABASE_URL_SQLITE"] = f"sqlite:///{tmp / 'bench.db'}"
+        env["BOARDGAME_SQLITE_PROFILE"] = "throughput"
+    return env
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions of current vs baseline: rps down or p95 up by more than threshold, or new errors/sheds."""
+    regressions = []
+    for scenario, routes in current.get("results", {}).items():
+        for route, now in routes.items():
+            before = baseline.get("results", {}).get(scenario, {}).get(route)
+            if not before:
+                continue
+            label = f"{scenario} {route}"
+            if now["rps"] < before["rps"] * (1 - threshold):
+                regressions.append(f"{label}: rps {before['rps']} -> {now['rps']}")
+            if now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(f"{label}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+            if now["errors"] and not before["errors"]:
+                regressions.append(f"{label}: {now['errors']} errors (baseline had none)")
+            if now.get("shed") and not before.get("shed"):
+                regressions.append(f"{label}: {now['shed']} shed with 503 (baseline had none)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000", help="comma-separated catalog sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--modes", default="memory,sqlite", help="comma-separated db modes")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="comma-separated subset of routes")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read route")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true", help="run the API with the read cache off")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--out", type=Path, help="also write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+    args.routes = [r for r in args.routes.split(",") if r]
+    unknown = set(args.routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": not args.no_cache,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for mode in args.modes.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            with tempfile.TemporaryDirectory() as tmp:
+                proc = start_server(server_env(mode, Path(tmp), not args.no_cache, args.concurrency), args.port)
+                try:
+                    results = asyncio.run(drive(f"http://127.0.0.1:{args.port}", size, args))
+                finally:
+                    stop_server(proc)
+            report["results"][f"{mode}/{size}"] = results
+            print(f"{mode}/{size} done", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text + "\n")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+CPU time per row of list responses: the response_model path vs the row + orjson fast path.
+
+Seeds an in-memory catalog with app.generator, then measures process CPU time (all threads)
+for the same pages encoded two ways, plus GET /boardgames/ end to end in-process:
+
+  model  ORM objects -> list[BoardGameRead] validation -> Pydantic JSON (the old route path)
+  fast   column rows -> dicts -> orjson (what the read-only routes do now)
+  route  GET /boardgames/?limit=... through the ASGI app, client overhead included
+
+    uv run python -m benchmarks.serialization --rows 100,1000 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# settings are read at import time
+os.environ.setdefault("BOARDGAME_DB_MODE", "memory")
+os.environ.setdefault("BOARDGAME_CACHE_ENABLED", "false")
+os.environ.setdefault("BOARDGAME_METRICS_ENABLED", "false")
+os.environ.setdefault("BOARDGAME_SLOW_QUERY_MS", "0")
+
+import httpx  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+from app import crud, database  # noqa: E402
+from app.generator import generate_games  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import BoardGame  # noqa: E402
+from app.routers.encoding import games_json  # noqa: E402
+from app.schemas import BoardGameRead  # noqa: E402
+
+_READ_LIST = TypeAdapter(list[BoardGameRead])
+
+
+def model_path(session: Session, limit: int) -> bytes:
+    games = session.exec(select(BoardGame).order_by(BoardGame.id).limit(limit)).all()
+    return _READ_LIST.dump_json(_READ_LIST.validate_python(games, from_attributes=True))
+
+
+def fast_path(session: Session, limit: int) -> bytes:
+    return games_json(crud.list_boardgames(session, limit=limit)[0])
+
+
+def cpu_us_per_row(run, rows: int, repeat: int) -> float:
+    run()  # warm up statement caches
+    started = time.process_time()
+    for _ in range(repeat):
+        run()
+    return round((time.process_time() - started) / (repeat * rows) * 1e6, 3)
+
+
+async def route_us_per_row(rows: int, repeat: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        url = f"/boardgames/?limit={rows}"
+        (await client.get(url)).raise_for_status()
+        started = time.process_time()
+        for _ in range(repeat):
+            await client.get(url)
+        return round((time.process_time() - started) / (repeat * rows) * 1e6, 3)
+
+
+def seed(count: int) -> None:
+    database.create_db_and_tables()
+    with Session(database.engine) as session:
+        for batch in generate_games(count, seed=1):
+            crud.bulk_create_boardgames(session, batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", default="100,1000", help="comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=200, help="requests per page size and path")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.rows.split(",")]
+
+    seed(max(sizes))
+    results = {}
+    for rows in sizes:
+        # memory mode has a single connection, so the session is closed before the route runs
+        with Session(database.engine) as session:
+            assert json.loads(model_path(session, rows)) == json.loads(fast_path(session, rows))
+            model = cpu_us_per_row(lambda: model_path(session, rows), rows, args.repeat)
+            fast = cpu_us_per_row(lambda: fast_path(session, rows), rows, args.repeat)
+        results[rows] = {
+            "model_us_per_row": model,
+            "fast_us_per_row": fast,
+            "speedup": round(model / fast, 2),
+            "route_us_per_row": asyncio.run(route_us_per_row(rows, args.repeat)),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,24 @@
+import csv
+import json
+import time
+from collections.abc import Iterator
+from contextlib import nullcontext
+from pathlib import Path
+
 import typer
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import SQLModel, Session, select
 
-from app.database import engine, create_db_and_tables
+from app import crud
+from app.config import settings
+from app.database import bulk_load_connection, engine, create_db_and_tables, triggers_suspended
+from app.generator import generate_games
 from app.models import BoardGame
+from app.schemas import BoardGameCreate
 
-app = typer.Typer(help="BoardGameHub CLI (seed/reset/export)")
+app = typer.Typer(help="BoardGameHub CLI (seed/reset/import/generate/compact-changes/export)")
 
 SAMPLE_GAMES = [
     ("Catan", "Klaus Teuber", 1995, 2, 4, 60, 2.0, 7.0),
@@ -62,6 +76,138 @@ def seed(sample: int = typer.Option(5, "--sample", "-s", min=1, max=50)) -> None
     typer.echo(f"✅ Seeded {min(sample, len(SAMPLE_GAMES))} games.")
 
 
+def _read_records(path: Path, fmt: str) -> Iterator[tuple[int, dict]]:
+    """Yield (line number, raw record) pairs without loading the whole file."""
+    with path.open(newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            start = reader.line_num + 1
+            for record in reader:
+                # empty CSV cells mean "no value", not an empty string
+                yield start, {k: (v if v != "" else None) for k, v in record.items()}
+                start = reader.line_num + 1
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_no, None  # rejected by validation like any other bad record
+
+
+@app.command("import")
+def import_games(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or NDJSON file"),
+    fmt: str = typer.Option(
+        None, "--format", "-f", help="csv or ndjson (default: from the file extension)"
+    ),
+    chunk_size: int = typer.Option(5000, "--chunk-size", "-c", min=1),
+    start_line: int = typer.Option(
+        1, "--start-line", help="Resume: skip records that start before this line"
+    ),
+    upsert: bool = typer.Option(False, "--upsert", help="Update games whose name already exists"),
+) -> None:
+    """Bulk-import games from CSV/NDJSON in committed chunks."""
+    fmt = (fmt or ("csv" if path.suffix.lower() == ".csv" else "ndjson")).lower()
+    if fmt not in ("csv", "ndjson"):
+        typer.echo(f"Unsupported format: {fmt}")
+        raise typer.Exit(code=2)
+
+    create_db_and_tables()
+
+    counts = {"created": 0, "updated": 0, "error": 0}
+    chunk: list[dict] = []
+    chunk_first_line = start_line
+    started = time.perf_counter()
+
+    def flush(conn, next_line: int) -> None:
+        nonlocal chunk_first_line
+        if chunk:
+            # plain inserts skip the per-row triggers and catch the derived tables up once per
+            # chunk; upserts update rows, which the catch-up would not see
+            with (nullcontext() if upsert else triggers_suspended(conn)), Session(bind=conn) as session:
+                for status, _, _ in crud.bulk_create_boardgames(
+                    session, chunk, upsert=upsert, with_ids=False
+                ):
+                    counts[status] += 1
+            chunk.clear()
+        done = counts["created"] + counts["updated"] + counts["error"]
+        typer.echo(f"… {done} rows processed, committed up to line {next_line - 1}")
+        chunk_first_line = next_line
+
+    with bulk_load_connection() as conn:
+        line_no = start_line
+        try:
+            for line_no, record in _read_records(path, fmt):
+                if line_no < start_line:
+                    continue
+                try:
+                    chunk.append(BoardGameCreate.model_validate(record).model_dump())
+                except ValidationError as e:
+                    counts["error"] += 1
+                    typer.echo(f"line {line_no}: {e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush(conn, line_no + 1)
+            if chunk:
+                flush(conn, line_no + 1)
+        except Exception as e:
+            typer.echo(f"❌ Import failed near line {line_no}: {e}")
+            typer.echo(f"Resume with: --start-line {chunk_first_line}")
+            raise typer.Exit(code=1)
+
+    elapsed = time.perf_counter() - started
+    total = counts["created"] + counts["updated"] + counts["error"]
+    typer.echo(
+        f"✅ Imported {total} rows in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/s): "
+        f"{counts['created']} created, {counts['updated']} updated, {counts['error']} failed."
+    )
+
+
+@app.command()
+def generate(
+    count: int = typer.Option(..., "--count", "-n", min=1, help="Number of games to generate"),
+    seed: int = typer.Option(0, "--seed", "-s", min=0, help="Same seed, same catalog"),
+) -> None:
+    """Insert synthetic games with unique names and realistic value distributions."""
+    create_db_and_tables()
+
+    # names that already exist (e.g. from an earlier run with the same seed) are skipped
+    stmt = sqlite_insert(BoardGame.__table__).on_conflict_do_nothing(
+        index_elements=[func.lower(BoardGame.name)]
+    )
+    started = time.perf_counter()
+    done = 0
+    with bulk_load_connection() as conn, triggers_suspended(conn):
+        changes_before = conn.exec_driver_sql("SELECT total_changes()").scalar()
+        for batch in generate_games(count, seed):
+            conn.execute(stmt, batch)
+            done += len(batch)
+            typer.echo(f"… {done} rows generated")
+        inserted = conn.exec_driver_sql("SELECT total_changes()").scalar() - changes_before
+        typer.echo("… updating search index and stats")
+
+    elapsed = time.perf_counter() - started
+    typer.echo(
+        f"✅ Generated {count} games in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} rows/s): "
+        f"{inserted} inserted, {count - inserted} skipped (name exists)."
+    )
+
+
+@app.command("compact-changes")
+def compact_changes(
+    tombstone_days: float = typer.Option(
+        settings.changes_tombstone_days, "--tombstone-days", min=0, help="Keep tombstones this recent"
+    ),
+) -> None:
+    """Shrink the change log: drop superseded entries and old tombstones."""
+    create_db_and_tables()
+    with Session(engine) as session:
+        removed, floor = crud.compact_changes(session, tombstone_days)
+    typer.echo(f"✅ Removed {removed} change-log entries; cursors below {floor} now get 410.")
+
+
 @app.command()
 def export() -> None:
     """Print all games to the console."""
@@ -1,69 +1,465 @@
+import asyncio
 import os
+import random
+import threading
+import time
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
 import httpx
 
 BASE_URL = os.getenv("BOARDGAME_API_BASE_URL", "http://127.0.0.1:8000")
-_client = httpx.Client(base_url=BASE_URL, timeout=10.0)
 
+# Only these are replayed after a failure; a retried POST could create the game twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class ApiError(RuntimeError):
+    """An API call failed; the message is the server's `detail` when there is one."""
 
-def _raise_clean_error(e: httpx.HTTPStatusError) -> None:
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ValidatorCache:
     """
-    Convert FastAPI error responses into a clean Python exception message.
-    Expected FastAPI format: {"detail": "..."}.
+    URL -> (ETag, JSON body, X-Next-Cursor) of the last 200 response, replayed on 304.
+    Bounded LRU so a long-running service does not grow it forever.
     """
-    try:
-        data = e.response.json()
-        detail = data.get("detail")
-    except Exception:
-        detail = None
 
-    if detail:
-        raise RuntimeError(detail)
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[str, Any, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
 
-    raise RuntimeError(f"Request failed with status {e.response.status_code}")
+    def get(self, url: str) -> tuple[str, Any, str | None] | None:
+        with self._lock:
+            entry = self._data.get(url)
+            if entry is not None:
+                self._data.move_to_end(url)
+            return entry
 
+    def set(self, url: str, etag: str, data: Any, next_cursor: str | None) -> None:
+        with self._lock:
+            self._data[url] = (etag, data, next_cursor)
+            self._data.move_to_end(url)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
-def _raise_request_error(e: httpx.RequestError) -> None:
-    raise RuntimeError(f"Cannot reach API at {BASE_URL}. Error: {e}")
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
 
+    def __len__(self) -> int:
+        return len(self._data)
 
-def list_boardgames() -> list[dict]:
-    try:
-        r = _client.get("/boardgames/")
+
+def parse_sse(lines: Iterable[str]) -> Iterator[tuple[str, str | None, str]]:
+    """(event, id, data) for each Server-Sent Event in a stream of lines; comments are skipped."""
+    event, event_id, data = "message", None, []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, event_id, "\n".join(data)
+            event, event_id, data = "message", None, []
+            continue
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "event":
+            event = value
+        elif field == "id":
+            event_id = value
+        elif field == "data":
+            data.append(value)
+
+
+class _ClientBase:
+    """Configuration, retry policy and response handling shared by both clients."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        *,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        cache: ValidatorCache | None = None,
+        transport=None,
+    ):
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache if cache is not None else ValidatorCache()
+        # http2=True needs the optional h2 package: pip install "httpx[http2]"
+        self._client_kwargs = {
+            "base_url": base_url,
+            "timeout": timeout,
+            "http2": http2,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        }
+        if transport is not None:
+            self._client_kwargs["transport"] = transport
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        """Full-jitter exponential backoff; a Retry-After header wins when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _should_retry(self, method: str, attempt: int, response: httpx.Response | None) -> bool:
+        if method not in IDEMPOTENT_METHODS or attempt >= self.retries:
+            return False
+        return response is None or response.status_code in RETRY_STATUSES
+
+    def _error(self, exc: Exception) -> ApiError:
+        if isinstance(exc, httpx.HTTPStatusError):
+            try:
+                detail = exc.response.json().get("detail")
+            except Exception:
+                detail = None
+            status = exc.response.status_code
+            return ApiError(detail or f"Request failed with status {status}", status)
+        return ApiError(f"Cannot reach API at {self.base_url}. Error: {exc}")
+
+    def _conditional_request(self, client, path: str, params: dict | None):
+        """Build a GET carrying If-None-Match from the last response for the same URL."""
+        request = client.build_request("GET", path, params=params)
+        cached = self.cache.get(str(request.url))
+        if cached:
+            request.headers["If-None-Match"] = cached[0]
+        return request, cached
+
+    def _conditional_result(self, request, cached, r: httpx.Response) -> tuple[Any, str | None]:
+        if r.status_code == 304 and cached:
+            return cached[1], cached[2]
         r.raise_for_status()
+
+        data, next_cursor = r.json(), r.headers.get("X-Next-Cursor")
+        etag = r.headers.get("ETag")
+        if etag:
+            self.cache.set(str(request.url), etag, data, next_cursor)
+        return data, next_cursor
+
+    @staticmethod
+    def _page_params(limit, after, sort, order, filters) -> dict:
+        params = {"limit": limit, "sort": sort, "order": order}
+        params.update({k: v for k, v in filters.items() if v not in (None, "")})
+        if after:
+            params["after"] = after
+        return params
+
+
+class BoardGameClient(_ClientBase):
+    """
+    Pooled, retrying client for the BoardGameHub API.
+    Idempotent calls are retried with jittered backoff on connection errors and 429/5xx;
+    GETs revalidate against a local ETag cache so unchanged resources cost a bodyless 304.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self._http = httpx.Client(**self._client_kwargs)
+
+    def close(self) -> None:
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._http.send(request)
+            except httpx.TransportError:
+                if not self._should_retry(request.method, attempt, None):
+                    raise
+                response = None
+            if response is not None and not self._should_retry(request.method, attempt, response):
+                return response
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        try:
+            r = self._send(self._http.build_request(method, path, **kwargs))
+            r.raise_for_status()
+            return r
+        except httpx.HTTPError as e:
+            raise self._error(e) from e
+
+    def get_json_conditional(self, path: str, params: dict | None = None) -> tuple[Any, str | None]:
+        """Returns (JSON body, X-Next-Cursor header), served from the cache on 304."""
+        request, cached = self._conditional_request(self._http, path, params)
+        try:
+            return self._conditional_result(request, cached, self._send(request))
+        except httpx.HTTPError as e:
+            raise self._error(e) from e
+
+    def list_page(
+        self, limit: int = 15, after: str | None = None, sort: str = "id", order: str = "asc", **filters
+    ) -> tuple[list[dict], str | None]:
+        params = self._page_params(limit, after, sort, order, filters)
+        return self.get_json_conditional("/boardgames/", params=params)
+
+    def list_all(self, page_size: int = 1000, **filters) -> list[dict]:
+        """Fetch the whole (filtered) catalog by following X-Next-Cursor page by page."""
+        games: list[dict] = []
+        after = None
+        while True:
+            page, after = self.list_page(page_size, after, **filters)
+            games.extend(page)
+            if not after:
+                return games
+
+    def get(self, boardgame_id: int) -> dict:
+        return self.get_json_conditional(f"/boardgames/{boardgame_id}")[0]
+
+    def search(self, q: str, limit: int = 10) -> list[dict]:
+        if not (q or "").strip():
+            return []
+        return self._request("GET", "/boardgames/search", params={"q": q, "limit": limit}).json()
+
+    def stats(self) -> dict:
+        return self.get_json_conditional("/boardgames/stats")[0]
+
+    def create(self, payload: dict) -> dict:
+        return self._request("POST", "/boardgames/", json=payload).json()
+
+    def update(self, boardgame_id: int, payload: dict) -> dict:
+        return self._request("PUT", f"/boardgames/{boardgame_id}", json=payload).json()
+
+    def delete(self, boardgame_id: int) -> None:
+        self._request("DELETE", f"/boardgames/{boardgame_id}")
+
+    def events(self, last_event_id: int | None = None, read_timeout: float = 60.0) -> Iterator[tuple[str, int, dict]]:
+        """
+        Follow GET /boardgames/events, yielding (event, cursor, data) until the connection ends.
+        read_timeout must exceed the server's keepalive interval.
+        """
+        headers = {"Accept": "text/event-stream"}
+        if last_event_id is not None:
+            headers["Last-Event-ID"] = str(last_event_id)
+        timeout = httpx.Timeout(self._http.timeout.connect, read=read_timeout)
+        try:
+            with self._http.stream("GET", "/boardgames/events", headers=headers, timeout=timeout) as r:
+                r.raise_for_status()
+                for event, event_id, data in parse_sse(r.iter_lines()):
+                    yield event, int(event_id or 0), json.loads(data)
+        except httpx.HTTPError as e:
+            raise self._error(e) from e
+
+
+class ChangeFollower(threading.Thread):
+    """
+    Background subscriber to /boardgames/events that reconnects with Last-Event-ID, so no
+    change is missed across drops. on_changes gets [{"id", "op"}, ...] per notification;
+    on_resync is called when the server could not say what changed (a dropped backlog,
+    a compacted log), and the caller should drop everything it holds.
+    """
+
+    def __init__(
+        self,
+        client: BoardGameClient,
+        on_changes: Callable[[list[dict]], None],
+        on_resync: Callable[[], None],
+    ):
+        super().__init__(name="boardgame-change-follower", daemon=True)
+        self.client = client
+        self.on_changes = on_changes
+        self.on_resync = on_resync
+        self.cursor: int | None = None
+        self.connected = threading.Event()
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        attempt = 0
+        while not self._stopping.is_set():
+            try:
+                for event, cursor, data in self.client.events(self.cursor):
+                    self.connected.set()
+                    attempt = 0
+                    if event == "changes":
+                        self.on_changes(data["changes"])
+                    elif event == "resync":
+                        self.on_resync()
+                    self.cursor = cursor
+                    if self._stopping.is_set():
+                        return
+            except ApiError:
+                pass
+            self.connected.clear()
+            self._stopping.wait(self.client._backoff(attempt, None))
+            attempt += 1
+
+
+class AsyncBoardGameClient(_ClientBase):
+    """asyncio counterpart of BoardGameClient, for fanning many calls out concurrently."""
+
+    def __init__(self, base_url: str = BASE_URL, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self._http = httpx.AsyncClient(**self._client_kwargs)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.send(request)
+            except httpx.TransportError:
+                if not self._should_retry(request.method, attempt, None):
+                    raise
+                response = None
+            if response is not None and not self._should_retry(request.method, attempt, response):
+                return response
+            await asyncio.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        try:
+            r = await self._send(self._http.build_request(method, path, **kwargs))
+            r.raise_for_status()
+            return r
+        except httpx.HTTPError as e:
+            raise self._error(e) from e
+
+    async def get_json_conditional(
+        self, path: str, params: dict | None = None
+    ) -> tuple[Any, str | None]:
+        request, cached = self._conditional_request(self._http, path, params)
+        try:
+            return self._conditional_result(request, cached, await self._send(request))
+        except httpx.HTTPError as e:
+            raise self._error(e) from e
+
+    async def list_page(
+        self, limit: int = 15, after: str | None = None, sort: str = "id", order: str = "asc", **filters
+    ) -> tuple[list[dict], str | None]:
+        params = self._page_params(limit, after, sort, order, filters)
+        return await self.get_json_conditional("/boardgames/", params=params)
+
+    async def get(self, boardgame_id: int) -> dict:
+        return (await self.get_json_conditional(f"/boardgames/{boardgame_id}"))[0]
+
+    async def get_many(self, ids: list[int], concurrency: int = 10) -> list[dict | None]:
+        """Fetch several games concurrently; missing ones come back as None."""
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(boardgame_id: int) -> dict | None:
+            async with gate:
+                try:
+                    return await self.get(boardgame_id)
+                except ApiError as e:
+                    if e.status_code == 404:
+                        return None
+                    raise
+
+        return list(await asyncio.gather(*(one(i) for i in ids)))
+
+    async def search(self, q: str, limit: int = 10) -> list[dict]:
+        if not (q or "").strip():
+            return []
+        r = await self._request("GET", "/boardgames/search", params={"q": q, "limit": limit})
         return r.json()
-    except httpx.HTTPStatusError as e:
-        _raise_clean_error(e)
-    except httpx.RequestError as e:
-        _raise_request_error(e)
+
+    async def stats(self) -> dict:
+        return (await self.get_json_conditional("/boardgames/stats"))[0]
+
+    async def create(self, payload: dict) -> dict:
+        return (await self._request("POST", "/boardgames/", json=payload)).json()
+
+    async def update(self, boardgame_id: int, payload: dict) -> dict:
+        return (await self._request("PUT", f"/boardgames/{boardgame_id}", json=payload)).json()
+
+    async def delete(self, boardgame_id: int) -> None:
+        await self._request("DELETE", f"/boardgames/{boardgame_id}")
+
+
+# ---- Module-level helpers used by the dashboard ----
+_client = BoardGameClient(
+    BASE_URL,
+    http2=os.getenv("BOARDGAME_API_HTTP2", "").lower() in ("1", "true"),
+    max_connections=int(os.getenv("BOARDGAME_API_MAX_CONNECTIONS", "20")),
+    retries=int(os.getenv("BOARDGAME_API_RETRIES", "3")),
+)
+
+
+def list_boardgames() -> list[dict]:
+    """Fetch the whole catalog by following the X-Next-Cursor header page by page."""
+    return _client.list_all()
+
+
+def list_boardgames_page(
+    limit: int = 15,
+    after: str | None = None,
+    sort: str = "id",
+    order: str = "asc",
+    **filters,
+) -> tuple[list[dict], str | None]:
+    """
+    Fetch a single page, optionally filtered (designer, players, min_rating, max_play_time).
+    Returns (games, cursor for the next page or None).
+    """
+    return _client.list_page(limit, after, sort, order, **filters)
+
+
+def search_boardgames(q: str, limit: int = 10) -> list[dict]:
+    """Typeahead lookup by name/designer prefix, best matches first."""
+    return _client.search(q, limit)
+
+
+def get_boardgame(boardgame_id: int) -> dict:
+    return _client.get(boardgame_id)
+
+
+def get_catalog_stats() -> dict:
+    return _client.stats()
 
 
 def create_boardgame(payload: dict) -> dict:
-    try:
-        r = _client.post("/boardgames/", json=payload)
-        r.raise_for_status()
-        return r.json()
-    except httpx.HTTPStatusError as e:
-        _raise_clean_error(e)
-    except httpx.RequestError as e:
-        _raise_request_error(e)
+    return _client.create(payload)
 
 
 def update_boardgame(boardgame_id: int, payload: dict) -> dict:
-    try:
-        r = _client.put(f"/boardgames/{boardgame_id}", json=payload)
-        r.raise_for_status()
-        return r.json()
-    except httpx.HTTPStatusError as e:
-        _raise_clean_error(e)
-    except httpx.RequestError as e:
-        _raise_request_error(e)
+    return _client.update(boardgame_id, payload)
 
 
 def delete_boardgame(boardgame_id: int) -> None:
-    try:
-        r = _client.delete(f"/boardgames/{boardgame_id}")
-        r.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        _raise_clean_error(e)
-    except httpx.RequestError as e:
-        _raise_request_error(e)
+    _client.delete(boardgame_id)
+
+
+def follow_changes(on_changes: Callable[[list[dict]], None], on_resync: Callable[[], None]) -> ChangeFollower:
+    """Start a ChangeFollower on the shared client; see ChangeFollower."""
+    follower = ChangeFollower(_client, on_changes, on_resync)
+    follower.start()
+    return follower
@@ -1,4 +1,5 @@
 import math
+import threading
 
 import pandas as pd
 import streamlit as st
@@ -6,7 +7,11 @@ import streamlit as st
 from frontend.client import (
     create_boardgame,
     delete_boardgame,
-    list_boardgames,
+    follow_changes,
+    get_boardgame,
+    get_catalog_stats,
+    list_boardgames_page,
+    search_boardgames,
     update_boardgame,
 )
 
@@ -17,13 +22,122 @@ st.caption("Streamlit UI that talks to FastAPI via httpx")
 PAGE_SIZE = 15
 
 
-@st.cache_data(ttl=15)
-def cached_games() -> list[dict]:
-    return list_boardgames()
+# Games changed this many at a time (e.g. a bulk import) are handled like a resync
+LIVE_PATCH_MAX = 50
 
 
-def normalize_name(s: str) -> str:
-    return (s or "").strip().lower()
+class LiveCatalog:
+    """
+    Catalog state shared by every session of this Streamlit server, kept current by
+    /boardgames/events instead of TTL polling:
+    - an update to a game already on a fetched page patches just that row (one GET);
+    - inserts, deletes and resyncs bump `generation`, which is part of every cache key
+      below, so page listings, totals and searches are refetched once, on the next run.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.rows: dict[int, dict] = {}  # fresh copies of games updated after their page was fetched
+        self.seen: set[int] = set()  # ids on pages fetched at the current generation
+        self.version = 0  # bumped on any change, so open sessions know to rerun
+        self._lock = threading.Lock()
+        self.follower = follow_changes(self.on_changes, self.on_resync)
+
+    def on_changes(self, changes: list[dict]) -> None:
+        ids = [c["id"] for c in changes]
+        if len(changes) > LIVE_PATCH_MAX or any(c["op"] == "delete" for c in changes):
+            return self.on_resync()
+        if any(i not in self.seen for i in ids):
+            return self.on_resync()  # a new game, or one on a page nobody has open
+        fresh = {}
+        for boardgame_id in ids:
+            try:
+                fresh[boardgame_id] = get_boardgame(boardgame_id)
+            except RuntimeError:
+                return self.on_resync()
+        with self._lock:
+            self.rows.update(fresh)
+            self.version += 1
+
+    def on_resync(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.rows.clear()
+            self.seen.clear()
+            self.version += 1
+
+    def page(self, games: list[dict]) -> list[dict]:
+        with self._lock:
+            self.seen.update(g["id"] for g in games)
+            return [self.rows.get(g["id"], g) for g in games]
+
+
+@st.cache_resource
+def live_catalog() -> LiveCatalog:
+    return LiveCatalog()
+
+
+live = live_catalog()
+
+
+# Only the visible page is fetched; the API filters, sorts and pages on the server.
+# No TTL: `generation` changes when the catalog does.
+@st.cache_data(max_entries=500)
+def cached_page(
+    after: str | None, sort: str, order: str, filters: tuple, generation: int
+) -> tuple[list[dict], str | None]:
+    return list_boardgames_page(PAGE_SIZE, after, sort, order, **dict(filters))
+
+
+@st.cache_data(max_entries=10)
+def cached_total(generation: int) -> int:
+    return get_catalog_stats()["total_games"]
+
+
+@st.cache_data(max_entries=500)
+def cached_search(q: str, generation: int) -> list[dict]:
+    return search_boardgames(q, limit=10)
+
+
+def clear_cached_data() -> None:
+    cached_page.clear()
+    cached_total.clear()
+    cached_search.clear()
+
+
+@st.fragment(run_every=2)
+def rerun_on_catalog_change() -> None:
+    """Checks the in-memory LiveCatalog (not the API) and reruns the page when it moved."""
+    if st.session_state.setdefault("live_version", live.version) != live.version:
+        st.session_state.live_version = live.version
+        st.rerun(scope="app")
+
+
+def game_label(g: dict) -> str:
+    return f"{g.get('name', 'Unnamed')} (id={g.get('id')})"
+
+
+def pick_game(label: str, key: str, page_games: list[dict]) -> dict | None:
+    """Selectbox whose options come from a search call, or the visible page when empty."""
+    query = st.text_input(
+        "Search by name or designer", key=f"{key}_query", placeholder="Type to search..."
+    )
+    options = page_games
+    if query.strip():
+        try:
+            options = live.page(cached_search(query.strip(), live.generation))
+        except RuntimeError as e:
+            st.error(str(e))
+            options = []
+
+    return st.selectbox(
+        label,
+        options=options,
+        index=None,
+        key=f"{key}_select",
+        placeholder="Choose a game...",
+        format_func=game_label,
+    )
 
 
 # ---------- Create-form state helpers ----------
@@ -63,89 +177,102 @@ def apply_create_form_reset_if_needed() -> None:
         st.session_state["reset_create_form"] = False
 
 
+rerun_on_catalog_change()
 col_left, col_right = st.columns([2, 1])
 
 # ================= LEFT: TABLE + DELETE =================
 with col_left:
     st.subheader("📋 Games")
 
+    # ---- Sort & filters ----
+    f = st.columns([1, 1, 2, 1, 1, 1])
+    sort = f[0].selectbox("Sort by", ["id", "name", "rating", "year_published"])
+    order = f[1].selectbox("Order", ["asc", "desc"])
+    designer = f[2].text_input("Designer")
+    players = f[3].number_input("Players", min_value=0, max_value=20, value=0)
+    min_rating = f[4].number_input("Min rating", min_value=0.0, max_value=10.0, value=0.0, step=0.5)
+    max_play_time = f[5].number_input("Max minutes", min_value=0, max_value=600, value=0, step=15)
+
+    filters = {
+        "designer": designer.strip() or None,
+        "players": int(players) or None,
+        "min_rating": float(min_rating) or None,
+        "max_play_time": int(max_play_time) or None,
+    }
+    filters = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+
+    # ---- Pagination (cursor stack: one entry per page we have visited) ----
+    view = (sort, order, filters)
+    if st.session_state.get("view") != view:
+        st.session_state.view = view
+        st.session_state.cursors = [None]
+
     try:
-        games = cached_games()
+        games, next_cursor = cached_page(st.session_state.cursors[-1], sort, order, filters, live.generation)
+        games = live.page(games)
+        total = cached_total(live.generation)
     except RuntimeError as e:
         st.error(f"API error: {e}")
         st.stop()
 
-    total = len(games)
     st.metric("Total games", total)
 
-    if games:
-        df = pd.DataFrame(games)
-
-        # ---- Pagination ----
-        total_pages = max(1, math.ceil(total / PAGE_SIZE))
-        if "page" not in st.session_state:
-            st.session_state.page = 1
-
-        nav = st.columns([1, 2, 1])
-        with nav[0]:
-            if st.button("⬅ Prev", disabled=(st.session_state.page <= 1)):
-                st.session_state.page -= 1
-                st.rerun()
-
-        with nav[1]:
-            st.write(f"Page **{st.session_state.page}** / **{total_pages}**")
-
-        with nav[2]:
-            if st.button("Next ➡", disabled=(st.session_state.page >= total_pages)):
-                st.session_state.page += 1
-                st.rerun()
-
-        start = (st.session_state.page - 1) * PAGE_SIZE
-        end = start + PAGE_SIZE
-        page_df = df.iloc[start:end]
+    page_no = len(st.session_state.cursors)
+    nav = st.columns([1, 2, 1])
+    with nav[0]:
+        if st.button("⬅ Prev", disabled=(page_no <= 1)):
+            st.session_state.cursors.pop()
+            st.rerun()
 
-        st.dataframe(page_df, use_container_width=True)
+    with nav[1]:
+        if filters:
+            st.write(f"Page **{page_no}** (filtered)")
+        else:
+            st.write(f"Page **{page_no}** / **{max(1, math.ceil(total / PAGE_SIZE))}**")
 
-        # ---- Delete ----
-        st.markdown("---")
-        st.subheader("🗑️ Delete")
+    with nav[2]:
+        if st.button("Next ➡", disabled=not next_cursor):
+            st.session_state.cursors.append(next_cursor)
+            st.rerun()
 
-        selected_game = st.selectbox(
-            "Select a game to delete",
-            options=games,
-            index=None,
-            placeholder="Choose a game...",
-            format_func=lambda g: f"{g.get('name', 'Unnamed')} (id={g.get('id')})",
-        )
+    if games:
+        st.dataframe(pd.DataFrame(games), use_container_width=True)
+    elif filters:
+        st.info("No games match these filters.")
+    else:
+        st.info("No games yet. Add one from the form →")
 
-        if selected_game:
-            with st.container(border=True):
-                st.markdown(f"### {selected_game.get('name', '')}")
+    # ---- Delete ----
+    st.markdown("---")
+    st.subheader("🗑️ Delete")
 
-                r1 = st.columns([2, 1, 1])
-                r1[0].write(f"**Designer:** {selected_game.get('designer') or '—'}")
-                r1[1].write(f"**Year:** {selected_game.get('year_published', 0)}")
-                r1[2].write(f"**ID:** {selected_game.get('id', '—')}")
+    selected_game = pick_game("Select a game to delete", "delete", games)
 
-                r2 = st.columns(4)
-                r2[0].write(
-                    f"**Players:** {selected_game.get('min_players', 0)}–{selected_game.get('max_players', 0)}"
-                )
-                r2[1].write(f"**Play time:** {selected_game.get('play_time_min', 0)} min")
-                r2[2].write(f"**Complexity:** {selected_game.get('complexity', 0)}")
-                r2[3].write(f"**Rating:** {selected_game.get('rating', 0)}")
+    if selected_game:
+        with st.container(border=True):
+            st.markdown(f"### {selected_game.get('name', '')}")
 
-            if st.button("🗑️ Delete selected"):
-                try:
-                    delete_boardgame(int(selected_game["id"]))
-                    cached_games.clear()
-                    st.success("Deleted successfully.")
-                    st.rerun()
-                except RuntimeError as e:
-                    st.error(str(e))
+            r1 = st.columns([2, 1, 1])
+            r1[0].write(f"**Designer:** {selected_game.get('designer') or '—'}")
+            r1[1].write(f"**Year:** {selected_game.get('year_published', 0)}")
+            r1[2].write(f"**ID:** {selected_game.get('id', '—')}")
 
-    else:
-        st.info("No games yet. Add one from the form →")
+            r2 = st.columns(4)
+            r2[0].write(
+                f"**Players:** {selected_game.get('min_players', 0)}–{selected_game.get('max_players', 0)}"
+            )
+            r2[1].write(f"**Play time:** {selected_game.get('play_time_min', 0)} min")
+            r2[2].write(f"**Complexity:** {selected_game.get('complexity', 0)}")
+            r2[3].write(f"**Rating:** {selected_game.get('rating', 0)}")
+
+        if st.button("🗑️ Delete selected"):
+            try:
+                delete_boardgame(int(selected_game["id"]))
+                clear_cached_data()
+                st.success("Deleted successfully.")
+                st.rerun()
+            except RuntimeError as e:
+                st.error(str(e))
 
 
 # ================= RIGHT: ADD + EDIT =================
@@ -195,11 +322,8 @@ with col_right:
         if not name_clean:
             st.error("Name is required.")
         else:
-            # Client-side duplicate check (server will enforce too)
-            existing_names = {normalize_name(g.get("name")) for g in games}
-            if normalize_name(name_clean) in existing_names:
-                st.error("A game with this name already exists.")
-            elif min_players > max_players and max_players != 0:
+            # Duplicate names are rejected by the server (case-insensitive)
+            if min_players > max_players and max_players != 0:
                 st.error("Min players cannot be greater than Max players.")
             else:
                 payload = {
@@ -214,7 +338,7 @@ with col_right:
                 }
                 try:
                     created = create_boardgame(payload)
-                    cached_games.clear()
+                    clear_cached_data()
 
                     # ✅ Reset after success (flag + rerun)
                     st.session_state["reset_create_form"] = True
@@ -228,13 +352,7 @@ with col_right:
     st.markdown("---")
     st.subheader("✏️ Edit game")
 
-    game_to_edit = st.selectbox(
-        "Select a game to edit",
-        options=games,
-        index=None,
-        placeholder="Choose a game...",
-        format_func=lambda g: f"{g.get('name', 'Unnamed')} (id={g.get('id')})",
-    )
+    game_to_edit = pick_game("Select a game to edit", "edit", games)
 
     if game_to_edit:
         with st.form("edit_form"):
@@ -290,30 +408,21 @@ with col_right:
             elif edit_min_p > edit_max_p and edit_max_p != 0:
                 st.error("Min players cannot be greater than Max players.")
             else:
-                # Prevent renaming to an existing name (belonging to another game)
-                name_to_id = {
-                    normalize_name(g.get("name")): g.get("id")
-                    for g in games
-                    if g.get("id") is not None
+                # Renaming onto another game's name is rejected by the server
+                payload = {
+                    "name": new_name,
+                    "designer": (edit_designer or "").strip() or None,
+                    "year_published": int(edit_year),
+                    "min_players": int(edit_min_p),
+                    "max_players": int(edit_max_p),
+                    "play_time_min": int(edit_time),
+                    "complexity": float(edit_complexity),
+                    "rating": float(edit_rating),
                 }
-                existing_id = name_to_id.get(normalize_name(new_name))
-                if existing_id is not None and existing_id != game_to_edit["id"]:
-                    st.error("Another game with this name already exists.")
-                else:
-                    payload = {
-                        "name": new_name,
-                        "designer": (edit_designer or "").strip() or None,
-                        "year_published": int(edit_year),
-                        "min_players": int(edit_min_p),
-                        "max_players": int(edit_max_p),
-                        "play_time_min": int(edit_time),
-                        "complexity": float(edit_complexity),
-                        "rating": float(edit_rating),
-                    }
-                    try:
-                        update_boardgame(int(game_to_edit["id"]), payload)
-                        cached_games.clear()
-                        st.success("Updated successfully.")
-                        st.rerun()
-                    except RuntimeError as e:
-                        st.error(str(e))
+                try:
+                    update_boardgame(int(game_to_edit["id"]), payload)
+                    clear_cached_data()
+                    st.success("Updated successfully.")
+                    st.rerun()
+                except RuntimeError as e:
+                    st.error(str(e))
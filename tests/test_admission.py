@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from app.admission import AdmissionLimiter, AdmissionMiddleware, limiters_from_settings
+from app.config import Settings
+from app.main import app
+
+
+def test_limiter_queues_in_order_and_sheds_beyond_the_queue():
+    async def run():
+        limiter = AdmissionLimiter(limit=1, queue_size=2, queue_timeout=0.2)
+        assert await limiter.acquire()
+
+        order = []
+
+        async def queued(name):
+            if await limiter.acquire():
+                order.append(name)
+                limiter.release()
+
+        waiting = [asyncio.create_task(queued(n)) for n in ("b", "c")]
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+        assert not await limiter.acquire()  # queue full: shed at once
+
+        limiter.release()
+        await asyncio.gather(*waiting)
+        assert order == ["b", "c"]
+        assert limiter.stats() == {"active": 0, "limit": 1, "queued": 0, "queue_size": 2, "rejected": 1}
+
+        # a waiter that is never served gives up after queue_timeout
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        assert limiter.rejected == 2 and limiter.queued == 0
+
+    asyncio.run(run())
+
+
+def test_middleware_returns_503_with_retry_after_and_skips_exempt_paths():
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    limiters = {
+        "read": AdmissionLimiter(limit=1, queue_size=0, queue_timeout=1),
+        "write": AdmissionLimiter(limit=1, queue_size=0, queue_timeout=1),
+    }
+    guarded = AdmissionMiddleware(slow_app, limiters, exempt=("/health",), retry_after=3)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=guarded), base_url="http://t") as client:
+            busy = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.05)
+
+            shed = await client.get("/other")
+            assert shed.status_code == 503
+            assert shed.headers["Retry-After"] == "3"
+            assert (await client.get("/health")).status_code == 200
+            assert (await client.post("/other")).status_code == 200  # writes have their own slots
+
+            release.set()
+            assert (await busy).status_code == 200
+            assert (await client.get("/other")).status_code == 200
+
+    asyncio.run(run())
+
+
+def test_health_reports_pools_and_admission_queues():
+    with TestClient(app) as client:
+        body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert {"size", "checked_out", "saturation"} <= set(body["pools"]["write"])
+    assert body["admission"]["read"]["queued"] == 0
+    assert body["admission"]["write"]["limit"] >= 1
+
+
+def test_limits_default_to_and_never_exceed_the_pool_sizes():
+    limiters = limiters_from_settings(Settings(sqlite_read_pool_size=6, sqlite_write_pool_size=1))
+    assert (limiters["read"].limit, limiters["write"].limit) == (6, 1)
+    assert limiters_from_settings(Settings(sqlite_read_pool_size=6, admission_read_limit=4))["read"].limit == 4
+
+    with pytest.raises(ValueError, match="read pool size"):
+        limiters_from_settings(Settings(sqlite_read_pool_size=6, admission_read_limit=7))
+
+    # one in-memory connection serves both classes
+    memory = limiters_from_settings(Settings(db_mode="memory"))
+    assert memory["read"] is memory["write"] and memory["read"].limit == 1
@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+APP_MODULES = [
+    "app.config",
+    "app.database",
+    "app.crud_async",
+    "app.routers.params",
+    "app.routers.boardgames",
+    "app.routers.boardgames_async",
+    "app.main",
+]
+
+
+@pytest.fixture()
+def async_client(monkeypatch, tmp_path):
+    """
+    Boot the app with BOARDGAME_DB_IO=async against a throwaway SQLite file.
+    Engines and routers are chosen at import-time, so the modules are re-imported.
+    """
+    monkeypatch.setenv("BOARDGAME_DB_MODE", "sqlite")
+    monkeypatch.setenv("BOARDGAME_DB_IO", "async")
+    monkeypatch.setenv("BOARDGAME_DATABASE_URL_SQLITE", f"sqlite:///{tmp_path / 'bg.db'}")
+
+    for name in APP_MODULES:
+        sys.modules.pop(name, None)
+
+    from app import crud
+    from app.main import app
+    import app.database as database
+
+    crud.clear_caches()
+    with TestClient(app) as c:
+        yield c
+
+    database.engine.dispose()
+    database.read_engine.dispose()
+    for name in APP_MODULES:
+        sys.modules.pop(name, None)
+
+
+def test_async_crud_roundtrip(async_client: TestClient):
+    res = async_client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    assert res.status_code == 201
+    bg_id = res.json()["id"]
+
+    res = async_client.post("/boardgames/", json={"name": "catan", "min_players": 3, "max_players": 4})
+    assert res.status_code == 400
+
+    res = async_client.put(f"/boardgames/{bg_id}", json={"rating": 8.0})
+    assert res.status_code == 200
+    assert res.json()["rating"] == 8.0
+    assert async_client.put("/boardgames/999999", json={"rating": 8.0}).status_code == 404
+    other = async_client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4})
+    assert async_client.put(f"/boardgames/{other.json()['id']}", json={"name": "CATAN"}).status_code == 400
+    assert async_client.delete(f"/boardgames/{other.json()['id']}").status_code == 204
+
+    res = async_client.get("/boardgames/", params={"limit": 1})
+    assert [x["name"] for x in res.json()] == ["Catan"]
+
+    # non-core routes keep using the sync engine against the same database file
+    res = async_client.get("/boardgames/export")
+    assert res.text.count("\n") == 1
+
+    assert async_client.delete(f"/boardgames/{bg_id}").status_code == 204
+    assert async_client.get(f"/boardgames/{bg_id}").status_code == 404
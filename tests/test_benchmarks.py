@@ -0,0 +1,30 @@
+from benchmarks.common import percentile
+from benchmarks.load import compare
+
+
+def route(rps, p95, errors=0):
+    return {"requests": 100, "errors": errors, "rps": rps, "p50_ms": 1.0, "p95_ms": p95, "p99_ms": p95}
+
+
+def test_percentile_is_nearest_rank():
+    values = sorted(float(i) for i in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_only_changes_beyond_threshold():
+    baseline = {"results": {"sqlite/1000": {"GET /boardgames/": route(1000, 10.0)}}}
+
+    within = {"results": {"sqlite/1000": {"GET /boardgames/": route(850, 11.5)}}}
+    assert compare(within, baseline, threshold=0.2) == []
+
+    slower = {
+        "results": {
+            "sqlite/1000": {"GET /boardgames/": route(700, 15.0, errors=3)},
+            "sqlite/100000": {"GET /boardgames/": route(1, 999.0)},  # no baseline, ignored
+        }
+    }
+    regressions = compare(slower, baseline, threshold=0.2)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("sqlite/1000 GET /boardgames/: rps 1000 -> 700")
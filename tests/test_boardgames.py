@@ -1,11 +1,18 @@
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import SQLModel, Session, create_engine, text
 
+from app import crud
+from app.config import settings
 from app.main import app
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.models import BoardGame  # noqa: F401
+from app.schemas import BoardGameRead
 
 
 @pytest.fixture()
@@ -23,7 +30,9 @@ def client():
             yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
+    crud.clear_caches()  # cached rows would leak between per-test databases
     with TestClient(app) as c:
         yield c
 
@@ -65,6 +74,24 @@ def test_list_boardgames(client: TestClient):
     assert {x["name"] for x in items} == {"Catan", "7 Wonders"}
 
 
+def test_fast_responses_match_the_response_model(client: TestClient):
+    payload = {
+        "name": "Azul", "designer": "Michael Kiesling", "year_published": 2017,
+        "min_players": 2, "max_players": 4, "play_time_min": 45, "complexity": 1.8, "rating": 7.8,
+    }
+    created = client.post("/boardgames/", json=payload).json()
+    client.post("/boardgames/", json={"name": "Go", "min_players": 2, "max_players": 2})
+    expected = BoardGameRead.model_validate(created).model_dump()
+
+    for path in ("/boardgames/", "/boardgames/search?q=azul"):
+        res = client.get(path)
+        assert res.headers["content-type"] == "application/json"
+        assert res.json()[0] == expected
+    assert client.get(f"/boardgames/{created['id']}").json() == expected
+    # nulls are encoded, not dropped
+    assert client.get("/boardgames/?sort=name&order=desc").json()[0]["designer"] is None
+
+
 def test_get_boardgame_by_id(client: TestClient):
     create = client.post(
         "/boardgames/",
@@ -117,6 +144,611 @@ def test_delete_boardgame(client: TestClient):
     assert res2.status_code == 404
 
 
+def test_update_and_delete_missing_or_invalid(client: TestClient):
+    bg_id = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}).json()["id"]
+
+    assert client.put("/boardgames/999999", json={"rating": 7.0}).status_code == 404
+    assert client.put("/boardgames/999999", json={"name": " "}).status_code == 404
+    assert client.put(f"/boardgames/{bg_id}", json={"name": " "}).status_code == 400
+    assert client.delete("/boardgames/999999").status_code == 404
+
+    # an empty update still bumps the row version, which the detail ETag follows
+    before = client.get(f"/boardgames/{bg_id}").headers["etag"]
+    assert client.put(f"/boardgames/{bg_id}", json={}).status_code == 200
+    assert client.get(f"/boardgames/{bg_id}").headers["etag"] != before
+
+
 def test_get_nonexistent_returns_404(client: TestClient):
     res = client.get("/boardgames/999999")
     assert res.status_code == 404
+
+
+def test_list_boardgames_keyset_pagination(client: TestClient):
+    for i in range(5):
+        client.post("/boardgames/", json={"name": f"Game {i}", "min_players": 2, "max_players": 4})
+
+    res = client.get("/boardgames/", params={"limit": 2})
+    assert res.status_code == 200
+    assert [x["name"] for x in res.json()] == ["Game 0", "Game 1"]
+
+    seen = [x["id"] for x in res.json()]
+    cursor = res.headers["X-Next-Cursor"]
+    while cursor:
+        res = client.get("/boardgames/", params={"limit": 2, "after": cursor})
+        seen.extend(x["id"] for x in res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+def test_list_boardgames_sorted_by_rating_with_nulls(client: TestClient):
+    ratings = [7.5, None, 8.1, 7.5, None, 6.0]
+    for i, rating in enumerate(ratings):
+        client.post(
+            "/boardgames/",
+            json={"name": f"Game {i}", "min_players": 2, "max_players": 4, "rating": rating},
+        )
+
+    for order in ("asc", "desc"):
+        full = client.get("/boardgames/", params={"sort": "rating", "order": order}).json()
+
+        paged = []
+        params = {"sort": "rating", "order": order, "limit": 1}
+        while True:
+            res = client.get("/boardgames/", params=params)
+            paged.extend(res.json())
+            if "X-Next-Cursor" not in res.headers:
+                break
+            params["after"] = res.headers["X-Next-Cursor"]
+
+        assert [x["id"] for x in paged] == [x["id"] for x in full]
+        assert len(paged) == len(ratings)
+
+
+def test_list_boardgames_rejects_foreign_cursor(client: TestClient):
+    client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4})
+
+    cursor = client.get("/boardgames/", params={"limit": 1}).headers["X-Next-Cursor"]
+
+    res = client.get("/boardgames/", params={"limit": 1, "after": cursor, "sort": "name"})
+    assert res.status_code == 400
+
+    res = client.get("/boardgames/", params={"after": "not-a-cursor"})
+    assert res.status_code == 400
+
+    # well-formed, but the value is not something the sort column can hold
+    for sort, value in (("rating", [1]), ("name", {"a": 1}), ("name", 5), ("id", None)):
+        forged = crud.encode_cursor(sort, "asc", value, 1)
+        res = client.get("/boardgames/", params={"after": forged, "sort": sort})
+        assert res.status_code == 400, (sort, value)
+
+
+def test_cursor_pages_seek_the_sort_index():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    # a deep page must cost what page 1 does: every index range is a SEARCH, never a SCAN
+    cursors = [
+        ("name", "asc", "Catan"),
+        ("rating", "desc", 7.5),    # then the NULL ratings, which trail
+        ("rating", "asc", None),    # inside the leading NULLs
+        ("year_published", "desc", None),
+    ]
+    with engine.connect() as conn:
+        for sort, order, value in cursors:
+            stmt = crud.list_statement(20, crud.encode_cursor(sort, order, value, 100), sort, order)
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+            assert any(step.startswith("SEARCH boardgame") for step in plan), (sort, order, plan)
+            assert not any(step.startswith("SCAN boardgame") for step in plan), (sort, order, plan)
+
+
+def test_list_boardgames_filters(client: TestClient):
+    games = [
+        ("Catan", "Klaus Teuber", 3, 4, 90, 7.1),
+        ("Azul", "Michael Kiesling", 2, 4, 45, 7.8),
+        ("Gloomhaven", "Isaac Childres", 1, 4, 120, 8.7),
+        ("Carcassonne", "Klaus-Jürgen Wrede", 2, 5, 35, 7.4),
+    ]
+    for name, designer, lo, hi, minutes, rating in games:
+        client.post(
+            "/boardgames/",
+            json={
+                "name": name,
+                "designer": designer,
+                "min_players": lo,
+                "max_players": hi,
+                "play_time_min": minutes,
+                "rating": rating,
+            },
+        )
+
+    def names(**params):
+        return [x["name"] for x in client.get("/boardgames/", params=params).json()]
+
+    assert names(designer="klaus teuber") == ["Catan"]
+    assert names(players=5) == ["Carcassonne"]
+    assert names(min_rating=7.5, sort="rating") == ["Azul", "Gloomhaven"]
+    assert names(players=2, max_play_time=60) == ["Azul", "Carcassonne"]
+
+    res = client.get("/boardgames/", params={"players": 2, "limit": 1})
+    rest = client.get(
+        "/boardgames/", params={"players": 2, "limit": 5, "after": res.headers["X-Next-Cursor"]}
+    )
+    assert [x["name"] for x in res.json() + rest.json()] == ["Azul", "Gloomhaven", "Carcassonne"]
+
+
+def test_create_duplicate_name_is_case_insensitive(client: TestClient):
+    res = client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    assert res.status_code == 201
+
+    res = client.post("/boardgames/", json={"name": "  CATAN ", "min_players": 3, "max_players": 4})
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Board game with this name already exists"
+
+    # the failed insert must not poison the session for later requests
+    res = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4})
+    assert res.status_code == 201
+
+
+def test_update_rename_to_existing_name_returns_400(client: TestClient):
+    client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    other = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4})
+    bg_id = other.json()["id"]
+
+    res = client.put(f"/boardgames/{bg_id}", json={"name": "catan"})
+    assert res.status_code == 400
+
+    # changing only the case of its own name is fine
+    res = client.put(f"/boardgames/{bg_id}", json={"name": "AZUL"})
+    assert res.status_code == 200
+    assert res.json()["name"] == "AZUL"
+
+
+def test_bulk_create_reports_per_item_results(client: TestClient):
+    client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+
+    items = [
+        {"name": "Azul", "min_players": 2, "max_players": 4},
+        {"name": "catan", "min_players": 3, "max_players": 4},
+        {"name": "Splendor", "min_players": 2},
+        {"name": "AZUL", "min_players": 2, "max_players": 4},
+        {"name": "Root", "min_players": 2, "max_players": 4, "rating": 8.0},
+    ]
+    res = client.post("/boardgames/bulk", json=items)
+    assert res.status_code == 200
+
+    body = res.json()
+    assert (body["created"], body["updated"], body["failed"]) == (2, 0, 3)
+    assert [r["status"] for r in body["results"]] == ["created", "error", "error", "error", "created"]
+    assert "max_players" in body["results"][2]["detail"]
+
+    root = client.get(f"/boardgames/{body['results'][4]['id']}").json()
+    assert root["name"] == "Root"
+
+
+def test_bulk_upsert_updates_existing_by_name(client: TestClient):
+    created = client.post(
+        "/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4, "rating": 7.0}
+    ).json()
+
+    items = [
+        {"name": "CATAN", "min_players": 3, "max_players": 6, "rating": 7.5},
+        {"name": "Azul", "min_players": 2, "max_players": 4},
+    ]
+    body = client.post("/boardgames/bulk", params={"upsert": True}, json=items).json()
+    assert [r["status"] for r in body["results"]] == ["updated", "created"]
+    assert body["results"][0]["id"] == created["id"]
+
+    catan = client.get(f"/boardgames/{created['id']}").json()
+    assert (catan["name"], catan["max_players"], catan["rating"]) == ("CATAN", 6, 7.5)
+
+
+def test_batch_update_reports_per_item(client: TestClient):
+    ids = [
+        client.post("/boardgames/", json={"name": n, "min_players": 2, "max_players": 4}).json()["id"]
+        for n in ("Azul", "Catan", "Go")
+    ]
+    res = client.patch("/boardgames/batch", json=[
+        {"id": ids[0], "rating": 8.1},
+        {"id": ids[1], "rating": 7.0, "name": "Catan Deluxe"},
+        {"id": ids[2], "name": "AZUL"},          # taken by another game
+        {"id": 999999, "rating": 5.0},
+        {"id": ids[0], "rating": 1.0},          # repeated id
+        {"rating": 4.0},                        # no id
+    ])
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["updated"], body["failed"], body["committed"]) == (2, 4, True)
+    assert [r["status"] for r in body["results"]] == ["updated", "updated", "error", "error", "error", "error"]
+    assert body["results"][3]["detail"] == "Board game not found"
+
+    assert client.get(f"/boardgames/{ids[0]}").json()["rating"] == 8.1
+    assert client.get(f"/boardgames/{ids[1]}").json()["name"] == "Catan Deluxe"
+    assert client.get(f"/boardgames/{ids[2]}").json()["name"] == "Go"
+
+
+def test_batch_update_rejects_nulls_for_required_fields(client: TestClient):
+    bg_id = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}).json()["id"]
+
+    res = client.patch("/boardgames/batch", json=[
+        {"id": bg_id, "name": None},
+        {"id": bg_id, "max_players": None},
+        {"id": bg_id, "rating": None},          # nullable: clears the rating
+        {"id": "abc", "rating": 5.0},           # not an id at all
+    ])
+    assert res.status_code == 200
+    body = res.json()
+    assert [r["status"] for r in body["results"]] == ["error", "error", "updated", "error"]
+    assert body["results"][3]["id"] is None
+    assert body["results"][0]["detail"] == "name: Value error, cannot be null"
+    assert client.get(f"/boardgames/{bg_id}").json()["max_players"] == 4
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_batch_update_reports_games_deleted_during_the_batch(monkeypatch, atomic):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        kept, gone = (
+            crud.create_boardgame(session, BoardGame(name=n, min_players=2, max_players=4)).id
+            for n in ("Azul", "Go")
+        )
+
+    # another writer deletes a game after the existence check, before the UPDATEs
+    lookup = crud.get_ids_by_name_key
+
+    def delete_then_lookup(session, keys):
+        session.exec(text(f"DELETE FROM boardgame WHERE id = {gone}"))
+        return lookup(session, keys)
+
+    monkeypatch.setattr(crud, "get_ids_by_name_key", delete_then_lookup)
+    with Session(engine) as session:
+        outcomes = crud.batch_update_boardgames(
+            session, [(kept, {"rating": 8.0}), (gone, {"rating": 7.0})], atomic=atomic
+        )
+    assert outcomes[1] == ("error", gone, "Board game not found")
+    assert outcomes[0][0] == ("skipped" if atomic else "updated")
+    with Session(engine) as session:
+        assert session.get(BoardGame, kept).rating == (None if atomic else 8.0)
+
+
+def test_batch_atomic_mode_writes_nothing_on_failure(client: TestClient):
+    bg_id = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}).json()["id"]
+
+    res = client.patch("/boardgames/batch?atomic=true", json=[{"id": bg_id, "rating": 9.0}, {"id": 999999}])
+    assert res.status_code == 409
+    assert res.json()["committed"] is False
+    assert [r["status"] for r in res.json()["results"]] == ["skipped", "error"]
+    assert client.get(f"/boardgames/{bg_id}").json()["rating"] is None
+
+    res = client.request("DELETE", "/boardgames/batch?atomic=true", json={"ids": [bg_id, 999999]})
+    assert res.status_code == 409
+    assert client.get(f"/boardgames/{bg_id}").status_code == 200
+
+
+def test_batch_delete_by_ids_or_filter(client: TestClient, monkeypatch):
+    client.post("/boardgames/bulk", json=[
+        {"name": f"Game {i}", "designer": "Ann" if i % 2 else "Bo", "min_players": 2, "max_players": 4}
+        for i in range(6)
+    ])
+    ids = [g["id"] for g in client.get("/boardgames/").json()]
+
+    res = client.request("DELETE", "/boardgames/batch", json={"ids": [ids[0], 999999]})
+    assert [r["status"] for r in res.json()["results"]] == ["deleted", "error"]
+
+    res = client.request("DELETE", "/boardgames/batch?designer=ann")
+    assert res.status_code == 200
+    assert res.json()["deleted"] == 3
+    assert {g["designer"] for g in client.get("/boardgames/").json()} == {"Bo"}
+
+    # a filter matching more than bulk_max_items is refused before anything is deleted
+    monkeypatch.setattr(settings, "bulk_max_items", 1)
+    res = client.request("DELETE", "/boardgames/batch?designer=bo")
+    assert res.status_code == 400
+    assert len(client.get("/boardgames/").json()) == 2
+
+    # neither ids nor filters would delete everything, so it is refused
+    assert client.request("DELETE", "/boardgames/batch").status_code == 400
+    assert client.request("DELETE", "/boardgames/batch?designer=bo", json={"ids": [ids[1]]}).status_code == 400
+
+
+def test_changes_feed_returns_upserts_and_tombstones(client: TestClient):
+    a = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}).json()
+    b = client.post("/boardgames/", json={"name": "Go", "min_players": 2, "max_players": 2}).json()
+
+    feed = client.get("/boardgames/changes").json()
+    assert [(c["op"], c["id"]) for c in feed["changes"]] == [("upsert", a["id"]), ("upsert", b["id"])]
+    assert feed["changes"][0]["game"] == a
+    cursor = feed["cursor"]
+
+    c = client.post("/boardgames/", json={"name": "Hive", "min_players": 2, "max_players": 2}).json()
+    client.put(f"/boardgames/{a['id']}", json={"rating": 8.0})
+    client.put(f"/boardgames/{a['id']}", json={"rating": 8.5})
+    client.delete(f"/boardgames/{b['id']}")
+
+    # each game once, in its latest state, paged by cursor
+    page = client.get("/boardgames/changes", params={"since": cursor, "limit": 2}).json()
+    assert page["has_more"] is True
+    assert [(x["op"], x["id"]) for x in page["changes"]] == [("upsert", c["id"]), ("upsert", a["id"])]
+    assert page["changes"][1]["game"]["rating"] == 8.5
+
+    rest = client.get("/boardgames/changes", params={"since": page["cursor"], "limit": 2}).json()
+    assert [(x["op"], x["id"], x["game"]) for x in rest["changes"]] == [("delete", b["id"], None)]
+    assert rest["has_more"] is False
+    assert client.get("/boardgames/changes", params={"since": rest["cursor"]}).json()["changes"] == []
+
+    # a cursor the log never reached (e.g. from before a reset) must resync
+    assert client.get("/boardgames/changes", params={"since": rest["cursor"] + 100}).status_code == 410
+
+
+def test_export_ndjson_and_csv(client: TestClient):
+    client.post("/boardgames/bulk", json=[
+        {"name": f"Game {i}", "designer": "Ann, B.", "min_players": 2, "max_players": 4}
+        for i in range(300)
+    ])
+
+    res = client.get("/boardgames/export")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(ln) for ln in res.text.splitlines()]
+    assert len(lines) == 300
+    assert lines[0]["name"] == "Game 0"
+    assert lines[0]["designer"] == "Ann, B."
+
+    res = client.get("/boardgames/export", params={"format": "csv"})
+    assert res.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert len(rows) == 300
+    assert rows[-1]["name"] == "Game 299"
+    assert rows[-1]["designer"] == "Ann, B."
+
+
+def test_list_etag_revalidation(client: TestClient):
+    client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+
+    res = client.get("/boardgames/")
+    etag = res.headers["ETag"]
+    assert "Last-Modified" in res.headers
+
+    res = client.get("/boardgames/", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.content == b""
+
+    client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4})
+
+    res = client.get("/boardgames/", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert len(res.json()) == 2
+
+
+def test_detail_etag_tracks_row_version(client: TestClient):
+    bg_id = client.post(
+        "/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4}
+    ).json()["id"]
+    other_id = client.post(
+        "/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}
+    ).json()["id"]
+
+    res = client.get(f"/boardgames/{bg_id}")
+    etag, last_modified = res.headers["ETag"], res.headers["Last-Modified"]
+
+    assert client.get(f"/boardgames/{bg_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(
+        f"/boardgames/{bg_id}", headers={"If-Modified-Since": last_modified}
+    ).status_code == 304
+
+    # writes to other rows leave this row's validator alone
+    client.put(f"/boardgames/{other_id}", json={"rating": 9.0})
+    assert client.get(f"/boardgames/{bg_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/boardgames/{bg_id}", json={"rating": 8.0})
+    res = client.get(f"/boardgames/{bg_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["rating"] == 8.0
+
+
+def test_detail_etag_is_not_reused_by_a_recreated_id(client: TestClient):
+    client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    bg_id = client.post("/boardgames/", json={"name": "Azul", "min_players": 2, "max_players": 4}).json()["id"]
+    etag = client.get(f"/boardgames/{bg_id}").headers["ETag"]
+
+    # SQLite gives the deleted max id to the next game, which starts again at version 1
+    client.delete(f"/boardgames/{bg_id}")
+    new = client.post("/boardgames/", json={"name": "Root", "min_players": 2, "max_players": 4}).json()
+    assert new["id"] == bg_id
+
+    res = client.get(f"/boardgames/{bg_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["name"] == "Root"
+
+
+def test_reads_are_cached_and_writes_invalidate(client: TestClient):
+    bg_id = client.post(
+        "/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4}
+    ).json()["id"]
+
+    client.get(f"/boardgames/{bg_id}")
+    hits = crud.game_cache.hits
+    client.get(f"/boardgames/{bg_id}")
+    assert crud.game_cache.hits == hits + 1
+
+    client.get("/boardgames/")
+    hits = crud.list_cache.hits
+    client.get("/boardgames/")
+    assert crud.list_cache.hits == hits + 1
+
+    client.put(f"/boardgames/{bg_id}", json={"rating": 9.1})
+    assert client.get(f"/boardgames/{bg_id}").json()["rating"] == 9.1
+    assert client.get("/boardgames/").json()[0]["rating"] == 9.1
+
+    client.delete(f"/boardgames/{bg_id}")
+    assert client.get(f"/boardgames/{bg_id}").status_code == 404
+    assert client.get("/boardgames/").json() == []
+
+
+def test_a_read_racing_a_write_does_not_cache_the_old_row():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    crud.clear_caches()
+    with Session(engine) as session:
+        bg_id = crud.create_boardgame(session, BoardGame(name="Azul", min_players=2, max_players=4)).id
+
+    class SlowReader(Session):
+        def get(self, *args, **kwargs):
+            row = super().get(*args, **kwargs)
+            # a write commits and invalidates after the row was read, before it is cached
+            with Session(engine) as writer:
+                crud.update_boardgame(writer, bg_id, {"rating": 9.0})
+            return row
+
+    with SlowReader(engine) as session:
+        assert crud.get_boardgame(session, bg_id).rating is None
+    with Session(engine) as session:
+        assert crud.get_boardgame(session, bg_id).rating == 9.0
+
+
+def test_search_ranks_prefix_matches(client: TestClient):
+    client.post("/boardgames/bulk", json=[
+        {"name": "Terraforming Mars", "designer": "Jacob Fryxelius", "min_players": 1, "max_players": 5},
+        {"name": "Mars Open", "designer": "Someone", "min_players": 1, "max_players": 4},
+        {"name": "Catan", "designer": "Klaus Teuber", "min_players": 3, "max_players": 4},
+        {"name": "Space Race", "designer": "Marsha Terra", "min_players": 2, "max_players": 4},
+    ])
+
+    names = [g["name"] for g in client.get("/boardgames/search", params={"q": "mar"}).json()]
+    # name hits outrank the designer hit
+    assert set(names[:2]) == {"Terraforming Mars", "Mars Open"}
+    assert names[2] == "Space Race"
+
+    res = client.get("/boardgames/search", params={"q": "terraforming ma"})
+    assert [g["name"] for g in res.json()] == ["Terraforming Mars"]
+
+    # FTS syntax in user input is treated as plain words
+    assert client.get("/boardgames/search", params={"q": 'catan" OR'}).status_code == 200
+
+
+def test_search_follows_writes_and_paginates(client: TestClient):
+    ids = [
+        client.post("/boardgames/", json={"name": f"Dominion {i}", "min_players": 2, "max_players": 4}).json()["id"]
+        for i in range(3)
+    ]
+
+    res = client.get("/boardgames/search", params={"q": "dominion", "limit": 2})
+    assert len(res.json()) == 2
+    res = client.get(
+        "/boardgames/search",
+        params={"q": "dominion", "limit": 2, "after": res.headers["X-Next-Cursor"]},
+    )
+    assert len(res.json()) == 1
+    assert "X-Next-Cursor" not in res.headers
+
+    client.put(f"/boardgames/{ids[0]}", json={"name": "Thunderstone"})
+    client.delete(f"/boardgames/{ids[1]}")
+
+    assert [g["id"] for g in client.get("/boardgames/search", params={"q": "dominion"}).json()] == [ids[2]]
+    assert [g["id"] for g in client.get("/boardgames/search", params={"q": "thunder"}).json()] == [ids[0]]
+
+
+def test_stats_follow_writes(client: TestClient):
+    client.post("/boardgames/bulk", json=[
+        {"name": "Catan", "designer": "Klaus Teuber", "year_published": 1995,
+         "min_players": 3, "max_players": 4, "complexity": 2.0, "rating": 7.2},
+        {"name": "Azul", "designer": "Michael Kiesling", "year_published": 2017,
+         "min_players": 2, "max_players": 4, "complexity": 1.8, "rating": 7.8},
+        {"name": "Catan: Seafarers", "designer": "Klaus Teuber", "year_published": 1997,
+         "min_players": 3, "max_players": 4, "complexity": 2.4, "rating": 10.0},
+    ])
+
+    stats = client.get("/boardgames/stats").json()
+    assert stats["total_games"] == 3
+    assert stats["average_rating"] == 8.333
+    assert stats["rating_histogram"] == {"7-8": 2, "9-10": 1}
+    assert stats["games_per_year"] == {"1995": 1, "1997": 1, "2017": 1}
+    assert stats["player_count_coverage"] == {"1": 0, "2": 1, "3": 3, "4": 3}
+    assert stats["top_designers"][0] == {"designer": "Klaus Teuber", "games": 2, "average_complexity": 2.2}
+
+    azul = client.get("/boardgames/search", params={"q": "azul"}).json()[0]
+    client.put(f"/boardgames/{azul['id']}", json={"max_players": 6, "year_published": 1995})
+    catan = client.get("/boardgames/search", params={"q": "seafarers"}).json()[0]
+    client.delete(f"/boardgames/{catan['id']}")
+
+    stats = client.get("/boardgames/stats").json()
+    assert stats["total_games"] == 2
+    assert stats["games_per_year"] == {"1995": 2}
+    assert stats["player_count_coverage"]["6"] == 1
+    designers = {d["designer"]: d for d in stats["top_designers"]}
+    assert designers["Klaus Teuber"] == {"designer": "Klaus Teuber", "games": 1, "average_complexity": 2.0}
+
+
+def test_stats_memo_is_not_shared_between_databases():
+    def fresh_engine():
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(engine)
+        return engine
+
+    first, second = fresh_engine(), fresh_engine()
+    with Session(first) as session:
+        crud.create_boardgame(session, BoardGame(name="Azul", min_players=2, max_players=4, rating=8.0))
+    with Session(second) as session:
+        crud.create_boardgame(session, BoardGame(name="Go", min_players=2, max_players=2, rating=6.0))
+
+    # both catalogs are at version 1, as after a reset; the memo must not mix them up
+    for engine, rating in ((first, 8.0), (second, 6.0), (first, 8.0)):
+        with Session(engine) as session:
+            assert crud.get_catalog_state(session)[0] == 1
+            assert crud.get_catalog_stats(session)["average_rating"] == rating
+
+
+def test_similar_and_recommend(client: TestClient):
+    games = [
+        ("Azul", 1.8, 7.8, 45, 2, 4),
+        ("Sagrada", 1.9, 7.5, 40, 1, 4),
+        ("Gloomhaven", 3.9, 8.7, 120, 1, 4),
+        ("Twilight Imperium", 4.3, 8.6, 480, 3, 6),
+    ]
+    ids = {}
+    for name, complexity, rating, minutes, lo, hi in games:
+        res = client.post(
+            "/boardgames/",
+            json={
+                "name": name,
+                "complexity": complexity,
+                "rating": rating,
+                "play_time_min": minutes,
+                "min_players": lo,
+                "max_players": hi,
+            },
+        )
+        ids[name] = res.json()["id"]
+
+    similar = client.get(f"/boardgames/{ids['Azul']}/similar", params={"k": 2}).json()
+    assert [g["name"] for g in similar] == ["Sagrada", "Gloomhaven"]
+    assert client.get("/boardgames/999999/similar").status_code == 404
+
+    res = client.get("/boardgames/recommend", params={"players": 4, "max_minutes": 60})
+    assert [g["name"] for g in res.json()] == ["Azul", "Sagrada"]
+
+    # single-row writes update the in-memory matrix instead of forcing a rebuild
+    client.put(f"/boardgames/{ids['Sagrada']}", json={"rating": 9.0})
+    client.delete(f"/boardgames/{ids['Azul']}")
+    assert crud.feature_index.version is not None
+    res = client.get("/boardgames/recommend", params={"players": 4, "k": 2})
+    assert [g["name"] for g in res.json()] == ["Sagrada", "Gloomhaven"]
+
+
+def test_metrics_endpoint_counts_requests_by_route_template(client: TestClient):
+    created = client.post("/boardgames/", json={"name": "Catan", "min_players": 3, "max_players": 4})
+    client.get(f"/boardgames/{created.json()['id']}")
+    client.get("/boardgames/999999")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    assert 'http_requests_total{method="GET",route="/boardgames/{boardgame_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/boardgames/",le="+Inf"}' in body
+    assert "# TYPE db_statement_duration_seconds histogram" in body
@@ -0,0 +1,53 @@
+from app.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expiry_and_counters():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now = 5
+    assert cache.get("a") is MISSING
+    assert cache.stats() == {"enabled": True, "size": 0, "hits": 1, "misses": 2, "evictions": 1}
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(maxsize=10, ttl=60, enabled=False)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["misses"] == 0
+
+
+def test_fill_is_dropped_when_invalidated_during_the_read():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation  # reader starts
+    cache.invalidate("a")          # a writer commits and invalidates
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is MISSING
+
+    cache.set("a", "fresh", cache.generation)
+    assert cache.get("a") == "fresh"
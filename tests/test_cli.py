@@ -2,6 +2,7 @@ import importlib
 import sys
 
 import pytest
+from sqlalchemy import text
 from typer.testing import CliRunner
 
 
@@ -47,6 +48,23 @@ def test_cli_seed_then_export(cli_module):
     assert len(game_lines) >= 2
 
 
+def test_cli_reset_clears_the_search_index(cli_module):
+    from sqlmodel import Session
+
+    from app import crud
+
+    runner = CliRunner()
+    runner.invoke(cli_module.app, ["reset", "--yes"])
+    assert runner.invoke(cli_module.app, ["seed", "--sample", "5"]).exit_code == 0
+
+    # the new catalog reuses the old ids; the index must not answer with the old rows
+    assert runner.invoke(cli_module.app, ["reset", "--yes"]).exit_code == 0
+    with Session(cli_module.engine) as session:
+        crud.bulk_create_boardgames(session, [{"name": "Root", "min_players": 2, "max_players": 4}])
+        assert crud.search_boardgames(session, "Catan")[0] == []
+        assert [g.name for g in crud.search_boardgames(session, "Root")[0]] == ["Root"]
+
+
 def test_cli_reset_cancel(cli_module):
     runner = CliRunner()
 
@@ -54,3 +72,130 @@ def test_cli_reset_cancel(cli_module):
     r = runner.invoke(cli_module.app, ["reset"], input="n\n")
     assert r.exit_code == 0
     assert "Cancelled." in r.output
+
+
+def test_cli_import_ndjson_and_resume(cli_module, tmp_path):
+    runner = CliRunner()
+    runner.invoke(cli_module.app, ["reset", "--yes"])
+
+    src = tmp_path / "games.ndjson"
+    lines = [
+        '{"name": "Catan", "min_players": 3, "max_players": 4, "rating": 7.2}',
+        '{"name": "Azul", "min_players": 2, "max_players": 4}',
+        "not json",
+        '{"name": "Root", "min_players": 2}',
+        '{"name": "Splendor", "min_players": 2, "max_players": 4}',
+    ]
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    r = runner.invoke(cli_module.app, ["import", str(src), "--chunk-size", "2"])
+    assert r.exit_code == 0, r.output
+    assert "3 created, 0 updated, 2 failed" in r.output
+    assert "rows/s" in r.output
+
+    # resuming from line 5 only touches the last record, which already exists now
+    r = runner.invoke(cli_module.app, ["import", str(src), "--start-line", "5"])
+    assert r.exit_code == 0, r.output
+    assert "0 created, 0 updated, 1 failed" in r.output
+
+    # plain imports run with the triggers suspended; the derived tables must still be current
+    from sqlmodel import Session
+
+    from app import crud
+
+    with Session(cli_module.engine) as session:
+        version, _ = crud.get_catalog_state(session)
+        assert crud.get_catalog_stats(session, version=version)["total_games"] == 3
+        assert crud.search_boardgames(session, "Splendor", limit=1)[0][0].name == "Splendor"
+        assert len(crud.list_changes(session, since=0)[0]) == 3
+        triggers = set(session.exec(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+    assert "boardgame_fts_insert" in triggers
+
+
+def test_cli_import_csv(cli_module, tmp_path):
+    runner = CliRunner()
+    runner.invoke(cli_module.app, ["reset", "--yes"])
+
+    src = tmp_path / "games.csv"
+    src.write_text(
+        "name,designer,year_published,min_players,max_players,rating\n"
+        'Catan,"Teuber, Klaus",1995,3,4,7.2\n'
+        "Azul,,,2,4,\n",
+        encoding="utf-8",
+    )
+
+    r = runner.invoke(cli_module.app, ["import", str(src)])
+    assert r.exit_code == 0, r.output
+    assert "2 created" in r.output
+
+    r = runner.invoke(cli_module.app, ["export"])
+    assert "Catan | Teuber, Klaus | rating=7.2" in r.output
+    assert "Azul | None | rating=None" in r.output
+
+
+def test_cli_generate_is_deterministic_and_keeps_derived_tables(cli_module):
+    from sqlmodel import Session
+
+    from app import crud
+    from app.generator import generate_games
+
+    runner = CliRunner()
+    runner.invoke(cli_module.app, ["reset", "--yes"])
+
+    r = runner.invoke(cli_module.app, ["generate", "--count", "500", "--seed", "7"])
+    assert r.exit_code == 0, r.output
+    assert "500 inserted, 0 skipped" in r.output
+
+    # same seed, same names: a second run inserts nothing
+    r = runner.invoke(cli_module.app, ["generate", "--count", "500", "--seed", "7"])
+    assert "0 inserted, 500 skipped" in r.output
+    assert [g["name"] for g in next(generate_games(5, seed=7))] == [
+        g["name"] for g in next(generate_games(5, seed=7))
+    ]
+
+    with Session(cli_module.engine) as session:
+        version, _ = crud.get_catalog_state(session)
+        stats = crud.get_catalog_stats(session, version=version)
+        first = next(generate_games(1, seed=7))[0]
+        hits, _ = crud.search_boardgames(session, first["name"], limit=1)
+        triggers = set(
+            session.exec(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars()
+        )
+        changes, _, _ = crud.list_changes(session, since=0, limit=1000)
+
+    assert stats["total_games"] == 500
+    assert hits[0].name == first["name"]
+    assert len(changes) == 500
+    assert {
+        "boardgame_catalog_insert", "boardgame_fts_insert", "boardgame_stats_insert", "boardgame_changes_insert"
+    } <= triggers
+
+
+def test_cli_compact_changes(cli_module):
+    from sqlmodel import Session
+
+    from app import crud
+    from app.models import BoardGame
+
+    runner = CliRunner()
+    runner.invoke(cli_module.app, ["reset", "--yes"])
+    runner.invoke(cli_module.app, ["seed", "--sample", "3"])
+    with Session(cli_module.engine) as session:
+        crud.update_boardgame(session, 1, {"rating": 9.0})
+        crud.delete_boardgame(session, 2)
+        _, cursor, _ = crud.list_changes(session, since=0)
+
+    # the superseded insert of game 1 and the tombstone of game 2 go
+    r = runner.invoke(cli_module.app, ["compact-changes", "--tombstone-days", "0"])
+    assert r.exit_code == 0, r.output
+    assert "Removed 3 change-log entries" in r.output
+
+    with Session(cli_module.engine) as session:
+        changes, _, _ = crud.list_changes(session, since=0)
+        assert [(op, game_id) for _, op, game_id, _ in changes] == [("upsert", 3), ("upsert", 1)]
+        assert crud.list_changes(session, since=cursor)[0] == []
+        with pytest.raises(crud.ChangesCompacted):
+            crud.list_changes(session, since=1)
+        session.add(BoardGame(name="Go", min_players=2, max_players=2))
+        session.commit()
+        assert [op for _, op, _, _ in crud.list_changes(session, since=cursor)[0]] == ["upsert"]
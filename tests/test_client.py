@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from frontend.client import ApiError, AsyncBoardGameClient, BoardGameClient, ChangeFollower
+
+
+def make_client(handler, cls=BoardGameClient, **kwargs):
+    return cls("http://api.test", transport=httpx.MockTransport(handler), backoff_base=0, **kwargs)
+
+
+def test_idempotent_calls_retry_but_post_does_not():
+    calls = {"GET": 0, "POST": 0}
+
+    def handler(request: httpx.Request):
+        calls[request.method] += 1
+        if calls[request.method] < 3:
+            return httpx.Response(503, json={"detail": "busy"})
+        return httpx.Response(200, json={"id": 1, "name": "Catan"})
+
+    client = make_client(handler, retries=3)
+    assert client.get(1)["name"] == "Catan"
+    assert calls["GET"] == 3
+
+    with pytest.raises(ApiError) as exc:
+        client.create({"name": "Catan"})
+    assert exc.value.status_code == 503
+    assert calls["POST"] == 1
+
+
+def test_conditional_get_is_served_from_cache_on_304():
+    seen_validators = []
+
+    def handler(request: httpx.Request):
+        seen_validators.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"catalog-1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=[{"id": 1}], headers={"ETag": '"catalog-1"', "X-Next-Cursor": "abc"}
+        )
+
+    client = make_client(handler)
+    first = client.list_page(limit=1)
+    second = client.list_page(limit=1)
+
+    assert first == second == ([{"id": 1}], "abc")
+    assert seen_validators == [None, '"catalog-1"']
+
+
+def test_async_client_fans_out_and_maps_missing_to_none():
+    def handler(request: httpx.Request):
+        game_id = int(request.url.path.rsplit("/", 1)[-1])
+        if game_id == 2:
+            return httpx.Response(404, json={"detail": "Board game not found"})
+        return httpx.Response(200, json={"id": game_id})
+
+    async def run():
+        async with make_client(handler, cls=AsyncBoardGameClient) as client:
+            return await client.get_many([1, 2, 3])
+
+    assert asyncio.run(run()) == [{"id": 1}, None, {"id": 3}]
+
+
+def test_change_follower_resumes_from_last_event_id():
+    streams = [
+        b'retry: 3000\n\nid: 4\nevent: ready\ndata: {"cursor": 4}\n\n: keepalive\n\n'
+        b'id: 6\nevent: changes\ndata: {"cursor": 6, "changes": [{"id": 1, "op": "upsert"}]}\n\n',
+        b'id: 9\nevent: resync\ndata: {"cursor": 9}\n\n',
+    ]
+    last_event_ids = []
+    received = []
+
+    def handler(request: httpx.Request):
+        last_event_ids.append(request.headers.get("Last-Event-ID"))
+        if not streams:
+            follower.stop()
+            return httpx.Response(503)
+        return httpx.Response(200, content=streams.pop(0), headers={"Content-Type": "text/event-stream"})
+
+    follower = ChangeFollower(
+        make_client(handler, retries=0), received.append, lambda: received.append("resync")
+    )
+    follower.start()
+    follower.join(timeout=5)
+
+    assert received == [[{"id": 1, "op": "upsert"}], "resync"]
+    assert last_event_ids == [None, "6", "9"]
+    assert follower.cursor == 9
@@ -0,0 +1,75 @@
+import sys
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.fixture()
+def database_module(monkeypatch, tmp_path):
+    """
+    Load app.database against a throwaway SQLite file with the throughput profile.
+    Engines are created at import-time, so the modules are re-imported after setting env.
+    """
+    monkeypatch.setenv("BOARDGAME_DB_MODE", "sqlite")
+    monkeypatch.setenv("BOARDGAME_DATABASE_URL_SQLITE", f"sqlite:///{tmp_path / 'bg.db'}")
+    monkeypatch.setenv("BOARDGAME_SQLITE_PROFILE", "throughput")
+
+    for name in ["app.config", "app.database"]:
+        sys.modules.pop(name, None)
+
+    import app.database as database
+
+    database.create_db_and_tables()
+    yield database
+
+    database.engine.dispose()
+    database.read_engine.dispose()
+    for name in ["app.config", "app.database"]:
+        sys.modules.pop(name, None)
+
+
+def test_throughput_profile_pragmas(database_module):
+    with database_module.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 0
+
+
+def test_read_pool_rejects_writes(database_module):
+    with database_module.read_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM boardgame").scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql(
+                "INSERT INTO boardgame (name, min_players, max_players) VALUES ('Catan', 3, 4)"
+            )
+
+
+def test_create_all_upgrades_existing_schema(tmp_path):
+    from sqlmodel import SQLModel, create_engine
+
+    import app.models  # noqa: F401
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # the table as the first release created it
+        conn.exec_driver_sql(
+            "CREATE TABLE boardgame (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "designer VARCHAR, year_published INTEGER, min_players INTEGER NOT NULL, "
+            "max_players INTEGER NOT NULL, play_time_min INTEGER, complexity FLOAT, rating FLOAT)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO boardgame (name, min_players, max_players) VALUES ('Catan', 3, 4)"
+        )
+
+    SQLModel.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        assert conn.exec_driver_sql("SELECT version FROM boardgame").scalar() == 1
+        conn.exec_driver_sql("UPDATE boardgame SET rating = 7.0")
+        assert conn.exec_driver_sql("SELECT version FROM catalogstate").scalar() == 1
+        # rows that predate the search index are backfilled into it
+        assert conn.exec_driver_sql(
+            "SELECT rowid FROM boardgame_fts WHERE boardgame_fts MATCH 'catan'"
+        ).scalar() == 1
+    engine.dispose()
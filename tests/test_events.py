@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, text
+
+from app import crud
+from app.events import ChangeBroadcaster, event_stream
+from app.models import BoardGame
+
+
+def make_broadcaster(queue_size: int = 256):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    def last_seq():
+        with Session(engine) as session:
+            seq = session.exec(text("SELECT seq FROM sqlite_sequence WHERE name = 'boardgamechange'")).first()
+        return seq[0] if seq else 0
+
+    def changes(since):
+        with Session(engine) as session:
+            return crud.list_changes(session, since=since)
+
+    def create(name):
+        with Session(engine) as session:
+            return crud.create_boardgame(session, BoardGame(name=name, min_players=2, max_players=4)).id
+
+    crud.clear_caches()
+    return ChangeBroadcaster(queue_size, last_seq=last_seq, changes=changes), create
+
+
+def parse(chunk: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_broadcaster_fans_out_and_resyncs_slow_subscribers():
+    broadcaster, create = make_broadcaster(queue_size=2)
+
+    async def run():
+        fast, slow = broadcaster.subscribe(), broadcaster.subscribe()
+        await broadcaster.poll()
+        assert fast.start == slow.start == 0
+
+        first = create("Azul")
+        await broadcaster.poll()
+        assert fast.queue.get_nowait() == ("changes", 1, {"cursor": 1, "changes": [{"id": first, "op": "upsert"}]})
+
+        for name in ("Go", "Hive", "Catan"):
+            create(name)
+            await broadcaster.poll()
+            while not fast.queue.empty():
+                fast.queue.get_nowait()
+        # slow never read: its backlog collapsed into one resync instead of growing
+        assert slow.queue.get_nowait() == ("resync", 3, {"cursor": 3})
+        assert slow.queue.get_nowait()[:2] == ("changes", 4)
+        assert slow.dropped == 2
+
+        broadcaster.unsubscribe(fast)
+        broadcaster.unsubscribe(slow)
+        await broadcaster.poll()
+        assert broadcaster.cursor is None  # idle: nothing is read while nobody listens
+
+    asyncio.run(run())
+
+
+def test_event_stream_replays_missed_changes_then_goes_live():
+    broadcaster, create = make_broadcaster()
+    missed = create("Azul")
+
+    async def run():
+        stream = event_stream(broadcaster, since=0, keepalive=0.05)
+        assert await anext(stream) == b"retry: 3000\n\n"
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        await broadcaster.poll()  # starts the subscription at the current cursor
+        assert parse(await first) == ("changes", {"cursor": 1, "changes": [{"id": missed, "op": "upsert"}]})
+
+        live = create("Go")
+        await broadcaster.poll()
+        assert parse(await anext(stream)) == ("changes", {"cursor": 2, "changes": [{"id": live, "op": "upsert"}]})
+        assert await anext(stream) == b": keepalive\n\n"
+
+        await stream.aclose()
+        assert not broadcaster.subscribers
+
+    asyncio.run(run())
+
+
+def test_broadcaster_survives_a_failed_poll():
+    broadcaster, create = make_broadcaster()
+    broadcaster.poll_interval = 0.01
+    healthy_last_seq, failures = broadcaster.last_seq, []
+
+    def flaky_last_seq():
+        if not failures:
+            failures.append(1)
+            raise OperationalError("SELECT seq", {}, Exception("database is locked"))
+        return healthy_last_seq()
+
+    broadcaster.last_seq = flaky_last_seq
+
+    async def run():
+        task = asyncio.create_task(broadcaster.run())
+        subscription = broadcaster.subscribe()
+        await asyncio.wait_for(subscription.started.wait(), 1)
+        assert failures  # the first poll raised, and the loop kept going
+
+        game = create("Azul")
+        broadcaster.wake()
+        message = await asyncio.wait_for(subscription.queue.get(), 1)
+        assert message[2]["changes"] == [{"id": game, "op": "upsert"}]
+        task.cancel()
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.metrics import Registry, instrument_engine, statement_label
+
+
+def test_shards_from_many_threads_add_up():
+    registry = Registry()
+
+    def work():
+        for _ in range(1000):
+            registry.inc("http_requests_total", ("GET", "/boardgames/", "200"))
+            registry.observe("http_request_duration_seconds", ("GET", "/boardgames/"), 0.003)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    body = registry.render()
+    assert 'http_requests_total{method="GET",route="/boardgames/",status="200"} 4000' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/boardgames/",le="0.0025"} 0' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/boardgames/",le="0.005"} 4000' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/boardgames/"} 4000' in body
+
+
+def test_exited_threads_fold_into_one_shard():
+    registry = Registry()
+
+    def work():
+        registry.inc("http_requests_total", ("GET", "/boardgames/", "200"))
+
+    # waves of short-lived workers, as the threadpool retires idle threads and starts new ones
+    for _ in range(50):
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(registry._shards) <= 4
+
+    assert 'http_requests_total{method="GET",route="/boardgames/",status="200"} 200' in registry.render()
+    assert registry._shards == []
+
+
+def test_statement_timing_and_pool_gauges(tmp_path):
+    registry = Registry()
+    engine = create_engine(f"sqlite:///{tmp_path / 'm.db'}", pool_size=2, max_overflow=0)
+    instrument_engine(engine, "write", registry)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1 WHERE 5 IN (1, 2, 3)"))
+        assert 'db_pool_checked_out{engine="write"} 1' in registry.render()
+
+    body = registry.render()
+    assert 'db_statement_duration_seconds_count{engine="write",statement="SELECT ? WHERE ? IN (?)"} 1' in body
+    assert 'db_pool_size{engine="write"} 2' in body
+    assert 'db_pool_checked_out{engine="write"} 0' in body
+
+
+def test_statement_label_collapses_literals_and_in_lists():
+    sql = "SELECT id FROM boardgame\n WHERE name = 'It''s' AND id IN (?, ?, ?) LIMIT 20"
+    assert statement_label(sql) == "SELECT id FROM boardgame WHERE name = ? AND id IN (?) LIMIT ?"
+
+
+def test_in_list_arities_do_not_use_up_the_label_cap():
+    # batch chunks and id lookups send one raw statement per IN-list length
+    for arity in range(1, 1501):
+        placeholders = ", ".join("?" * arity)
+        assert statement_label(f"SELECT id FROM boardgame WHERE id IN ({placeholders})") == (
+            "SELECT id FROM boardgame WHERE id IN (?)"
+        )
+    assert statement_label("SELECT count(*) FROM boardgamechange") != "other"
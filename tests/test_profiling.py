@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.profiling import ProfilingMiddleware, SamplingProfiler
+
+
+def busy_loop(seconds: float) -> int:
+    total = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def make_app(tmp_path, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work/{n}")
+    def work(n: int):  # sync, so it runs in a threadpool worker the sampler must see
+        return {"n": busy_loop(0.05)}
+
+    app.add_middleware(ProfilingMiddleware, directory=tmp_path, interval=0.001, **kwargs)
+    return app
+
+
+def test_sampling_profiler_collapses_stacks_of_busy_threads():
+    profiler = SamplingProfiler(interval=0.001).start()
+    busy_loop(0.05)
+    profiler.stop()
+
+    assert profiler.samples > 0
+    mine = [line for line in profiler.collapsed().splitlines() if line.startswith("MainThread;")]
+    assert any("busy_loop (tests/test_profiling.py:" in line for line in mine)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in mine)
+
+
+def test_only_requests_with_the_token_are_profiled(tmp_path):
+    client = TestClient(make_app(tmp_path, header="X-Profile", token="s3cret"))
+
+    for headers in ({}, {"X-Profile": "1"}):
+        assert "x-profile-id" not in client.get("/work/1", headers=headers).headers
+    assert list(tmp_path.iterdir()) == []
+
+    # without a token configured, the header cannot switch profiling on at all
+    untokened = TestClient(make_app(tmp_path, header="X-Profile"))
+    assert "x-profile-id" not in untokened.get("/work/1", headers={"X-Profile": "1"}).headers
+
+    r = client.get("/work/1", headers={"X-Profile": "s3cret"})
+    assert r.status_code == 200
+    path = tmp_path / f"{r.headers['x-profile-id']}.collapsed"
+    header, *stacks = path.read_text().splitlines()
+    assert header.startswith("# GET /work/{n} ")
+    assert any("busy_loop" in line for line in stacks)
+
+
+def test_sample_rate_profiles_without_header(tmp_path):
+    client = TestClient(make_app(tmp_path, sample_rate=1.0))
+    client.get("/work/1")
+    client.get("/work/2")
+    assert len(list(tmp_path.glob("*.collapsed"))) == 2
+
+
+def test_only_one_request_is_profiled_at_a_time(tmp_path):
+    app = make_app(tmp_path, sample_rate=1.0)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await asyncio.gather(*(client.get(f"/work/{n}") for n in range(3)))
+
+    responses = asyncio.run(run())
+    assert all(r.status_code == 200 for r in responses)
+    assert sum("x-profile-id" in r.headers for r in responses) == 1
+    assert len(list(tmp_path.glob("*.collapsed"))) == 1
@@ -0,0 +1,57 @@
+import warnings
+
+from sqlalchemy import create_engine, text
+
+from app.similarity import FeatureIndex
+
+ROWS = [
+    # id, complexity, rating, play_time_min, min_players, max_players, year_published
+    (1, 1.8, 7.8, 45, 2, 4, 2017),
+    (2, 1.9, 7.5, 40, 1, 4, 2015),
+    (3, 3.9, 8.7, 120, 1, 4, 2017),
+    (4, None, None, None, None, None, None),
+]
+
+
+def test_refresh_only_rebuilds_on_version_change():
+    index = FeatureIndex(capacity=2)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return ROWS
+
+    index.refresh(5, load)
+    index.refresh(5, load)
+    assert len(loads) == 1
+    assert len(index) == 4
+    assert index.similar(1, k=1) == [2]
+
+
+def test_apply_is_incremental_and_goes_stale_on_gaps():
+    index = FeatureIndex()
+    index.refresh(1, lambda: ROWS)
+
+    index.apply(2, row=(5, 1.85, 8.0, 42, 2, 4, 2016))
+    index.apply(3, removed_id=2)
+    assert index.version == 3
+    assert len(index) == 4
+    assert index.similar(1, k=1) == [5]
+    assert index.recommend(players=4, max_minutes=60) == [5, 1]
+
+    index.apply(5, removed_id=1)  # version 4 was never seen
+    assert index.version is None
+
+
+def test_rebuild_from_rows_with_an_empty_feature_is_quiet():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        # SQLAlchemy Rows, as crud.sync_feature_index passes them; year_published is never set
+        rows = conn.execute(
+            text("SELECT 1, 1.8, 7.8, 45, 2, 4, NULL UNION ALL SELECT 2, 1.9, 7.5, 40, 1, 4, NULL")
+        ).all()
+    index = FeatureIndex()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        index.refresh(1, lambda: rows)
+    assert index.similar(1, k=1) == [2]
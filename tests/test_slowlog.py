@@ -0,0 +1,68 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.slowlog import SlowQueryLog, current_scope, redact
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_engine(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE game (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO game (name) VALUES (:n)"), [{"n": f"Game {i}"} for i in range(50)])
+    return engine
+
+
+def test_slow_statements_are_logged_with_plan_and_deduplicated(tmp_path, caplog):
+    engine = make_engine(tmp_path / "slow.db")
+    clock = FakeClock()
+    SlowQueryLog(threshold_ms=0, interval_seconds=60, clock=clock).instrument(engine, "write")
+
+    query = text("SELECT id FROM game WHERE lower(name) = :name")
+    token = current_scope.set({"method": "GET", "route": None, "path": "/x"})
+    try:
+        with caplog.at_level(logging.WARNING, logger="boardgamehub.slow_query"):
+            with engine.connect() as conn:
+                for _ in range(3):
+                    conn.execute(query, {"name": "secret value"})
+                clock.now += 61
+                conn.execute(query, {"name": "secret value"})
+    finally:
+        current_scope.reset(token)
+
+    lines = [r.getMessage() for r in caplog.records if "lower(name)" in r.getMessage()]
+    assert len(lines) == 2
+    assert "on GET unmatched [write]" in lines[0]
+    assert "SCAN game" in lines[0]
+    assert "params (<str:12>)" in lines[0]
+    assert "secret value" not in lines[0]
+    assert "2 similar suppressed" in lines[1]
+
+
+def test_global_rate_limit_and_threshold(tmp_path, caplog):
+    engine = make_engine(tmp_path / "slow.db")
+    SlowQueryLog(threshold_ms=0, max_per_minute=2, explain=False).instrument(engine, "read")
+    fast = make_engine(tmp_path / "fast.db")
+    SlowQueryLog(threshold_ms=10_000).instrument(fast, "read")
+
+    with caplog.at_level(logging.WARNING, logger="boardgamehub.slow_query"):
+        with engine.connect() as conn:
+            for i in range(5):
+                conn.execute(text(f"SELECT {'id, ' * i}name FROM game"))
+        with fast.connect() as conn:
+            conn.execute(text("SELECT name FROM game"))
+
+    assert len(caplog.records) == 2
+
+
+def test_redact_keeps_only_types():
+    assert redact((1, "abc", None, 2.5)) == "(<int>, <str:3>, None, <float>)"
+    assert redact({"name": "x"}) == "{name: <str:1>}"